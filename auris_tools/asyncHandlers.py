@@ -0,0 +1,281 @@
+import asyncio
+import functools
+import inspect
+import logging
+from collections.abc import Iterator
+
+from auris_tools.databaseHandlers import DatabaseHandler
+from auris_tools.storageHandler import StorageHandler
+from auris_tools.textractHandler import (
+    TextractHandler,
+    is_throttling_error,
+    poll_delays,
+)
+
+
+class AsyncIterator:
+    """
+    Asynchronous view of a blocking iterator.
+
+    Each item is produced on a worker thread, so the event loop is never
+    blocked by the requests the iterator makes. Attributes of the wrapped
+    iterator (e.g. the `cursor` of an ItemIterator) remain accessible.
+
+    Args:
+        iterator: The blocking iterator
+        executor: Executor running the blocking calls, or None for the
+            event loop's default executor
+    """
+
+    _DONE = object()
+
+    def __init__(self, iterator, executor=None):
+        self.iterator = iterator
+        self._executor = executor
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        loop = asyncio.get_running_loop()
+        item = await loop.run_in_executor(
+            self._executor, next, self.iterator, self._DONE
+        )
+        if item is self._DONE:
+            raise StopAsyncIteration
+        return item
+
+    def __getattr__(self, name):
+        return getattr(self.iterator, name)
+
+
+class AsyncHandler:
+    """
+    Base class exposing the methods of a blocking handler as coroutines.
+
+    Every public method of the wrapped handler is available with the same
+    signature. Methods returning a value become coroutines run on a worker
+    thread, and methods returning an iterator return an `AsyncIterator`
+    (use `async for`). Handlers use the shared clients of the client
+    registry, so all async and blocking handlers with one configuration
+    share the same connection pool, and calls can be fanned out with
+    `asyncio.gather`.
+
+    The methods are generated from the wrapped handler when accessed, so
+    they are documented on the blocking handler rather than here; only the
+    methods a subclass overrides are defined on it.
+
+    Args:
+        handler: The blocking handler to wrap
+        executor: Executor running the blocking calls, or None for the
+            event loop's default executor
+    """
+
+    # Methods returning an iterator without being generator functions
+    ITERATOR_METHODS = frozenset()
+
+    def __init__(self, handler, executor=None):
+        self.handler = handler
+        self._executor = executor
+
+    async def _run(self, func, *args, **kwargs):
+        """Run a blocking call on a worker thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    def _returns_iterator(self, name):
+        if name in self.ITERATOR_METHODS:
+            return True
+        return inspect.isgeneratorfunction(
+            getattr(type(self.handler), name, None)
+        )
+
+    def __getattr__(self, name):
+        attribute = getattr(self.handler, name)
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+
+        if self._returns_iterator(name):
+            # Creating the iterator is lazy, only iterating it blocks
+            @functools.wraps(attribute)
+            def iterator_method(*args, **kwargs):
+                result = attribute(*args, **kwargs)
+                if isinstance(result, Iterator):
+                    return AsyncIterator(result, self._executor)
+                return result
+
+            return iterator_method
+
+        @functools.wraps(attribute)
+        async def method(*args, **kwargs):
+            return await self._run(attribute, *args, **kwargs)
+
+        return method
+
+    def __dir__(self):
+        public = (name for name in dir(self.handler) if name[0] != '_')
+        return sorted(set(super().__dir__()).union(public))
+
+
+class AsyncStorageHandler(AsyncHandler):
+    """
+    Asynchronous counterpart of StorageHandler.
+
+    Provides every public method of StorageHandler (see AsyncHandler);
+    `iter_files`, `iter_files_many`, `iter_directories` and
+    `iter_file_chunks` return an `AsyncIterator`.
+
+    Args:
+        config: An AWSConfiguration object, or None to use environment
+            variables
+        cache: Optional S3ObjectCache (see StorageHandler)
+        executor: Executor running the blocking calls, or None for the
+            event loop's default executor
+
+    Example:
+        >>> storage = AsyncStorageHandler()
+        >>> contents = await asyncio.gather(
+        ...     *(storage.get_file_object('bucket', key) for key in keys)
+        ... )
+        >>> async for key in storage.iter_files('bucket', prefix='docs/'):
+        ...     print(key)
+    """
+
+    def __init__(self, config=None, cache=None, executor=None):
+        super().__init__(StorageHandler(config=config, cache=cache), executor)
+
+
+class AsyncDatabaseHandler(AsyncHandler):
+    """
+    Asynchronous counterpart of DatabaseHandler.
+
+    Provides every public method of DatabaseHandler (see AsyncHandler).
+    `query`, `scan` and `parallel_scan` return an `AsyncIterator`; for
+    `query` and `scan` it still exposes the `cursor` of the underlying
+    ItemIterator.
+
+    The constructor validates the table like DatabaseHandler, which makes
+    one blocking request per table and process; use `create` to run it on a
+    worker thread instead.
+
+    Args:
+        table_name: Name of the DynamoDB table
+        executor: Executor running the blocking calls, or None for the
+            event loop's default executor
+        **kwargs: Options of DatabaseHandler
+
+    Example:
+        >>> db = await AsyncDatabaseHandler.create('my-table')
+        >>> items = await asyncio.gather(*(db.get_item(k) for k in keys))
+        >>> rows = db.query('pk = :pk', expression_attribute_values=values)
+        >>> async for item in rows:
+        ...     print(item)
+    """
+
+    ITERATOR_METHODS = frozenset({'query', 'scan'})
+
+    def __init__(self, table_name, executor=None, **kwargs):
+        super().__init__(DatabaseHandler(table_name, **kwargs), executor)
+
+    @classmethod
+    async def create(cls, table_name, executor=None, **kwargs):
+        """
+        Create a handler without blocking the event loop.
+
+        Args:
+            table_name: Name of the DynamoDB table
+            executor: Executor running the blocking calls
+            **kwargs: Options of DatabaseHandler
+
+        Returns:
+            AsyncDatabaseHandler: The new handler
+        """
+        loop = asyncio.get_running_loop()
+        handler = await loop.run_in_executor(
+            executor, functools.partial(DatabaseHandler, table_name, **kwargs)
+        )
+        instance = cls.__new__(cls)
+        AsyncHandler.__init__(instance, handler, executor)
+        return instance
+
+
+class AsyncTextractHandler(AsyncHandler):
+    """
+    Asynchronous counterpart of TextractHandler.
+
+    Provides every public method of TextractHandler (see AsyncHandler);
+    `iter_job_results`, `iter_blocks`, `iter_text`, `iter_analysis_results`
+    and `process_documents` return an `AsyncIterator`.
+
+    `wait_for_job` sleeps on the event loop between polls, so waiting for
+    many jobs concurrently does not hold worker threads.
+
+    Args:
+        config: An AWSConfiguration object, or None to use environment
+            variables
+        result_cache: Optional TextractResultCache (see TextractHandler)
+        executor: Executor running the blocking calls, or None for the
+            event loop's default executor
+
+    Example:
+        >>> textract = AsyncTextractHandler()
+        >>> job_ids = await asyncio.gather(
+        ...     *(textract.start_job('bucket', key) for key in keys)
+        ... )
+        >>> await asyncio.gather(*(textract.wait_for_job(j) for j in job_ids))
+    """
+
+    ITERATOR_METHODS = frozenset(
+        {'process_documents', 'iter_analysis_results'}
+    )
+
+    def __init__(self, config=None, result_cache=None, executor=None):
+        super().__init__(
+            TextractHandler(config=config, result_cache=result_cache),
+            executor,
+        )
+
+    async def wait_for_job(
+        self,
+        job_id,
+        timeout=None,
+        poll_interval=1.0,
+        max_interval=30.0,
+        analysis=False,
+    ):
+        """
+        Wait until a Textract job finishes (see TextractHandler.wait_for_job).
+
+        Args:
+            job_id: ID of the Textract job
+            timeout: Maximum number of seconds to wait, or None to wait
+                until the job finishes
+            poll_interval: Delay in seconds before the first poll
+            max_interval: Maximum delay in seconds between two polls
+            analysis: True for a job started with `start_analysis_job`
+
+        Returns:
+            str: The final job status
+
+        Raises:
+            TimeoutError: If the job is still running after `timeout` seconds
+        """
+        for delay in poll_delays(job_id, timeout, poll_interval, max_interval):
+            await asyncio.sleep(delay)
+
+            try:
+                status = await self._run(
+                    self.handler._poll_job_status, job_id, analysis=analysis
+                )
+            except Exception as e:
+                if is_throttling_error(e):
+                    continue
+                logging.error(
+                    f'Error getting status for Textract job {job_id}: {str(e)}'
+                )
+                raise
+
+            if status != 'IN_PROGRESS':
+                return status
@@ -1,6 +1,8 @@
 import logging
 import os
+import threading
 
+import boto3
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -79,3 +81,119 @@ class AWSConfiguration:
             client_args['endpoint_url'] = self.endpoint_url
 
         return client_args
+
+    def get_cache_key(self):
+        """
+        Return a hashable key identifying this configuration.
+
+        Two configurations with the same region, profile, endpoint and
+        credentials produce the same key, so they can share boto3 sessions
+        and clients through the `AWSClientRegistry`.
+
+        Returns:
+            tuple: (region, profile, endpoint_url, access_key, secret_key)
+        """
+        return (
+            self.region,
+            self.profile,
+            self.endpoint_url,
+            self.access_key,
+            self.secret_key,
+        )
+
+
+class AWSClientRegistry:
+    """
+    Process-wide, thread-safe cache of boto3 sessions and clients.
+
+    Creating a boto3 session and client resolves credentials, loads service
+    models and builds endpoints, which costs tens of milliseconds. The
+    registry keeps one session per configuration and one client per
+    (service, configuration) pair, so handlers created per request reuse a
+    warm client. boto3 clients are thread-safe; sessions are not, so session
+    and client creation is serialized behind a lock.
+
+    Example:
+        >>> client = client_registry.get_client('s3', AWSConfiguration())
+        >>> client_registry.clear()  # e.g. after rotating credentials
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._sessions = {}
+        self._clients = {}
+
+    def get_session(self, config):
+        """
+        Return the cached boto3 session for a configuration.
+
+        Args:
+            config: An AWSConfiguration object
+
+        Returns:
+            boto3.session.Session: The shared session for this configuration
+        """
+        key = config.get_cache_key()
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = boto3.session.Session(
+                    **config.get_boto3_session_args()
+                )
+                self._sessions[key] = session
+            return session
+
+    def get_client(self, service_name, config):
+        """
+        Return the cached boto3 client for a service and configuration.
+
+        Args:
+            service_name: AWS service name (e.g. 's3', 'dynamodb')
+            config: An AWSConfiguration object
+
+        Returns:
+            The shared boto3 client for this service and configuration
+        """
+        key = (service_name, config.get_cache_key())
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                session = self.get_session(config)
+                client = session.client(
+                    service_name, **config.get_client_args()
+                )
+                self._clients[key] = client
+                logging.info(
+                    f'Created shared {service_name} client in region {config.region}'
+                )
+            return client
+
+    def refresh(self, config):
+        """
+        Drop the cached session and clients of a single configuration.
+
+        The next `get_client` call for this configuration builds a new
+        session, re-resolving credentials.
+
+        Args:
+            config: An AWSConfiguration object
+        """
+        key = config.get_cache_key()
+        with self._lock:
+            self._sessions.pop(key, None)
+            for client_key in [k for k in self._clients if k[1] == key]:
+                del self._clients[client_key]
+
+    def clear(self):
+        """Drop every cached session and client."""
+        with self._lock:
+            self._sessions.clear()
+            self._clients.clear()
+
+
+# Shared registry used by every handler in this package
+client_registry = AWSClientRegistry()
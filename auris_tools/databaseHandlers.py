@@ -1,34 +1,198 @@
+import base64
+import copy
+import json
 import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
 
-import boto3
-from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from boto3.dynamodb.types import Binary
+from botocore.exceptions import ClientError
 
-from auris_tools.configuration import AWSConfiguration
-from auris_tools.utils import generate_uuid
+from auris_tools.configuration import AWSConfiguration, client_registry
+from auris_tools.dynamoCodec import dynamo_codec
+from auris_tools.utils import (
+    LRUCache,
+    backoff_delay,
+    chunked,
+    collect_processing_time,
+    generate_uuid,
+    merge_iterators,
+)
+
+# Tables already confirmed to exist, keyed by (config key, table name)
+_table_check_cache = {}
+_table_check_lock = threading.Lock()
+
+# Item caches shared by every handler of a table, keyed like the table checks
+_item_caches = {}
+_item_caches_lock = threading.Lock()
+
+
+def _json_default(value):
+    """Encode deserialized DynamoDB values that json cannot handle"""
+    if isinstance(value, Decimal):
+        return (
+            int(value) if value == value.to_integral_value() else float(value)
+        )
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(bytes(value)).decode('ascii')
+    if isinstance(value, Binary):
+        return base64.b64encode(value.value).decode('ascii')
+    raise TypeError(
+        f'Object of type {type(value).__name__} is not JSON serializable'
+    )
+
+
+def _normalize_number(value):
+    """Return the canonical string of a DynamoDB number"""
+    number = Decimal(value)
+    if number.is_zero():
+        return '0'
+    return str(number.normalize())
+
+
+class ItemIterator:
+    """
+    Lazy iterator over the items of a paginated DynamoDB query or scan.
+
+    Pages are requested only when the previous page has been consumed, so
+    memory stays bounded by one page regardless of the result size.
+
+    Attributes:
+        cursor (dict): ExclusiveStartKey of the page currently being consumed,
+            or None before the first page. Passing it as `start_key` to a new
+            query or scan resumes the iteration; items already yielded from the
+            current page are yielded again.
+        exhausted (bool): True once the last page has been consumed.
+        pages (int): Number of pages requested so far.
+    """
+
+    def __init__(self, fetch_page, request, convert=None, start_key=None):
+        self._fetch_page = fetch_page
+        self._request = request
+        self._convert = convert
+        self.cursor = start_key
+        self.exhausted = False
+        self.pages = 0
+        self._items = self._iterate()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._items)
+
+    def _iterate(self):
+        while True:
+            request = dict(self._request)
+            if self.cursor:
+                request['ExclusiveStartKey'] = self.cursor
+            response = self._fetch_page(**request)
+            self.pages += 1
+
+            for item in response.get('Items', []):
+                yield self._convert(item) if self._convert else item
+
+            self.cursor = response.get('LastEvaluatedKey')
+            if not self.cursor:
+                self.exhausted = True
+                return
+
+
+class ItemCache(LRUCache):
+    """
+    LRU/TTL cache of DynamoDB items keyed by the signature of their key.
+
+    The cache remembers which attribute names were used as keys, so a write
+    of a full item can invalidate the matching entry without knowing the
+    table key schema.
+    """
+
+    def __init__(self, maxsize, ttl=None):
+        super().__init__(maxsize, ttl)
+        self.key_names = set()
+
+    def remember_key(self, key):
+        """Record the attribute names of a key used for lookups"""
+        self.key_names.add(tuple(sorted(key)))
+
+    def invalidate_item(self, item):
+        """
+        Drop the cached entry of a serialized item or key.
+
+        Args:
+            item: A serialized item or key containing the key attributes.
+        """
+        for names in tuple(self.key_names):
+            if all(name in item for name in names):
+                key = {name: item[name] for name in names}
+                self.delete(DatabaseHandler._key_signature(key))
 
 
 class DatabaseHandler:
-    def __init__(self, table_name, config=None):
+    # Seconds a successful table existence check is trusted
+    TABLE_CHECK_TTL = 300
+    # Maximum number of requests accepted by a single BatchWriteItem call
+    BATCH_WRITE_SIZE = 25
+    # Maximum number of keys accepted by a single BatchGetItem call
+    BATCH_GET_SIZE = 100
+    # Retry rounds for items DynamoDB reports as unprocessed
+    BATCH_MAX_RETRIES = 8
+
+    def __init__(
+        self,
+        table_name,
+        config=None,
+        validate=True,
+        codec=None,
+        cache_size=0,
+        cache_ttl=60,
+    ):
         """
         Initialize the database handler.
 
         Args:
             table_name: Name of the DynamoDB table.
             config: An AWSConfiguration object, or None to use environment variables.
+            validate: If True, check that the table exists. The check is a
+                single DescribeTable call, remembered for `TABLE_CHECK_TTL`
+                seconds per process. Set to False to skip it entirely.
+            codec: A DynamoCodec used to convert items, or None for the shared
+                boto3-compatible codec (floats rejected, numbers as Decimal).
+            cache_size: Maximum items kept in an in-process read-through
+                cache for `get_item`, or 0 to disable caching. The cache is
+                shared by every handler of the same table and configuration;
+                the first handler that enables it sets its size and TTL.
+                Writes through any handler of the table invalidate it, even
+                when that handler has caching disabled.
+            cache_ttl: Seconds a cached item stays valid. Defaults to 60.
         """
         self.table_name = table_name
+        self.codec = codec if codec is not None else dynamo_codec
         if config is None:
             config = AWSConfiguration()
+        self.config = config
 
-        # Create a boto3 session with the configuration
-        session = boto3.session.Session(**config.get_boto3_session_args())
+        # Reuse the shared DynamoDB client for this configuration
+        self.client = client_registry.get_client('dynamodb', config)
 
-        # Create a DynamoDB client with additional configuration if needed
-        self.client = session.client('dynamodb', **config.get_client_args())
-
-        if not self._check_table_exists(table_name):
+        if validate and not self._check_table_exists(table_name):
             raise Exception(f'Table does not exist: {table_name}')
 
+        self.cache = None
+        self._cache_key = (config.get_cache_key(), table_name)
+        if cache_size:
+            with _item_caches_lock:
+                self.cache = _item_caches.get(self._cache_key)
+                if self.cache is None:
+                    self.cache = ItemCache(cache_size, cache_ttl)
+                    _item_caches[self._cache_key] = self.cache
+
         logging.info(f'Initialized DynamoDB client in region {config.region}')
 
     def insert_item(self, item, primary_key: str = 'id'):
@@ -43,12 +207,16 @@ class DatabaseHandler:
         response = self.client.put_item(
             TableName=self.table_name, Item=dynamo_item
         )
+        self._invalidate_items([dynamo_item])
         return response
 
     def get_item(self, key):
         """
         Retrieve an item from a DynamoDB table.
 
+        When the handler has a cache, found items are served from it until
+        they expire or are written through this package.
+
         Args:
             key: A dictionary representing the key of the item to retrieve.
 
@@ -63,15 +231,122 @@ class DatabaseHandler:
             # Convert to DynamoDB format
             key = self._serialize_item(key)
 
+        if self.cache is not None:
+            signature = self._key_signature(key)
+            cached = self.cache.get(signature)
+            if cached is not None:
+                return copy.deepcopy(cached)
+
         try:
             response = self.client.get_item(TableName=self.table_name, Key=key)
-            return response.get('Item')
+            item = response.get('Item')
+            if item is not None and self.cache is not None:
+                self.cache.remember_key(key)
+                self.cache.set(signature, copy.deepcopy(item))
+            return item
         except Exception as e:
             logging.error(
                 f'Error retrieving item from {self.table_name}: {str(e)}'
             )
             return None
 
+    def get_items(
+        self, keys, primary_key='id', deserialize=False, max_workers=4
+    ):
+        """
+        Retrieve many items using BatchGetItem.
+
+        Duplicate keys are fetched once. Unique keys are split into chunks of
+        `BATCH_GET_SIZE` that are fetched concurrently, and keys DynamoDB
+        reports as unprocessed are retried with exponential backoff and
+        jitter.
+
+        Args:
+            keys: Iterable of string identifiers for the primary key, or of
+                dictionaries containing the complete key structure.
+            primary_key (str, optional): Name of the primary key field used
+                for string keys. Defaults to 'id'.
+            deserialize (bool, optional): If True, convert the items to Python
+                types. Defaults to False (DynamoDB format, like `get_item`).
+            max_workers (int, optional): Number of chunks fetched in parallel.
+                Defaults to 4.
+
+        Returns:
+            list: One entry per input key, in input order. Entries are None
+            for items that were not found or could not be retrieved.
+
+        Raises:
+            TypeError: If a key is neither a string nor a dictionary.
+        """
+        signatures = []
+        unique_keys = {}
+        for key in keys:
+            if isinstance(key, str):
+                key = {primary_key: key}
+            elif not isinstance(key, dict):
+                raise TypeError(
+                    'Key must be a string identifier or a dictionary'
+                )
+            if not self.item_is_serialized(key):
+                key = self._serialize_item(key)
+            signature = self._key_signature(key)
+            signatures.append(signature)
+            unique_keys.setdefault(signature, key)
+
+        if not unique_keys:
+            return []
+        key_names = list(next(iter(unique_keys.values())))
+
+        found = {}
+        chunks = list(chunked(unique_keys.values(), self.BATCH_GET_SIZE))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for items in executor.map(self._batch_get_chunk, chunks):
+                for item in items:
+                    key = {name: item[name] for name in key_names}
+                    found[self._key_signature(key)] = item
+
+        results = []
+        for signature in signatures:
+            item = found.get(signature)
+            if item is not None and deserialize:
+                item = self._deserialize_item(item)
+            results.append(item)
+        return results
+
+    def _batch_get_chunk(self, keys):
+        """
+        Fetch one chunk of keys, retrying unprocessed keys.
+
+        Args:
+            keys: List of serialized keys, at most `BATCH_GET_SIZE` long.
+
+        Returns:
+            list: Retrieved items in DynamoDB format.
+        """
+        items = []
+        request = {self.table_name: {'Keys': keys}}
+        attempt = 0
+        try:
+            while request:
+                response = self.client.batch_get_item(RequestItems=request)
+                items.extend(
+                    response.get('Responses', {}).get(self.table_name, [])
+                )
+                request = response.get('UnprocessedKeys') or {}
+                if request and attempt >= self.BATCH_MAX_RETRIES:
+                    logging.error(
+                        f'{len(request[self.table_name]["Keys"])} keys left unprocessed in {self.table_name}'
+                    )
+                    break
+                if request:
+                    time.sleep(backoff_delay(attempt))
+                    attempt += 1
+        except Exception as e:
+            logging.error(
+                f'Error retrieving items from {self.table_name}: {str(e)}'
+            )
+        return items
+
     def delete_item(self, key, primary_key='id'):
         """
         Delete an item from a DynamoDB table.
@@ -100,6 +375,7 @@ class DatabaseHandler:
                 Key=key,
                 ReturnValues='ALL_OLD',  # Return the deleted item
             )
+            self._invalidate_items([key])
             logging.info(f'Deleted item from {self.table_name} with key {key}')
             return True
         except Exception as e:
@@ -108,25 +384,484 @@ class DatabaseHandler:
             )
             return False
 
+    def insert_items(self, items, primary_key: str = 'id'):
+        """
+        Insert many items using BatchWriteItem.
+
+        Items are consumed lazily from any iterable and written in chunks of
+        `BATCH_WRITE_SIZE`. Items DynamoDB reports as unprocessed are retried
+        with exponential backoff and jitter.
+
+        Args:
+            items: Iterable of dictionaries to insert.
+            primary_key (str, optional): Name of the primary key field. A UUID
+                is generated for items missing it. Defaults to 'id'.
+
+        Returns:
+            dict: Throughput statistics (see `_batch_write`).
+
+        Raises:
+            TypeError: If an item is not a dictionary.
+        """
+
+        def put_requests():
+            for item in items:
+                if not isinstance(item, dict):
+                    raise TypeError('Item must be a dictionary')
+                if primary_key not in item:
+                    item[primary_key] = generate_uuid()
+                dynamo_item = self._serialize_item(item)
+                yield {'PutRequest': {'Item': dynamo_item}}
+
+        return self._batch_write(put_requests())
+
+    def delete_items(self, keys, primary_key='id'):
+        """
+        Delete many items using BatchWriteItem.
+
+        Args:
+            keys: Iterable of string identifiers for the primary key, or of
+                dictionaries containing the complete key structure.
+            primary_key (str, optional): Name of the primary key field used
+                for string keys. Defaults to 'id'.
+
+        Returns:
+            dict: Throughput statistics (see `_batch_write`).
+
+        Raises:
+            TypeError: If a key is neither a string nor a dictionary.
+        """
+
+        def delete_requests():
+            for key in keys:
+                if isinstance(key, str):
+                    key = {primary_key: key}
+                elif not isinstance(key, dict):
+                    raise TypeError(
+                        'Key must be a string identifier or a dictionary'
+                    )
+                if not self.item_is_serialized(key):
+                    key = self._serialize_item(key)
+                yield {'DeleteRequest': {'Key': key}}
+
+        return self._batch_write(delete_requests())
+
+    def _batch_write(self, requests):
+        """
+        Send write requests through BatchWriteItem in chunks.
+
+        Args:
+            requests: Iterable of `PutRequest`/`DeleteRequest` dictionaries.
+
+        Returns:
+            dict: Statistics with the keys `processed` (requests applied),
+            `batches` (BatchWriteItem calls), `retries` (retry rounds),
+            `unprocessed` (requests still pending after all retries),
+            `elapsed` (seconds) and `items_per_second`.
+        """
+        stats = {'processed': 0, 'batches': 0, 'retries': 0, 'unprocessed': []}
+
+        with collect_processing_time() as elapsed:
+            for pending in chunked(requests, self.BATCH_WRITE_SIZE):
+                attempt = 0
+                while pending:
+                    response = self.client.batch_write_item(
+                        RequestItems={self.table_name: pending}
+                    )
+                    stats['batches'] += 1
+                    self._invalidate_items(
+                        request['PutRequest']['Item']
+                        if 'PutRequest' in request
+                        else request['DeleteRequest']['Key']
+                        for request in pending
+                    )
+                    remaining = response.get('UnprocessedItems', {}).get(
+                        self.table_name, []
+                    )
+                    stats['processed'] += len(pending) - len(remaining)
+
+                    if remaining and attempt >= self.BATCH_MAX_RETRIES:
+                        stats['unprocessed'].extend(remaining)
+                        break
+                    if remaining:
+                        time.sleep(backoff_delay(attempt))
+                        attempt += 1
+                        stats['retries'] += 1
+                    pending = remaining
+            stats['elapsed'] = elapsed()
+
+        stats['items_per_second'] = (
+            stats['processed'] / stats['elapsed'] if stats['elapsed'] else 0.0
+        )
+        logging.info(
+            f'Batch wrote {stats["processed"]} items to {self.table_name} '
+            f'in {stats["batches"]} calls ({stats["items_per_second"]:.1f} items/s)'
+        )
+        if stats['unprocessed']:
+            logging.error(
+                f'{len(stats["unprocessed"])} items left unprocessed in {self.table_name}'
+            )
+        return stats
+
+    def _invalidate_items(self, items):
+        """
+        Drop written items from the shared item cache of the table.
+
+        The cache is looked up whatever this handler's `cache_size`, so
+        writes through handlers without caching are seen by the others.
+
+        Args:
+            items: Iterable of serialized items or keys.
+        """
+        with _item_caches_lock:
+            shared = _item_caches.get(self._cache_key)
+        caches = [shared] if shared is not None else []
+        if self.cache is not None and self.cache is not shared:
+            caches.append(self.cache)
+        if not caches:
+            return
+        for item in items:
+            for cache in caches:
+                cache.invalidate_item(item)
+
+    def query(
+        self,
+        key_condition_expression,
+        expression_attribute_values=None,
+        expression_attribute_names=None,
+        filter_expression=None,
+        projection_expression=None,
+        index_name=None,
+        page_size=None,
+        start_key=None,
+        deserialize=True,
+        **kwargs,
+    ):
+        """
+        Lazily iterate over the items matching a key condition.
+
+        Args:
+            key_condition_expression: DynamoDB KeyConditionExpression,
+                e.g. 'patient_id = :pid'.
+            expression_attribute_values (dict, optional): Placeholder values,
+                in Python types or DynamoDB format.
+            expression_attribute_names (dict, optional): Placeholder names.
+            filter_expression (str, optional): FilterExpression applied after
+                the key condition.
+            projection_expression (str, optional): Attributes to return, to
+                reduce the payload size.
+            index_name (str, optional): Secondary index to query.
+            page_size (int, optional): Maximum items evaluated per request.
+            start_key (dict, optional): Cursor returned by a previous
+                iteration, to resume from.
+            deserialize (bool, optional): If True, yield items as Python types.
+                Defaults to True.
+            **kwargs: Extra Query parameters (e.g. ScanIndexForward=False).
+
+        Returns:
+            ItemIterator: Lazy iterator over the matching items.
+        """
+        request = self._build_read_request(
+            expression_attribute_values,
+            expression_attribute_names,
+            filter_expression,
+            projection_expression,
+            index_name,
+            page_size,
+            **kwargs,
+        )
+        request['KeyConditionExpression'] = key_condition_expression
+        return self._iterate_items(
+            self.client.query, request, start_key, deserialize
+        )
+
+    def scan(
+        self,
+        filter_expression=None,
+        expression_attribute_values=None,
+        expression_attribute_names=None,
+        projection_expression=None,
+        index_name=None,
+        page_size=None,
+        start_key=None,
+        deserialize=True,
+        **kwargs,
+    ):
+        """
+        Lazily iterate over every item of the table.
+
+        Args:
+            filter_expression (str, optional): FilterExpression applied to the
+                scanned items.
+            expression_attribute_values (dict, optional): Placeholder values,
+                in Python types or DynamoDB format.
+            expression_attribute_names (dict, optional): Placeholder names.
+            projection_expression (str, optional): Attributes to return, to
+                reduce the payload size.
+            index_name (str, optional): Secondary index to scan.
+            page_size (int, optional): Maximum items evaluated per request.
+            start_key (dict, optional): Cursor returned by a previous
+                iteration, to resume from.
+            deserialize (bool, optional): If True, yield items as Python types.
+                Defaults to True.
+            **kwargs: Extra Scan parameters (e.g. ConsistentRead=True).
+
+        Returns:
+            ItemIterator: Lazy iterator over the scanned items.
+        """
+        request = self._build_read_request(
+            expression_attribute_values,
+            expression_attribute_names,
+            filter_expression,
+            projection_expression,
+            index_name,
+            page_size,
+            **kwargs,
+        )
+        return self._iterate_items(
+            self.client.scan, request, start_key, deserialize
+        )
+
+    def parallel_scan(
+        self,
+        total_segments=4,
+        workers=None,
+        buffer_size=1000,
+        progress_callback=None,
+        **scan_kwargs,
+    ):
+        """
+        Scan the table with several parallel segments as a single stream.
+
+        Each segment is read with `scan` (Segment/TotalSegments) on a thread
+        pool. Items are merged through a bounded queue, so memory stays
+        bounded by `buffer_size` items no matter how fast segments are read.
+        The order of items across segments is not defined.
+
+        Args:
+            total_segments (int, optional): Number of scan segments.
+                Defaults to 4.
+            workers (int, optional): Number of threads. Defaults to
+                `total_segments`.
+            buffer_size (int, optional): Maximum items buffered between the
+                workers and the consumer. Defaults to 1000.
+            progress_callback (callable, optional): Called as
+                `progress_callback(segment, items, pages, done)` when a
+                segment requests a new page and when it finishes.
+            **scan_kwargs: Arguments forwarded to `scan` (filter, projection,
+                deserialize, ...).
+
+        Yields:
+            dict: Scanned items.
+
+        Raises:
+            Exception: Any error raised while scanning a segment.
+        """
+        segments = [
+            self._scan_segment(
+                segment, total_segments, progress_callback, scan_kwargs
+            )
+            for segment in range(total_segments)
+        ]
+        yield from merge_iterators(
+            segments,
+            max_workers=workers or total_segments,
+            buffer_size=buffer_size,
+        )
+
+    def export_segments(
+        self,
+        directory,
+        total_segments=4,
+        workers=None,
+        progress_callback=None,
+        **scan_kwargs,
+    ):
+        """
+        Export the table to one JSONL shard per scan segment.
+
+        Segments are scanned in parallel and each one is streamed to its own
+        file, so no items are held in memory. Items are deserialized; Decimal
+        values are written as numbers, sets as lists and binary values as
+        base64 strings.
+
+        Args:
+            directory: Directory where the shards are written. Created if it
+                does not exist.
+            total_segments (int, optional): Number of scan segments.
+                Defaults to 4.
+            workers (int, optional): Number of threads. Defaults to
+                `total_segments`.
+            progress_callback (callable, optional): Called as
+                `progress_callback(segment, items, pages, done)`.
+            **scan_kwargs: Arguments forwarded to `scan` (filter, projection,
+                ...).
+
+        Returns:
+            dict: Maps each segment number to a dict with the shard `path` and
+            the number of `items` written.
+        """
+        os.makedirs(directory, exist_ok=True)
+        scan_kwargs['deserialize'] = True
+
+        def export_segment(segment):
+            path = os.path.join(
+                directory, f'{self.table_name}-segment-{segment:04d}.jsonl'
+            )
+            count = 0
+            with open(path, 'w', encoding='utf-8') as shard:
+                for item in self._scan_segment(
+                    segment, total_segments, progress_callback, scan_kwargs
+                ):
+                    shard.write(json.dumps(item, default=_json_default))
+                    shard.write('\n')
+                    count += 1
+            return segment, {'path': path, 'items': count}
+
+        with ThreadPoolExecutor(
+            max_workers=workers or total_segments
+        ) as executor:
+            results = dict(executor.map(export_segment, range(total_segments)))
+
+        logging.info(
+            f'Exported {sum(r["items"] for r in results.values())} items from {self.table_name} to {directory}'
+        )
+        return results
+
+    def _scan_segment(
+        self, segment, total_segments, progress_callback, scan_kwargs
+    ):
+        """Iterate over one scan segment, reporting progress per page"""
+        items = self.scan(
+            Segment=segment, TotalSegments=total_segments, **scan_kwargs
+        )
+        count = 0
+        pages = 0
+        for item in items:
+            if progress_callback and items.pages != pages:
+                pages = items.pages
+                progress_callback(segment, count, pages, False)
+            count += 1
+            yield item
+        if progress_callback:
+            progress_callback(segment, count, items.pages, True)
+
+    def _build_read_request(
+        self,
+        expression_attribute_values,
+        expression_attribute_names,
+        filter_expression,
+        projection_expression,
+        index_name,
+        page_size,
+        **kwargs,
+    ):
+        """Build the common parameters of Query and Scan requests"""
+        request = {'TableName': self.table_name, **kwargs}
+        if expression_attribute_values:
+            if not self.item_is_serialized(expression_attribute_values):
+                expression_attribute_values = self._serialize_item(
+                    expression_attribute_values
+                )
+            request['ExpressionAttributeValues'] = expression_attribute_values
+        if expression_attribute_names:
+            request['ExpressionAttributeNames'] = expression_attribute_names
+        if filter_expression:
+            request['FilterExpression'] = filter_expression
+        if projection_expression:
+            request['ProjectionExpression'] = projection_expression
+        if index_name:
+            request['IndexName'] = index_name
+        if page_size:
+            request['Limit'] = page_size
+        return request
+
+    def _iterate_items(self, fetch_page, request, start_key, deserialize):
+        """Wrap a Query/Scan request in an ItemIterator"""
+        if start_key and not self.item_is_serialized(start_key):
+            start_key = self._serialize_item(start_key)
+        return ItemIterator(
+            fetch_page,
+            request,
+            convert=self._deserialize_item if deserialize else None,
+            start_key=start_key,
+        )
+
     def item_is_serialized(self, item):
         """Check if an item is in DynamoDB serialized format"""
         return all(isinstance(v, dict) and len(v) == 1 for v in item.values())
 
+    @staticmethod
+    def _key_signature(key):
+        """
+        Build a hashable signature from a serialized key.
+
+        Numbers are normalized, since DynamoDB returns them in canonical form
+        (a key sent as {'N': '1.0'} comes back as {'N': '1'}).
+        """
+        return tuple(
+            sorted(
+                (
+                    name,
+                    type_name,
+                    _normalize_number(value) if type_name == 'N' else value,
+                )
+                for name, typed_value in key.items()
+                for type_name, value in typed_value.items()
+            )
+        )
+
     def _serialize_item(self, item):
         """Convert Python types to DynamoDB format"""
-        serializer = TypeSerializer()
-        return {k: serializer.serialize(v) for k, v in item.items()}
+        return self.codec.serialize_item(item)
 
     def _deserialize_item(self, item):
         """Convert DynamoDB format back to Python types"""
-        deserializer = TypeDeserializer()
-        return {k: deserializer.deserialize(v) for k, v in item.items()}
+        return self.codec.deserialize_item(item)
 
     def _check_table_exists(self, table_name):
-        """Check if a DynamoDB table exists"""
+        """Check if a DynamoDB table exists, memoizing positive answers"""
+        cache_key = (self.config.get_cache_key(), table_name)
+        with _table_check_lock:
+            checked_at = _table_check_cache.get(cache_key)
+        if (
+            checked_at is not None
+            and time.monotonic() - checked_at < self.TABLE_CHECK_TTL
+        ):
+            return True
+
         try:
-            existing_tables = self.client.list_tables().get('TableNames', [])
-            return table_name in existing_tables
+            self.client.describe_table(TableName=table_name)
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ResourceNotFoundException':
+                logging.error(f'Error checking table existence: {str(e)}')
+            return False
         except Exception as e:
             logging.error(f'Error checking table existence: {str(e)}')
             return False
+
+        with _table_check_lock:
+            _table_check_cache[cache_key] = time.monotonic()
+        return True
+
+    def cache_stats(self):
+        """
+        Return the counters of the item cache.
+
+        Returns:
+            dict: `hits`, `misses`, `evictions`, `expirations` and `size`, or
+            None if caching is disabled.
+        """
+        return self.cache.stats() if self.cache is not None else None
+
+    @staticmethod
+    def clear_item_caches():
+        """Drop every shared item cache"""
+        with _item_caches_lock:
+            _item_caches.clear()
+
+    @staticmethod
+    def clear_table_check_cache():
+        """Forget every memoized table existence check"""
+        with _table_check_lock:
+            _table_check_cache.clear()
@@ -0,0 +1,236 @@
+from collections.abc import Mapping
+from decimal import Decimal
+
+from boto3.dynamodb.types import DYNAMODB_CONTEXT, Binary
+
+# Integers with more digits than this go through the DynamoDB decimal context
+_MAX_FAST_INT = 10**38
+
+
+class DynamoCodec:
+    """
+    Fast converter between Python values and DynamoDB attribute values.
+
+    The codec produces the same output as boto3's `TypeSerializer` and
+    `TypeDeserializer`, but looks up a precomputed handler by exact type
+    instead of walking a chain of type checks for every value. A single
+    instance is stateless after construction and can be shared by threads.
+
+    Args:
+        float_as_decimal (bool, optional): If True, floats are serialized as
+            numbers through `Decimal(repr(value))`. If False, floats raise a
+            TypeError, like boto3. Defaults to False.
+        native_numbers (bool, optional): If True, numbers are deserialized as
+            int or float instead of Decimal. Defaults to False.
+
+    Example:
+        >>> codec = DynamoCodec(float_as_decimal=True)
+        >>> codec.serialize_item({'id': 'a', 'score': 0.5})
+        {'id': {'S': 'a'}, 'score': {'N': '0.5'}}
+    """
+
+    def __init__(self, float_as_decimal=False, native_numbers=False):
+        self.float_as_decimal = float_as_decimal
+        self.native_numbers = native_numbers
+
+        self._serializers = {
+            type(None): self._serialize_null,
+            bool: self._serialize_bool,
+            int: self._serialize_int,
+            float: self._serialize_float,
+            Decimal: self._serialize_decimal,
+            str: self._serialize_str,
+            bytes: self._serialize_binary,
+            bytearray: self._serialize_binary,
+            Binary: self._serialize_binary,
+            set: self._serialize_set,
+            frozenset: self._serialize_set,
+            list: self._serialize_list,
+            tuple: self._serialize_list,
+            dict: self._serialize_map,
+        }
+        self._deserializers = {
+            'S': self._identity,
+            'N': self._deserialize_number,
+            'B': Binary,
+            'BOOL': self._identity,
+            'NULL': self._deserialize_null,
+            'SS': set,
+            'NS': self._deserialize_number_set,
+            'BS': self._deserialize_binary_set,
+            'L': self._deserialize_list,
+            'M': self._deserialize_map,
+        }
+
+    def serialize(self, value):
+        """
+        Convert a Python value to a DynamoDB attribute value.
+
+        Args:
+            value: The Python value.
+
+        Returns:
+            dict: The typed attribute value, e.g. {'S': 'text'}.
+
+        Raises:
+            TypeError: If the value type is not supported by DynamoDB.
+        """
+        handler = self._serializers.get(type(value))
+        if handler is None:
+            handler = self._resolve_serializer(value)
+        return handler(value)
+
+    def deserialize(self, value):
+        """
+        Convert a DynamoDB attribute value to a Python value.
+
+        Args:
+            value (dict): The typed attribute value, e.g. {'S': 'text'}.
+
+        Returns:
+            The Python value.
+
+        Raises:
+            TypeError: If the DynamoDB type is not supported.
+        """
+        if len(value) == 1:
+            for tag, data in value.items():
+                handler = self._deserializers.get(tag)
+                if handler is None:
+                    raise TypeError(f'Dynamodb type {tag} is not supported')
+                return handler(data)
+        raise TypeError(
+            'Value must be a nonempty dictionary whose key '
+            'is a valid dynamodb type.'
+        )
+
+    def serialize_item(self, item):
+        """Convert every attribute of an item to DynamoDB format"""
+        serialize = self.serialize
+        return {k: serialize(v) for k, v in item.items()}
+
+    def deserialize_item(self, item):
+        """Convert every attribute of a DynamoDB item to Python types"""
+        deserialize = self.deserialize
+        return {k: deserialize(v) for k, v in item.items()}
+
+    def _resolve_serializer(self, value):
+        """Find the handler for a subclass of a supported type"""
+        if isinstance(value, bool):
+            return self._serialize_bool
+        for base in (int, float, Decimal, str, bytes, bytearray, Binary):
+            if isinstance(value, base):
+                return self._serializers[base]
+        if isinstance(value, (set, frozenset)):
+            return self._serialize_set
+        if isinstance(value, (list, tuple)):
+            return self._serialize_list
+        if isinstance(value, Mapping):
+            return self._serialize_map
+        raise TypeError(
+            f'Unsupported type "{type(value)}" for value "{value}"'
+        )
+
+    @staticmethod
+    def _serialize_null(value):
+        return {'NULL': True}
+
+    @staticmethod
+    def _serialize_bool(value):
+        return {'BOOL': value}
+
+    def _serialize_int(self, value):
+        if -_MAX_FAST_INT < value < _MAX_FAST_INT:
+            return {'N': str(value)}
+        return {'N': self._number_string(value)}
+
+    def _serialize_float(self, value):
+        if not self.float_as_decimal:
+            raise TypeError(
+                'Float types are not supported. Use Decimal types instead.'
+            )
+        return {'N': self._number_string(Decimal(repr(value)))}
+
+    def _serialize_decimal(self, value):
+        return {'N': self._number_string(value)}
+
+    @staticmethod
+    def _serialize_str(value):
+        return {'S': value}
+
+    @staticmethod
+    def _serialize_binary(value):
+        if isinstance(value, Binary):
+            return {'B': value.value}
+        return {'B': bytes(value)}
+
+    def _serialize_set(self, value):
+        values = list(value)
+        number_types = (
+            (int, Decimal, float) if self.float_as_decimal else (int, Decimal)
+        )
+        if all(isinstance(v, number_types) for v in values):
+            return {
+                'NS': [
+                    self._serialize_float(v)['N']
+                    if isinstance(v, float)
+                    else self._number_string(v)
+                    for v in values
+                ]
+            }
+        if all(isinstance(v, str) for v in values):
+            return {'SS': values}
+        if all(isinstance(v, (bytes, bytearray, Binary)) for v in values):
+            return {'BS': [self._serialize_binary(v)['B'] for v in values]}
+        raise TypeError(
+            f'Unsupported type "{type(value)}" for value "{value}"'
+        )
+
+    def _serialize_list(self, value):
+        serialize = self.serialize
+        return {'L': [serialize(v) for v in value]}
+
+    def _serialize_map(self, value):
+        serialize = self.serialize
+        return {'M': {k: serialize(v) for k, v in value.items()}}
+
+    @staticmethod
+    def _number_string(value):
+        number = str(DYNAMODB_CONTEXT.create_decimal(value))
+        if number in ('Infinity', 'NaN', '-Infinity', 'sNaN'):
+            raise TypeError('Infinity and NaN not supported')
+        return number
+
+    @staticmethod
+    def _identity(value):
+        return value
+
+    @staticmethod
+    def _deserialize_null(value):
+        return None
+
+    def _deserialize_number(self, value):
+        if not self.native_numbers:
+            return Decimal(value)
+        if '.' in value or 'e' in value or 'E' in value:
+            return float(value)
+        return int(value)
+
+    def _deserialize_number_set(self, value):
+        return {self._deserialize_number(v) for v in value}
+
+    @staticmethod
+    def _deserialize_binary_set(value):
+        return {Binary(v) for v in value}
+
+    def _deserialize_list(self, value):
+        deserialize = self.deserialize
+        return [deserialize(v) for v in value]
+
+    def _deserialize_map(self, value):
+        deserialize = self.deserialize
+        return {k: deserialize(v) for k, v in value.items()}
+
+
+# Shared codec with boto3-compatible behavior
+dynamo_codec = DynamoCodec()
@@ -1,5 +1,9 @@
+import asyncio
 import logging
+import math
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import google.generativeai as genai
 from dotenv import load_dotenv
@@ -134,6 +138,177 @@ class GoogleGeminiHandler:
             ...     input_mime_type="image/jpeg"
             ... )
         """
+        contents = self._build_contents(prompt, input_data, input_mime_type)
+
+        try:
+            response = self.model.generate_content(contents)
+            return response
+        except Exception as e:
+            logger.error(f'Error generating LLM output: {str(e)}')
+            return ''
+
+    async def generate_output_async(
+        self, prompt: str, input_data: str = None, input_mime_type: str = None
+    ):
+        """Generate content without blocking the event loop.
+
+        This is the asynchronous counterpart of `generate_output`, with the
+        same arguments and return values.
+
+        Args:
+            prompt (str): The text prompt to send to the model.
+            input_data (str, optional): Additional input data to include with
+                the prompt. Requires input_mime_type. Defaults to None.
+            input_mime_type (str, optional): MIME type of the input_data.
+                Defaults to None.
+
+        Returns:
+            genai.types.GenerateContentResponse or str: The response from the Gemini model
+            if successful, or an empty string if an error occurred.
+
+        Raises:
+            ValueError: If input_data is provided without input_mime_type or vice versa.
+
+        Example:
+            >>> response = await handler.generate_output_async("Explain DNA")
+        """
+        contents = self._build_contents(prompt, input_data, input_mime_type)
+
+        try:
+            return await self.model.generate_content_async(contents)
+        except Exception as e:
+            logger.error(f'Error generating LLM output: {str(e)}')
+            return ''
+
+    async def generate_many_async(self, prompts, concurrency: int = 8):
+        """Generate content for many prompts concurrently.
+
+        At most `concurrency` requests are in flight at once. Results keep
+        the order of the prompts, and a failed request is reported with its
+        error instead of an empty string, without affecting the others.
+
+        Args:
+            prompts (list): Prompts to send. Each item is either a prompt
+                string or a dict of `generate_output` arguments (`prompt`,
+                `input_data`, `input_mime_type`).
+            concurrency (int, optional): Maximum number of concurrent
+                requests. Defaults to 8.
+
+        Returns:
+            dict: Batch report with:
+                - results (list): One dict per prompt, in input order, with
+                  the `response` (None on failure), the `error` message (None
+                  on success) and the request `latency` in seconds.
+                - succeeded (int): Number of successful requests.
+                - failed (int): Number of failed requests.
+                - elapsed (float): Wall-clock duration of the batch in seconds.
+                - throughput (float): Completed requests per second.
+                - latency (dict): `mean`, `p50`, `p95` and `max` request
+                  latency in seconds.
+
+        Example:
+            >>> report = await handler.generate_many_async(prompts, concurrency=16)
+            >>> texts = [r['response'].text for r in report['results'] if not r['error']]
+        """
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate(item):
+            kwargs = item if isinstance(item, dict) else {'prompt': item}
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    contents = self._build_contents(**kwargs)
+                    response = await self.model.generate_content_async(
+                        contents
+                    )
+                    error = None
+                except Exception as e:
+                    logger.error(f'Error generating LLM output: {str(e)}')
+                    response, error = None, str(e)
+                latency = time.perf_counter() - start
+            return {'response': response, 'error': error, 'latency': latency}
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(generate(p) for p in prompts))
+        return self._batch_report(results, time.perf_counter() - start)
+
+    def generate_many(self, prompts, concurrency: int = 8):
+        """Generate content for many prompts concurrently, from blocking code.
+
+        Requests run with the blocking `generate_content` on a pool of
+        `concurrency` threads, so the handler can be used for any number of
+        batches without binding the model's client to a short-lived event
+        loop. From a running event loop, await `generate_many_async` instead.
+
+        Args:
+            prompts (list): Prompt strings or dicts of `generate_output`
+                arguments.
+            concurrency (int, optional): Maximum number of concurrent
+                requests. Defaults to 8.
+
+        Returns:
+            dict: The batch report described in `generate_many_async`.
+
+        Example:
+            >>> report = handler.generate_many(transcripts, concurrency=16)
+            >>> print(report['throughput'], report['latency']['p95'])
+        """
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+
+        def generate(item):
+            kwargs = item if isinstance(item, dict) else {'prompt': item}
+            start = time.perf_counter()
+            try:
+                contents = self._build_contents(**kwargs)
+                response = self.model.generate_content(contents)
+                error = None
+            except Exception as e:
+                logger.error(f'Error generating LLM output: {str(e)}')
+                response, error = None, str(e)
+            latency = time.perf_counter() - start
+            return {'response': response, 'error': error, 'latency': latency}
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(generate, prompts))
+        return self._batch_report(results, time.perf_counter() - start)
+
+    def _batch_report(self, results, elapsed):
+        """Summarize per-item batch results with latency and throughput"""
+        latencies = sorted(r['latency'] for r in results)
+        failed = sum(1 for r in results if r['error'] is not None)
+        report = {
+            'results': results,
+            'succeeded': len(results) - failed,
+            'failed': failed,
+            'elapsed': elapsed,
+            'throughput': len(results) / elapsed if elapsed > 0 else 0.0,
+            'latency': {
+                'mean': sum(latencies) / len(latencies) if latencies else 0.0,
+                'p50': self._percentile(latencies, 0.50),
+                'p95': self._percentile(latencies, 0.95),
+                'max': latencies[-1] if latencies else 0.0,
+            },
+        }
+        logger.info(
+            f'Generated {report["succeeded"]}/{len(results)} outputs in '
+            f'{elapsed:.2f}s ({report["throughput"]:.2f} requests/s)'
+        )
+        return report
+
+    @staticmethod
+    def _build_contents(
+        prompt, input_data: str = None, input_mime_type: str = None
+    ):
+        """Validate the generation inputs and build the request contents.
+
+        Raises:
+            ValueError: If input_data is provided without input_mime_type or vice versa.
+        """
         if (input_data is not None and input_mime_type is None) or (
             input_data is None and input_mime_type is not None
         ):
@@ -142,17 +317,19 @@ class GoogleGeminiHandler:
             )
 
         if input_data and input_mime_type:  # Add input data if provided
-            prompt = [
+            return [
                 prompt,
                 {'mime_type': input_mime_type, 'content': input_data},
             ]
-
-        try:
-            response = self.model.generate_content(prompt)
-            return response
-        except Exception as e:
-            logger.error(f'Error generating LLM output: {str(e)}')
-            return ''
+        return prompt
+
+    @staticmethod
+    def _percentile(sorted_values, fraction):
+        """Return the nearest-rank percentile of sorted values"""
+        if not sorted_values:
+            return 0.0
+        index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+        return sorted_values[min(index, len(sorted_values) - 1)]
 
     def get_text(self, response) -> str:
         """Extract text content from a Gemini model response.
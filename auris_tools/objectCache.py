@@ -0,0 +1,355 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from botocore.exceptions import ClientError
+
+
+class S3ObjectCache:
+    """
+    Content-addressed local disk cache for S3 objects with ETag validation.
+
+    Object bodies are stored once per content digest under `objects/`, and a
+    small index file per bucket/key records the ETag and digest last seen.
+    A cached object is revalidated with a conditional GET (`IfNoneMatch`),
+    so unchanged objects cost one request without a body transfer. When the
+    stored bodies exceed `max_size` bytes, the least recently used ones are
+    evicted. Objects larger than `max_size` are streamed through without
+    being cached by `get_bytes` and `download`.
+
+    Every file is written to a temporary name and atomically renamed, and
+    missing files are treated as cache misses, so several processes on the
+    same host can share one cache directory.
+
+    Args:
+        directory (str, optional): Cache directory. Defaults to
+            `auris_tools_s3_cache` in the system temporary directory.
+        max_size (int, optional): Maximum total size of cached bodies in
+            bytes. Defaults to 1 GiB.
+
+    Example:
+        >>> cache = S3ObjectCache(max_size=512 * 1024 * 1024)
+        >>> handler = StorageHandler(cache=cache)
+        >>> handler.get_file_object('bucket', 'template.docx', as_bytes=True)
+    """
+
+    def __init__(self, directory=None, max_size=1024**3):
+        self.directory = directory or os.path.join(
+            tempfile.gettempdir(), 'auris_tools_s3_cache'
+        )
+        self.max_size = max_size
+        self._objects_dir = os.path.join(self.directory, 'objects')
+        self._index_dir = os.path.join(self.directory, 'index')
+        os.makedirs(self._objects_dir, exist_ok=True)
+        os.makedirs(self._index_dir, exist_ok=True)
+
+    def get_path(self, client, bucket_name, object_name):
+        """
+        Return the path of an up-to-date local copy of an S3 object.
+
+        The returned file must be treated as read-only. An object larger than
+        `max_size` is still stored so that a path can be returned, and is
+        evicted by the next download.
+
+        Args:
+            client: boto3 S3 client
+            bucket_name: Bucket name
+            object_name: S3 object name (key)
+
+        Returns:
+            str: Path of the cached body
+
+        Raises:
+            Exception: If the object cannot be retrieved from S3
+        """
+        path, response = self._resolve(client, bucket_name, object_name)
+        if response is not None:
+            path = self._store(bucket_name, object_name, response)
+        return path
+
+    def _resolve(self, client, bucket_name, object_name):
+        """
+        Return (path, None) for an up-to-date cached copy of an object, or
+        (None, response) for an object too large to be cached.
+        """
+        entry = self._read_index(bucket_name, object_name)
+        path = self._object_path(entry['digest']) if entry else None
+        params = {'Bucket': bucket_name, 'Key': object_name}
+        if path and os.path.exists(path):
+            params['IfNoneMatch'] = entry['etag']
+
+        try:
+            response = client.get_object(**params)
+        except ClientError as e:
+            if 'IfNoneMatch' in params and self._is_not_modified(e):
+                self._touch(path)
+                logging.info(f'Cache hit for {bucket_name}/{object_name}')
+                return path, None
+            raise
+
+        if response.get('ContentLength', 0) > self.max_size:
+            logging.info(
+                f'{bucket_name}/{object_name} exceeds the cache size, '
+                f'not caching it'
+            )
+            return None, response
+        return self._store(bucket_name, object_name, response), None
+
+    def _store(self, bucket_name, object_name, response):
+        """Store a GetObject response body and return its path"""
+        digest = self._store_body(response['Body'])
+        self._write_index(
+            bucket_name, object_name, response.get('ETag'), digest
+        )
+        path = self._object_path(digest)
+        self._evict(keep=path)
+        return path
+
+    def get_bytes(self, client, bucket_name, object_name):
+        """
+        Return the content of an S3 object, served locally when unchanged.
+
+        Args:
+            client: boto3 S3 client
+            bucket_name: Bucket name
+            object_name: S3 object name (key)
+
+        Returns:
+            bytes: The object content
+
+        Raises:
+            Exception: If the object cannot be retrieved from S3
+        """
+        try:
+            return self._read_bytes(client, bucket_name, object_name)
+        except FileNotFoundError:
+            # Evicted by another process in the meantime; fetch it again
+            return self._read_bytes(client, bucket_name, object_name)
+
+    def _read_bytes(self, client, bucket_name, object_name):
+        path, response = self._resolve(client, bucket_name, object_name)
+        if response is not None:
+            return response['Body'].read()
+        with open(path, 'rb') as file:
+            return file.read()
+
+    def download(self, client, bucket_name, object_name, file_path):
+        """
+        Copy an S3 object to a local path, served locally when unchanged.
+
+        Args:
+            client: boto3 S3 client
+            bucket_name: Bucket name
+            object_name: S3 object name (key)
+            file_path: Destination path
+
+        Raises:
+            Exception: If the object cannot be retrieved from S3
+        """
+        try:
+            self._copy_to(client, bucket_name, object_name, file_path)
+        except FileNotFoundError:
+            # Evicted by another process in the meantime; fetch it again
+            self._copy_to(client, bucket_name, object_name, file_path)
+
+    def _copy_to(self, client, bucket_name, object_name, file_path):
+        path, response = self._resolve(client, bucket_name, object_name)
+        if response is None:
+            shutil.copyfile(path, file_path)
+            return
+        with open(file_path, 'wb') as file:
+            shutil.copyfileobj(response['Body'], file, 1024 * 1024)
+
+    def clear(self):
+        """Remove every cached object and index entry"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self._objects_dir, exist_ok=True)
+        os.makedirs(self._index_dir, exist_ok=True)
+
+    @staticmethod
+    def _is_not_modified(error):
+        code = error.response.get('Error', {}).get('Code')
+        status = error.response.get('ResponseMetadata', {}).get(
+            'HTTPStatusCode'
+        )
+        return code in ('304', 'NotModified') or status == 304
+
+    def _object_path(self, digest):
+        return os.path.join(self._objects_dir, digest)
+
+    def _index_path(self, bucket_name, object_name):
+        name = hashlib.sha256(
+            f'{bucket_name}/{object_name}'.encode('utf-8')
+        ).hexdigest()
+        return os.path.join(self._index_dir, f'{name}.json')
+
+    def _read_index(self, bucket_name, object_name):
+        try:
+            with open(self._index_path(bucket_name, object_name)) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _write_index(self, bucket_name, object_name, etag, digest):
+        entry = {
+            'bucket': bucket_name,
+            'key': object_name,
+            'etag': etag,
+            'digest': digest,
+        }
+        fd, temp_path = tempfile.mkstemp(dir=self._index_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as file:
+            json.dump(entry, file)
+        os.replace(temp_path, self._index_path(bucket_name, object_name))
+
+    def _store_body(self, body, chunk_size=1024 * 1024):
+        """Stream a body to disk and move it to its content address"""
+        digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=self._objects_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                for chunk in iter(lambda: body.read(chunk_size), b''):
+                    digest.update(chunk)
+                    file.write(chunk)
+            os.replace(temp_path, self._object_path(digest.hexdigest()))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return digest.hexdigest()
+
+    @staticmethod
+    def _touch(path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _evict(self, keep=None):
+        """
+        Remove least recently used bodies until under max_size.
+
+        Args:
+            keep: Path of a body that must not be removed, e.g. the one
+                just written
+        """
+        entries = []
+        total = 0
+        with os.scandir(self._objects_dir) as scan:
+            for entry in scan:
+                if entry.name.endswith('.tmp'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+class TextractResultCache:
+    """
+    Local disk cache of Textract results keyed by S3 object ETag.
+
+    Results are stored as gzip-compressed JSON, one file per bucket, key and
+    ETag, so a changed object never hits a stale entry. Entries older than
+    `ttl` seconds are treated as misses and removed. Files are written
+    atomically, so several processes can share one cache directory.
+
+    Args:
+        directory (str, optional): Cache directory. Defaults to
+            `auris_tools_textract_cache` in the system temporary directory.
+        ttl (float, optional): Lifetime of an entry in seconds, or None to
+            keep entries until they are cleared. Defaults to None.
+
+    Example:
+        >>> cache = TextractResultCache(ttl=7 * 24 * 3600)
+        >>> handler = TextractHandler(result_cache=cache)
+        >>> handler.detect_text('bucket', 'scan.pdf')  # Cached afterwards
+    """
+
+    def __init__(self, directory=None, ttl=None):
+        self.directory = directory or os.path.join(
+            tempfile.gettempdir(), 'auris_tools_textract_cache'
+        )
+        self.ttl = ttl
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get(self, bucket_name, object_name, etag):
+        """
+        Return the cached result pages of an object version.
+
+        Args:
+            bucket_name: Bucket name
+            object_name: S3 object name (key)
+            etag: ETag of the object version
+
+        Returns:
+            list: The response pages, or None if they are not cached
+        """
+        path = self._path(bucket_name, object_name, etag)
+        try:
+            if self.ttl is not None:
+                if time.time() - os.path.getmtime(path) > self.ttl:
+                    os.remove(path)
+                    return None
+            with gzip.open(path, 'rt', encoding='utf-8') as file:
+                pages = json.load(file)
+        except (OSError, ValueError):
+            return None
+        logging.info(
+            f'Textract result cache hit for {bucket_name}/{object_name}'
+        )
+        return pages
+
+    def set(self, bucket_name, object_name, etag, pages):
+        """
+        Store the result pages of an object version.
+
+        Args:
+            bucket_name: Bucket name
+            object_name: S3 object name (key)
+            etag: ETag of the object version
+            pages: List of Textract response pages
+        """
+        pages = [
+            {k: v for k, v in page.items() if k != 'ResponseMetadata'}
+            for page in pages
+        ]
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as raw:
+                with gzip.open(raw, 'wt', encoding='utf-8') as file:
+                    json.dump(pages, file, default=str)
+            os.replace(temp_path, self._path(bucket_name, object_name, etag))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def clear(self):
+        """Remove every cached result"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, bucket_name, object_name, etag):
+        name = hashlib.sha256(
+            f'{bucket_name}/{object_name}@{etag}'.encode('utf-8')
+        ).hexdigest()
+        return os.path.join(self.directory, f'{name}.json.gz')
@@ -3,12 +3,11 @@ import logging
 import re
 from typing import List, Optional
 
-import boto3
 from docx import Document
 from docx.opc.constants import RELATIONSHIP_TYPE as RT
 from docx.text.paragraph import Paragraph
 
-from auris_tools.configuration import AWSConfiguration
+from auris_tools.configuration import AWSConfiguration, client_registry
 
 
 class OfficeWordHandler:
@@ -19,21 +18,21 @@ class OfficeWordHandler:
     stored in S3, including reading, extracting text, and text replacement operations.
     """
 
-    def __init__(self, config=None):
+    def __init__(self, config=None, cache=None):
         """
         Initialize the Office Word handler with AWS configuration.
 
         Args:
             config: An AWSConfiguration object, or None to use environment variables
+            cache: Optional S3ObjectCache serving `read_from_s3` from local
+                disk while documents are unchanged
         """
         if config is None:
             config = AWSConfiguration()
+        self.cache = cache
 
-        # Create a boto3 session with the configuration
-        session = boto3.session.Session(**config.get_boto3_session_args())
-
-        # Create an S3 client with additional configuration if needed
-        self.s3_client = session.client('s3', **config.get_client_args())
+        # Reuse the shared S3 client for this configuration
+        self.s3_client = client_registry.get_client('s3', config)
         logging.info(f'Initialized S3 client in region {config.region}')
 
     def read_from_s3(self, bucket_name, object_name, as_bytes_io=False):
@@ -52,10 +51,15 @@ class OfficeWordHandler:
             Exception: If there is an error retrieving the document
         """
         try:
-            response = self.s3_client.get_object(
-                Bucket=bucket_name, Key=object_name
-            )
-            content = response['Body'].read()
+            if self.cache is not None:
+                content = self.cache.get_bytes(
+                    self.s3_client, bucket_name, object_name
+                )
+            else:
+                response = self.s3_client.get_object(
+                    Bucket=bucket_name, Key=object_name
+                )
+                content = response['Body'].read()
 
             if as_bytes_io:
                 return io.BytesIO(content)
@@ -1,30 +1,51 @@
+import itertools
 import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 
-import boto3
+from botocore.exceptions import ClientError
 
-from auris_tools.configuration import AWSConfiguration
+from auris_tools.configuration import AWSConfiguration, client_registry
+from auris_tools.utils import (
+    chunked,
+    collect_processing_time,
+    merge_iterators,
+)
 
 
 class StorageHandler:
-    def __init__(self, config=None):
+    # Maximum number of keys accepted by a single DeleteObjects call
+    DELETE_BATCH_SIZE = 1000
+    # Default size of streamed chunks and ranged download parts
+    CHUNK_SIZE = 8 * 1024 * 1024
+    # Smallest part size S3 accepts for all but the last multipart part
+    MIN_PART_SIZE = 5 * 1024 * 1024
+    # Keys sharing a folder from which stat_many lists instead of probing
+    STAT_LIST_THRESHOLD = 100
+
+    def __init__(self, config=None, cache=None):
         """
         Initialize the storage handler with AWS configuration.
 
         Args:
             config: An AWSConfiguration object, or None to use environment variables
+            cache: Optional S3ObjectCache serving `download_file` and
+                `get_file_object` from local disk while objects are unchanged
         """
         if config is None:
             config = AWSConfiguration()
+        self.cache = cache
 
-        # Create a boto3 session with the configuration
-        session = boto3.session.Session(**config.get_boto3_session_args())
-
-        # Create an S3 client with additional configuration if needed
-        self.client = session.client('s3', **config.get_client_args())
+        # Reuse the shared S3 client for this configuration
+        self.client = client_registry.get_client('s3', config)
         logging.info(f'Initialized S3 client in region {config.region}')
 
-    def upload_file(self, file_path, bucket_name, object_name):
+    def upload_file(
+        self, file_path, bucket_name, object_name, transfer_config=None
+    ):
         """
         Upload a file to an S3 bucket.
 
@@ -32,12 +53,19 @@ class StorageHandler:
             file_path: Path to the file to upload
             bucket_name: Name of the bucket to upload to
             object_name: S3 object name (key)
+            transfer_config: Optional boto3.s3.transfer.TransferConfig to tune
+                multipart thresholds and concurrency
 
         Returns:
             True if file was uploaded successfully, else False
         """
         try:
-            self.client.upload_file(file_path, bucket_name, object_name)
+            self.client.upload_file(
+                file_path,
+                bucket_name,
+                object_name,
+                **self._transfer_args(transfer_config),
+            )
             logging.info(
                 f'Uploaded {file_path} to {bucket_name}/{object_name}'
             )
@@ -46,7 +74,9 @@ class StorageHandler:
             logging.error(f'Error uploading file {file_path}: {str(e)}')
             return False
 
-    def download_file(self, bucket_name, object_name, file_path):
+    def download_file(
+        self, bucket_name, object_name, file_path, transfer_config=None
+    ):
         """
         Download a file from an S3 bucket.
 
@@ -54,12 +84,25 @@ class StorageHandler:
             bucket_name: Bucket name
             object_name: S3 object name (key)
             file_path: Path where the file should be saved
+            transfer_config: Optional boto3.s3.transfer.TransferConfig to tune
+                multipart thresholds and concurrency (ignored when the
+                handler has a cache)
 
         Returns:
             True if file was downloaded successfully, else False
         """
         try:
-            self.client.download_file(bucket_name, object_name, file_path)
+            if self.cache is not None:
+                self.cache.download(
+                    self.client, bucket_name, object_name, file_path
+                )
+            else:
+                self.client.download_file(
+                    bucket_name,
+                    object_name,
+                    file_path,
+                    **self._transfer_args(transfer_config),
+                )
             logging.info(
                 f'Downloaded {bucket_name}/{object_name} to {file_path}'
             )
@@ -68,6 +111,225 @@ class StorageHandler:
             logging.error(f'Error downloading file {object_name}: {str(e)}')
             return False
 
+    def upload_stream(
+        self,
+        source,
+        bucket_name,
+        object_name,
+        part_size=None,
+        max_workers=4,
+        extra_args=None,
+    ):
+        """
+        Upload data from a generator or file-like object without a temp file.
+
+        Data is cut into parts that are sent concurrently with a multipart
+        upload. At most `max_workers` parts are in flight, so memory stays
+        bounded by about (max_workers + 1) * part_size. Data that fits in a
+        single part is sent with one PutObject call. A failed multipart upload
+        is aborted so no orphan parts are left behind.
+
+        Args:
+            source: Iterable of bytes chunks of any size, or a binary
+                file-like object with a read() method
+            bucket_name: Name of the bucket to upload to
+            object_name: S3 object name (key)
+            part_size: Part size in bytes, defaults to `CHUNK_SIZE` and is
+                raised to `MIN_PART_SIZE` if smaller
+            max_workers: Maximum number of parts uploaded at once
+            extra_args: Optional dict of extra CreateMultipartUpload/PutObject
+                arguments, e.g. {'ContentType': 'audio/wav'}
+
+        Returns:
+            Dict with `object_name`, `success`, `error` (None on success),
+            `bytes`, `parts`, `elapsed` (seconds) and `bytes_per_second`
+        """
+        part_size = max(part_size or self.CHUNK_SIZE, self.MIN_PART_SIZE)
+        extra_args = extra_args or {}
+        result = {
+            'object_name': object_name,
+            'success': True,
+            'error': None,
+            'bytes': 0,
+            'parts': 0,
+        }
+        upload_id = None
+
+        with collect_processing_time() as elapsed:
+            try:
+                parts = self._iter_parts(source, part_size)
+                first = next(parts, b'')
+                second = next(parts, None)
+                if second is None:
+                    self.client.put_object(
+                        Bucket=bucket_name,
+                        Key=object_name,
+                        Body=first,
+                        **extra_args,
+                    )
+                    result['bytes'] = len(first)
+                    result['parts'] = 1
+                else:
+                    upload_id = self.client.create_multipart_upload(
+                        Bucket=bucket_name, Key=object_name, **extra_args
+                    )['UploadId']
+                    uploaded = self._upload_parts(
+                        itertools.chain([first, second], parts),
+                        bucket_name,
+                        object_name,
+                        upload_id,
+                        max_workers,
+                    )
+                    self.client.complete_multipart_upload(
+                        Bucket=bucket_name,
+                        Key=object_name,
+                        UploadId=upload_id,
+                        MultipartUpload={
+                            'Parts': [
+                                {'PartNumber': number, 'ETag': etag}
+                                for number, etag, _ in uploaded
+                            ]
+                        },
+                    )
+                    result['bytes'] = sum(size for _, _, size in uploaded)
+                    result['parts'] = len(uploaded)
+            except Exception as e:
+                logging.error(
+                    f'Error uploading stream {object_name}: {str(e)}'
+                )
+                result['success'] = False
+                result['error'] = str(e)
+                if upload_id is not None:
+                    self._abort_multipart_upload(
+                        bucket_name, object_name, upload_id
+                    )
+            result['elapsed'] = elapsed()
+
+        result['bytes_per_second'] = (
+            result['bytes'] / result['elapsed'] if result['elapsed'] else 0.0
+        )
+        if result['success']:
+            logging.info(
+                f'Uploaded stream to {bucket_name}/{object_name}: '
+                f'{result["bytes"]} bytes in {result["parts"]} parts '
+                f'({result["bytes_per_second"] / 1024 / 1024:.1f} MiB/s)'
+            )
+        return result
+
+    def upload_many(
+        self, files, bucket_name, max_workers=8, transfer_config=None
+    ):
+        """
+        Upload many files concurrently.
+
+        Transfers run on a bounded thread pool sharing this handler's client.
+        Keep `max_workers` times the TransferConfig `max_concurrency` close to
+        the client connection pool size (10 by default) to avoid waiting for
+        connections.
+
+        Args:
+            files: Iterable of (file_path, object_name) pairs
+            bucket_name: Name of the bucket to upload to
+            max_workers: Maximum number of files transferred at once
+            transfer_config: Optional boto3.s3.transfer.TransferConfig
+
+        Returns:
+            List of result dicts, in input order, with the keys `file_path`,
+            `object_name`, `success` and `error` (None on success)
+        """
+        extra_args = self._transfer_args(transfer_config)
+
+        def upload(job):
+            file_path, object_name = job
+            self.client.upload_file(
+                file_path, bucket_name, object_name, **extra_args
+            )
+            logging.info(
+                f'Uploaded {file_path} to {bucket_name}/{object_name}'
+            )
+
+        return self._run_transfers(upload, files, max_workers)
+
+    def download_many(
+        self, bucket_name, objects, max_workers=8, transfer_config=None
+    ):
+        """
+        Download many objects concurrently.
+
+        Missing parent directories of the destination paths are created.
+
+        Args:
+            bucket_name: Bucket name
+            objects: Iterable of (object_name, file_path) pairs
+            max_workers: Maximum number of files transferred at once
+            transfer_config: Optional boto3.s3.transfer.TransferConfig
+
+        Returns:
+            List of result dicts, in input order, with the keys `file_path`,
+            `object_name`, `success` and `error` (None on success)
+        """
+        extra_args = self._transfer_args(transfer_config)
+
+        def download(job):
+            file_path, object_name = job
+            directory = os.path.dirname(file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.client.download_file(
+                bucket_name, object_name, file_path, **extra_args
+            )
+            logging.info(
+                f'Downloaded {bucket_name}/{object_name} to {file_path}'
+            )
+
+        jobs = [(file_path, object_name) for object_name, file_path in objects]
+        return self._run_transfers(download, jobs, max_workers)
+
+    def sync_directory(
+        self,
+        local_directory,
+        bucket_name,
+        prefix='',
+        max_workers=8,
+        transfer_config=None,
+    ):
+        """
+        Upload the files of a local directory that are missing or differ in S3.
+
+        Files are compared by key and size; objects under the prefix are
+        listed once instead of probing each key.
+
+        Args:
+            local_directory: Directory to upload, walked recursively
+            bucket_name: Name of the bucket to upload to
+            prefix: Key prefix prepended to the relative file paths
+            max_workers: Maximum number of files transferred at once
+            transfer_config: Optional boto3.s3.transfer.TransferConfig
+
+        Returns:
+            List of result dicts for the uploaded files (see `upload_many`)
+        """
+        remote_sizes = {
+            obj['key']: obj['size']
+            for obj in self.iter_files(bucket_name, prefix, with_metadata=True)
+        }
+
+        pending = []
+        for root, _, file_names in os.walk(local_directory):
+            for file_name in sorted(file_names):
+                file_path = os.path.join(root, file_name)
+                relative = os.path.relpath(file_path, local_directory)
+                object_name = prefix + relative.replace(os.sep, '/')
+                if remote_sizes.get(object_name) != os.path.getsize(file_path):
+                    pending.append((file_path, object_name))
+
+        logging.info(
+            f'Syncing {len(pending)} files from {local_directory} to {bucket_name}/{prefix}'
+        )
+        return self.upload_many(
+            pending, bucket_name, max_workers, transfer_config
+        )
+
     def get_file_object(self, bucket_name, object_name, as_bytes=False):
         """
         Get a file object from an S3 bucket.
@@ -78,9 +340,20 @@ class StorageHandler:
             as_bytes: If True, return the content as bytes instead of a streaming object
 
         Returns:
-            S3 object (streaming) or bytes if as_bytes=True or None if not found
+            S3 object (streaming) or bytes if as_bytes=True or None if not found.
+            When the handler has a cache, the streaming object is a binary
+            file opened on the cached copy.
         """
         try:
+            if self.cache is not None:
+                if as_bytes:
+                    return self.cache.get_bytes(
+                        self.client, bucket_name, object_name
+                    )
+                return open(
+                    self.cache.get_path(self.client, bucket_name, object_name),
+                    'rb',
+                )
             response = self.client.get_object(
                 Bucket=bucket_name, Key=object_name
             )
@@ -91,6 +364,155 @@ class StorageHandler:
             logging.error(f'Error getting file object {object_name}: {str(e)}')
             return None
 
+    def iter_file_chunks(
+        self, bucket_name, object_name, chunk_size=None, start=None, end=None
+    ):
+        """
+        Stream the content of a file from S3 in fixed-size chunks.
+
+        Only one chunk is held in memory at a time, so arbitrarily large
+        objects can be processed.
+
+        Args:
+            bucket_name: Bucket name
+            object_name: S3 object name (key)
+            chunk_size: Chunk size in bytes, defaults to `CHUNK_SIZE`
+            start: Optional first byte to read (inclusive)
+            end: Optional last byte to read (inclusive)
+
+        Yields:
+            bytes chunks of at most chunk_size bytes
+
+        Raises:
+            Exception: If the object cannot be read
+        """
+        params = {'Bucket': bucket_name, 'Key': object_name}
+        if start is not None or end is not None:
+            params['Range'] = self._byte_range(start or 0, end)
+        response = self.client.get_object(**params)
+        body = response['Body']
+        try:
+            yield from body.iter_chunks(chunk_size or self.CHUNK_SIZE)
+        finally:
+            body.close()
+
+    def get_file_range(self, bucket_name, object_name, start, end=None):
+        """
+        Read a byte range of a file from S3.
+
+        Args:
+            bucket_name: Bucket name
+            object_name: S3 object name (key)
+            start: First byte to read (inclusive)
+            end: Last byte to read (inclusive), or None to read to the end
+
+        Returns:
+            bytes of the requested range or None if an error occurs
+        """
+        try:
+            response = self.client.get_object(
+                Bucket=bucket_name,
+                Key=object_name,
+                Range=self._byte_range(start, end),
+            )
+            return response['Body'].read()
+        except Exception as e:
+            logging.error(
+                f'Error reading range of file object {object_name}: {str(e)}'
+            )
+            return None
+
+    def download_file_ranged(
+        self,
+        bucket_name,
+        object_name,
+        file_path=None,
+        buffer=None,
+        part_size=None,
+        max_workers=8,
+    ):
+        """
+        Download a large file with several concurrent ranged GET requests.
+
+        Parts are written directly at their offset, either in a
+        caller-provided buffer or in a temporary file that replaces the
+        destination once every part is complete, so a failed download leaves
+        no partial file. Every part is pinned to the ETag seen at the start,
+        so a concurrent overwrite makes the download fail instead of mixing
+        versions.
+
+        Args:
+            bucket_name: Bucket name
+            object_name: S3 object name (key)
+            file_path: Path where the file should be saved
+            buffer: Writable, pre-allocated buffer (e.g. bytearray) at least as
+                large as the object, used instead of file_path
+            part_size: Size of each ranged request, defaults to `CHUNK_SIZE`
+            max_workers: Maximum number of concurrent range requests
+
+        Returns:
+            True if the file was downloaded successfully, else False
+
+        Raises:
+            ValueError: If neither or both of file_path and buffer are given
+        """
+        if (file_path is None) == (buffer is None):
+            raise ValueError('Provide either file_path or buffer')
+        part_size = part_size or self.CHUNK_SIZE
+        temp_path = None
+
+        try:
+            head = self.client.head_object(Bucket=bucket_name, Key=object_name)
+            size = head['ContentLength']
+            etag = head.get('ETag')
+            if buffer is not None:
+                target = memoryview(buffer).cast('B')
+                if len(target) < size:
+                    raise ValueError(
+                        f'Buffer of {len(target)} bytes is smaller than the object ({size} bytes)'
+                    )
+            else:
+                # Parts go to a temporary file that replaces the destination
+                # only once complete, so a failure leaves no partial file
+                fd, temp_path = tempfile.mkstemp(
+                    dir=os.path.dirname(os.path.abspath(file_path)),
+                    suffix='.tmp',
+                )
+                with os.fdopen(fd, 'wb') as file:
+                    file.truncate(size)
+
+            def download_part(start):
+                end = min(start + part_size, size) - 1
+                params = {
+                    'Bucket': bucket_name,
+                    'Key': object_name,
+                    'Range': self._byte_range(start, end),
+                }
+                if etag:
+                    params['IfMatch'] = etag
+                data = self.client.get_object(**params)['Body'].read()
+                if buffer is not None:
+                    target[start : start + len(data)] = data
+                else:
+                    with open(temp_path, 'r+b') as file:
+                        file.seek(start)
+                        file.write(data)
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(download_part, range(0, size, part_size)))
+            if temp_path is not None:
+                os.replace(temp_path, file_path)
+
+            logging.info(
+                f'Downloaded {bucket_name}/{object_name} ({size} bytes) in ranged parts'
+            )
+            return True
+        except Exception as e:
+            logging.error(f'Error downloading file {object_name}: {str(e)}')
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+
     def check_file_exists(self, bucket_name, object_name):
         """
         Check if a file exists in an S3 bucket.
@@ -130,20 +552,134 @@ class StorageHandler:
             )
             return None
 
-    def delete_file(self, bucket_name, object_name):
+    def stat_many(
+        self, bucket_name, object_names, max_workers=16, list_threshold=None
+    ):
+        """
+        Get the metadata of many files at once.
+
+        Keys are grouped by folder (the part before the last '/'). Folders
+        holding at least `list_threshold` of the requested keys are read with
+        one paginated listing, since a page returns up to 1000 objects per
+        request; the listing only covers the range between the smallest and
+        largest requested key. The remaining keys are probed with concurrent
+        HEAD requests.
+
+        Args:
+            bucket_name: Bucket name
+            object_names: Iterable of S3 object names (keys)
+            max_workers: Maximum number of concurrent requests
+            list_threshold: Minimum number of keys in one folder to switch to
+                listing, defaults to `STAT_LIST_THRESHOLD`
+
+        Returns:
+            Dict mapping each key to a dict with `exists`, `size`, `etag`,
+            `last_modified` and `error` (None unless the probe failed for a
+            reason other than the object being missing)
+        """
+        list_threshold = list_threshold or self.STAT_LIST_THRESHOLD
+        folders = {}
+        for object_name in dict.fromkeys(object_names):
+            folder = object_name.rpartition('/')[0]
+            folders.setdefault(folder, []).append(object_name)
+
+        listed = []
+        probed = []
+        for folder, keys in folders.items():
+            if len(keys) >= list_threshold:
+                listed.append((folder, keys))
+            else:
+                probed.extend(keys)
+
+        def stat_folder(job):
+            folder, keys = job
+            wanted = set(keys)
+            found = {}
+            prefix = f'{folder}/' if folder else ''
+            # Only list the key range spanned by the requested keys: start
+            # just below the smallest and stop after the largest
+            first, last = min(keys), max(keys)
+            start_after = first[:-1] + chr(max(ord(first[-1]) - 1, 0))
+            try:
+                for obj in self.iter_files(
+                    bucket_name,
+                    prefix,
+                    delimiter='/',
+                    start_after=start_after,
+                    with_metadata=True,
+                ):
+                    if obj['key'] > last:
+                        break
+                    if obj['key'] in wanted:
+                        found[obj['key']] = self._stat_result(
+                            True,
+                            obj['size'],
+                            obj['etag'],
+                            obj['last_modified'],
+                        )
+            except Exception as e:
+                logging.error(
+                    f'Error listing files in {bucket_name}/{prefix}: {str(e)}'
+                )
+                return {
+                    key: self._stat_result(False, error=str(e)) for key in keys
+                }
+            return {
+                key: found.get(key, self._stat_result(False)) for key in keys
+            }
+
+        def stat_key(object_name):
+            try:
+                response = self.client.head_object(
+                    Bucket=bucket_name, Key=object_name
+                )
+                result = self._stat_result(
+                    True,
+                    response.get('ContentLength'),
+                    response.get('ETag'),
+                    response.get('LastModified'),
+                )
+            except ClientError as e:
+                error = None
+                if e.response.get('Error', {}).get('Code') not in (
+                    '404',
+                    'NoSuchKey',
+                    'NotFound',
+                ):
+                    error = str(e)
+                result = self._stat_result(False, error=error)
+            except Exception as e:
+                result = self._stat_result(False, error=str(e))
+            return {object_name: result}
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for result in itertools.chain(
+                executor.map(stat_folder, listed),
+                executor.map(stat_key, probed),
+            ):
+                results.update(result)
+        return results
+
+    def delete_file(self, bucket_name, object_name, check_exists=True):
         """
         Delete a file from an S3 bucket.
 
         Args:
             bucket_name: Bucket name
             object_name: S3 object name (key)
+            check_exists: If True, probe the object with a HEAD request first
+                and return False when it does not exist. Set to False to save
+                the extra round trip; S3 then reports success for missing keys.
 
         Returns:
             True if file was deleted successfully, else False
         """
         try:
             # Check if file exists before attempting deletion
-            if not self.check_file_exists(bucket_name, object_name):
+            if check_exists and not self.check_file_exists(
+                bucket_name, object_name
+            ):
                 logging.warning(
                     f'File {bucket_name}/{object_name} does not exist.'
                 )
@@ -168,10 +704,92 @@ class StorageHandler:
             logging.error(f'Error deleting file {object_name}: {str(e)}')
             return False
 
+    def delete_files(
+        self, bucket_name, object_names=None, prefix=None, max_workers=4
+    ):
+        """
+        Delete many files with DeleteObjects requests.
+
+        Keys are sent in batches of `DELETE_BATCH_SIZE`, and batches run in
+        parallel. Either explicit keys or a prefix must be given.
+
+        Args:
+            bucket_name: Bucket name
+            object_names: Iterable of object keys to delete
+            prefix: Delete every object under this prefix instead
+            max_workers: Maximum number of batches sent at once
+
+        Returns:
+            Dict with `deleted` (list of deleted keys) and `errors` (list of
+            dicts with `key`, `code` and `message`)
+
+        Raises:
+            ValueError: If neither or both of object_names and prefix are given
+        """
+        if (object_names is None) == (prefix is None):
+            raise ValueError('Provide either object_names or prefix')
+        if prefix is not None:
+            object_names = self.iter_files(bucket_name, prefix)
+
+        # Batches are read from the keys as slots free up, so a prefix is
+        # listed while it is deleted instead of being read up front
+        slots = threading.BoundedSemaphore(max_workers)
+
+        def delete_batch(keys):
+            try:
+                response = self.client.delete_objects(
+                    Bucket=bucket_name,
+                    Delete={
+                        'Objects': [{'Key': key} for key in keys],
+                        'Quiet': True,
+                    },
+                )
+                errors = [
+                    {
+                        'key': error.get('Key'),
+                        'code': error.get('Code'),
+                        'message': error.get('Message'),
+                    }
+                    for error in response.get('Errors', [])
+                ]
+            except Exception as e:
+                logging.error(
+                    f'Error deleting {len(keys)} files from {bucket_name}: {str(e)}'
+                )
+                errors = [
+                    {'key': key, 'code': type(e).__name__, 'message': str(e)}
+                    for key in keys
+                ]
+            finally:
+                slots.release()
+            failed = {error['key'] for error in errors}
+            return [key for key in keys if key not in failed], errors
+
+        futures = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for keys in chunked(object_names, self.DELETE_BATCH_SIZE):
+                slots.acquire()
+                futures.append(executor.submit(delete_batch, keys))
+
+        result = {'deleted': [], 'errors': []}
+        for future in futures:
+            deleted, errors = future.result()
+            result['deleted'].extend(deleted)
+            result['errors'].extend(errors)
+
+        logging.info(
+            f'Deleted {len(result["deleted"])} files from {bucket_name} '
+            f'({len(result["errors"])} errors)'
+        )
+        return result
+
     def list_files(self, bucket_name, prefix=''):
         """
         List files in an S3 bucket with optional prefix filtering.
 
+        All result pages are followed, so buckets with more than 1000 matching
+        keys are listed completely. Use `iter_files` to stream large listings.
+
         Args:
             bucket_name: Bucket name
             prefix: Prefix to filter objects (folder path)
@@ -180,16 +798,239 @@ class StorageHandler:
             List of object keys or empty list if error occurs
         """
         try:
-            response = self.client.list_objects_v2(
-                Bucket=bucket_name, Prefix=prefix
-            )
-            files = []
-            if 'Contents' in response:
-                for obj in response['Contents']:
-                    files.append(obj['Key'])
-            return files
+            return list(self.iter_files(bucket_name, prefix))
         except Exception as e:
             logging.error(
                 f'Error listing files in {bucket_name}/{prefix}: {str(e)}'
             )
             return []
+
+    def iter_files(
+        self,
+        bucket_name,
+        prefix='',
+        delimiter=None,
+        start_after=None,
+        with_metadata=False,
+        page_size=None,
+    ):
+        """
+        Lazily iterate over the objects of an S3 bucket, page by page.
+
+        Args:
+            bucket_name: Bucket name
+            prefix: Prefix to filter objects (folder path)
+            delimiter: If set (e.g. '/'), only objects directly under the
+                prefix are listed; see `iter_directories` for sub-folders
+            start_after: Only list keys after this one, in lexical order
+            with_metadata: If True, yield dicts with `key`, `size`, `etag`
+                and `last_modified` instead of plain keys
+            page_size: Maximum keys requested per page (up to 1000)
+
+        Yields:
+            Object keys, or metadata dicts if with_metadata=True
+
+        Raises:
+            Exception: If a listing request fails
+        """
+        for page in self._iter_list_pages(
+            bucket_name, prefix, delimiter, start_after, page_size
+        ):
+            for obj in page.get('Contents', []):
+                if with_metadata:
+                    yield {
+                        'key': obj['Key'],
+                        'size': obj.get('Size'),
+                        'etag': obj.get('ETag'),
+                        'last_modified': obj.get('LastModified'),
+                    }
+                else:
+                    yield obj['Key']
+
+    def iter_directories(self, bucket_name, prefix='', delimiter='/'):
+        """
+        Lazily iterate over the "sub-folders" directly under a prefix.
+
+        Args:
+            bucket_name: Bucket name
+            prefix: Parent prefix (folder path)
+            delimiter: Folder separator
+
+        Yields:
+            Common prefixes, e.g. 'recordings/2024/'
+
+        Raises:
+            Exception: If a listing request fails
+        """
+        for page in self._iter_list_pages(bucket_name, prefix, delimiter):
+            for common_prefix in page.get('CommonPrefixes', []):
+                yield common_prefix['Prefix']
+
+    def iter_files_many(
+        self, bucket_name, prefixes, max_workers=8, **list_kwargs
+    ):
+        """
+        List several prefixes in parallel as a single stream.
+
+        Useful for very large buckets whose keys are spread across known
+        prefixes. The order of keys across prefixes is not defined.
+
+        Args:
+            bucket_name: Bucket name
+            prefixes: List of prefixes to list
+            max_workers: Maximum number of prefixes listed at once
+            **list_kwargs: Arguments forwarded to `iter_files`
+
+        Yields:
+            Object keys, or metadata dicts if with_metadata=True
+
+        Raises:
+            Exception: If a listing request fails
+        """
+        yield from merge_iterators(
+            [
+                self.iter_files(bucket_name, prefix, **list_kwargs)
+                for prefix in prefixes
+            ],
+            max_workers=max_workers,
+        )
+
+    def _iter_list_pages(
+        self,
+        bucket_name,
+        prefix='',
+        delimiter=None,
+        start_after=None,
+        page_size=None,
+    ):
+        """Yield the raw list_objects_v2 pages of a listing"""
+        params = {'Bucket': bucket_name, 'Prefix': prefix}
+        if delimiter:
+            params['Delimiter'] = delimiter
+        if start_after:
+            params['StartAfter'] = start_after
+        if page_size:
+            params['PaginationConfig'] = {'PageSize': page_size}
+
+        paginator = self.client.get_paginator('list_objects_v2')
+        yield from paginator.paginate(**params)
+
+    def _upload_parts(
+        self, parts, bucket_name, object_name, upload_id, max_workers
+    ):
+        """
+        Upload multipart parts concurrently with bounded memory.
+
+        Returns:
+            List of (part number, ETag, size) tuples in part order
+
+        Raises:
+            Exception: The first error raised while uploading a part
+        """
+        slots = threading.BoundedSemaphore(max_workers)
+        failed = threading.Event()
+
+        def upload_part(number, data):
+            try:
+                response = self.client.upload_part(
+                    Bucket=bucket_name,
+                    Key=object_name,
+                    UploadId=upload_id,
+                    PartNumber=number,
+                    Body=data,
+                )
+                return number, response['ETag'], len(data)
+            except Exception:
+                failed.set()
+                raise
+            finally:
+                slots.release()
+
+        futures = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for number, data in enumerate(parts, start=1):
+                slots.acquire()
+                if failed.is_set():
+                    slots.release()
+                    break
+                futures.append(executor.submit(upload_part, number, data))
+        return [future.result() for future in futures]
+
+    def _abort_multipart_upload(self, bucket_name, object_name, upload_id):
+        """Abort a multipart upload, logging failures"""
+        try:
+            self.client.abort_multipart_upload(
+                Bucket=bucket_name, Key=object_name, UploadId=upload_id
+            )
+            logging.info(f'Aborted multipart upload of {object_name}')
+        except Exception as e:
+            logging.error(
+                f'Error aborting multipart upload of {object_name}: {str(e)}'
+            )
+
+    @staticmethod
+    def _iter_parts(source, part_size):
+        """Regroup a file-like object or an iterable of bytes into parts"""
+        if hasattr(source, 'read'):
+            read = source.read
+            source = iter(lambda: read(part_size), b'')
+
+        buffer = bytearray()
+        for chunk in source:
+            buffer += chunk
+            while len(buffer) >= part_size:
+                yield bytes(buffer[:part_size])
+                del buffer[:part_size]
+        if buffer:
+            yield bytes(buffer)
+
+    @staticmethod
+    def _stat_result(
+        exists, size=None, etag=None, last_modified=None, error=None
+    ):
+        """Build a stat_many result entry"""
+        return {
+            'exists': exists,
+            'size': size,
+            'etag': etag,
+            'last_modified': last_modified,
+            'error': error,
+        }
+
+    @staticmethod
+    def _byte_range(start, end=None):
+        """Build an HTTP Range header value (inclusive bounds)"""
+        return f'bytes={start}-{"" if end is None else end}'
+
+    @staticmethod
+    def _transfer_args(transfer_config):
+        """Build the optional Config argument of managed transfers"""
+        return {'Config': transfer_config} if transfer_config else {}
+
+    @staticmethod
+    def _run_transfers(transfer, jobs, max_workers):
+        """
+        Run (file_path, object_name) transfer jobs on a thread pool.
+
+        Returns:
+            List of per-job result dicts, in input order
+        """
+
+        def run(job):
+            file_path, object_name = job
+            result = {
+                'file_path': file_path,
+                'object_name': object_name,
+                'success': True,
+                'error': None,
+            }
+            try:
+                transfer(job)
+            except Exception as e:
+                logging.error(f'Error transferring {object_name}: {str(e)}')
+                result['success'] = False
+                result['error'] = str(e)
+            return result
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(run, jobs))
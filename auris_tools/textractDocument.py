@@ -0,0 +1,406 @@
+import csv
+import io
+
+
+class TextractDocument:
+    """
+    Indexed, page-aware view of the blocks returned by Textract.
+
+    The blocks are indexed once by ID, page and parent/child relationship,
+    so looking up a block, its children or its parent takes constant time
+    and per-page text never rescans the raw block lists. Results of document
+    analysis also expose their tables and form fields, rebuilt from the same
+    index in time linear in the number of blocks.
+
+    Args:
+        response: Iterable of Textract response pages (e.g. the output of
+            `TextractHandler.get_job_results` or `iter_job_results`)
+
+    Example:
+        >>> document = TextractDocument(handler.iter_job_results(job_id))
+        >>> for page in document.pages:
+        ...     print(page.number, page.text)
+    """
+
+    def __init__(self, response):
+        self.blocks = {}
+        self._children = {}
+        self._parents = {}
+        self._values = {}
+        self._page_blocks = {}
+        self._blocks_by_page = {}
+
+        for result_page in response:
+            for block in result_page.get('Blocks', []):
+                self._add_block(block)
+
+        self.pages = [
+            TextractPage(self, number, self._page_blocks.get(number))
+            for number in sorted(self._blocks_by_page)
+        ]
+
+    @classmethod
+    def from_blocks(cls, blocks):
+        """
+        Build a document from a flat list of blocks.
+
+        Args:
+            blocks: Iterable of Textract blocks
+
+        Returns:
+            TextractDocument: The indexed document
+        """
+        return cls([{'Blocks': blocks}])
+
+    def _add_block(self, block):
+        block_id = block['Id']
+        page_number = block.get('Page', 1)
+        self.blocks[block_id] = block
+        self._blocks_by_page.setdefault(page_number, []).append(block_id)
+        if block.get('BlockType') == 'PAGE':
+            self._page_blocks[page_number] = block
+
+        for relationship in block.get('Relationships', []):
+            related_ids = relationship.get('Ids', [])
+            if relationship.get('Type') == 'VALUE':
+                self._values.setdefault(block_id, []).extend(related_ids)
+            elif relationship.get('Type') == 'CHILD':
+                self._children.setdefault(block_id, []).extend(related_ids)
+                for child_id in related_ids:
+                    self._parents[child_id] = block_id
+
+    @property
+    def page_count(self):
+        """Number of pages in the document"""
+        return len(self.pages)
+
+    @property
+    def text(self):
+        """Text of every page in reading order, pages separated by a blank line"""
+        return '\n\n'.join(page.text for page in self.pages)
+
+    def get_page(self, number):
+        """
+        Return a page by its one-based number.
+
+        Args:
+            number: Page number, starting at 1
+
+        Returns:
+            TextractPage: The page, or None if the document has no such page
+        """
+        for page in self.pages:
+            if page.number == number:
+                return page
+        return None
+
+    def get_block(self, block_id):
+        """
+        Return a block by ID.
+
+        Args:
+            block_id: ID of the block
+
+        Returns:
+            dict: The block, or None if it is unknown
+        """
+        return self.blocks.get(block_id)
+
+    def children(self, block_id, block_type=None):
+        """
+        Return the child blocks of a block, in Textract order.
+
+        Args:
+            block_id: ID of the parent block
+            block_type: Optional block type the children must have
+
+        Returns:
+            list: The child blocks
+        """
+        children = []
+        for child_id in self._children.get(block_id, []):
+            child = self.blocks.get(child_id)
+            if child is None:
+                continue
+            if block_type is None or child.get('BlockType') == block_type:
+                children.append(child)
+        return children
+
+    def parent(self, block_id):
+        """
+        Return the parent block of a block.
+
+        Args:
+            block_id: ID of the child block
+
+        Returns:
+            dict: The parent block, or None for top-level blocks
+        """
+        parent_id = self._parents.get(block_id)
+        return self.blocks.get(parent_id) if parent_id else None
+
+    def tables(self, page=None):
+        """
+        Return the tables found by document analysis.
+
+        Args:
+            page: Optional page number to restrict the tables to
+
+        Returns:
+            list: TextractTable objects, in document order
+        """
+        numbers = (
+            [page] if page is not None else [p.number for p in self.pages]
+        )
+        return [
+            TextractTable(self, block)
+            for number in numbers
+            for block in self.blocks_on_page(number, block_type='TABLE')
+        ]
+
+    def form_fields(self, page=None):
+        """
+        Return the key-value pairs found by document analysis.
+
+        Args:
+            page: Optional page number to restrict the fields to
+
+        Returns:
+            list: Dicts with the `key` and `value` text, the `page` number
+            and the key `confidence`, in document order
+        """
+        numbers = (
+            [page] if page is not None else [p.number for p in self.pages]
+        )
+        fields = []
+        for number in numbers:
+            for block in self.blocks_on_page(number, 'KEY_VALUE_SET'):
+                if 'KEY' not in block.get('EntityTypes', []):
+                    continue
+                value_text = ' '.join(
+                    self.block_text(value_id)
+                    for value_id in self._values.get(block['Id'], [])
+                )
+                fields.append(
+                    {
+                        'key': self.block_text(block['Id']),
+                        'value': value_text,
+                        'page': number,
+                        'confidence': block.get('Confidence'),
+                    }
+                )
+        return fields
+
+    def block_text(self, block_id):
+        """
+        Return the text of a block from its WORD and selection children.
+
+        Selected checkboxes are rendered as 'X'.
+
+        Args:
+            block_id: ID of the block
+
+        Returns:
+            str: The words of the block joined by spaces
+        """
+        words = []
+        for child in self.children(block_id):
+            block_type = child.get('BlockType')
+            if block_type == 'WORD':
+                words.append(child.get('Text', ''))
+            elif block_type == 'SELECTION_ELEMENT':
+                if child.get('SelectionStatus') == 'SELECTED':
+                    words.append('X')
+        return ' '.join(words)
+
+    def blocks_on_page(self, number, block_type=None):
+        """
+        Return the blocks of one page, in Textract order.
+
+        Args:
+            number: Page number, starting at 1
+            block_type: Optional block type the blocks must have
+
+        Returns:
+            list: The blocks of the page
+        """
+        blocks = (
+            self.blocks[block_id]
+            for block_id in self._blocks_by_page.get(number, [])
+        )
+        if block_type is None:
+            return list(blocks)
+        return [b for b in blocks if b.get('BlockType') == block_type]
+
+
+class TextractPage:
+    """
+    One page of a TextractDocument.
+
+    Args:
+        document: The TextractDocument the page belongs to
+        number: Page number, starting at 1
+        block: The PAGE block, or None if the response had none
+    """
+
+    def __init__(self, document, number, block=None):
+        self.document = document
+        self.number = number
+        self.block = block
+        self._lines = None
+
+    @property
+    def lines(self):
+        """LINE blocks of the page, in Textract order"""
+        if self._lines is None:
+            if self.block is not None:
+                self._lines = self.document.children(
+                    self.block['Id'], block_type='LINE'
+                )
+            else:
+                self._lines = self.document.blocks_on_page(
+                    self.number, block_type='LINE'
+                )
+        return self._lines
+
+    def words(self, line=None):
+        """
+        Return WORD blocks with their geometry.
+
+        Args:
+            line: Optional LINE block whose words to return. Defaults to
+                every word of the page.
+
+        Returns:
+            list: The WORD blocks
+        """
+        if line is not None:
+            return self.document.children(line['Id'], block_type='WORD')
+        return [
+            word
+            for page_line in self.lines
+            for word in self.document.children(
+                page_line['Id'], block_type='WORD'
+            )
+        ]
+
+    def reading_order(self, row_tolerance=0.5):
+        """
+        Return the lines sorted top to bottom, then left to right.
+
+        Lines whose vertical centers are closer than `row_tolerance` times
+        their height are treated as one row, so text split into columns on
+        the same baseline is read left to right.
+
+        Args:
+            row_tolerance: Fraction of the line height within which two
+                lines share a row
+
+        Returns:
+            list: LINE blocks in reading order
+        """
+        positioned = []
+        for line in self.lines:
+            box = line.get('Geometry', {}).get('BoundingBox')
+            if not box:
+                return list(self.lines)
+            center = box['Top'] + box['Height'] / 2
+            positioned.append((center, box['Left'], box['Height'], line))
+        positioned.sort(key=lambda item: (item[0], item[1]))
+
+        rows = []
+        for center, left, height, line in positioned:
+            if rows and abs(center - rows[-1][0]) <= height * row_tolerance:
+                rows[-1][1].append((left, line))
+            else:
+                rows.append((center, [(left, line)]))
+
+        return [
+            line
+            for _, row in rows
+            for _, line in sorted(row, key=lambda item: item[0])
+        ]
+
+    @property
+    def text(self):
+        """Text of the page, one line per LINE block in reading order"""
+        return '\n'.join(line.get('Text', '') for line in self.reading_order())
+
+
+class TextractTable:
+    """
+    A table of a TextractDocument, rebuilt from its CELL blocks.
+
+    Cells spanning several rows or columns are written to their top-left
+    position, and the positions they cover are left empty.
+
+    Args:
+        document: The TextractDocument the table belongs to
+        block: The TABLE block
+    """
+
+    def __init__(self, document, block):
+        self.document = document
+        self.block = block
+        self.page = block.get('Page', 1)
+        self._rows = None
+
+    @property
+    def rows(self):
+        """Rows of the table as lists of cell text"""
+        if self._rows is None:
+            cells = self.document.children(self.block['Id'], 'CELL')
+            row_count = max(
+                (c['RowIndex'] + c.get('RowSpan', 1) - 1 for c in cells),
+                default=0,
+            )
+            column_count = max(
+                (c['ColumnIndex'] + c.get('ColumnSpan', 1) - 1 for c in cells),
+                default=0,
+            )
+            rows = [[''] * column_count for _ in range(row_count)]
+            for cell in cells:
+                row = rows[cell['RowIndex'] - 1]
+                row[cell['ColumnIndex'] - 1] = self.document.block_text(
+                    cell['Id']
+                )
+            self._rows = rows
+        return self._rows
+
+    def iter_rows(self):
+        """Yield the rows of the table as lists of cell text"""
+        yield from self.rows
+
+    def iter_csv(self, **fmtparams):
+        """
+        Yield the table as CSV, one formatted line per row.
+
+        Args:
+            **fmtparams: Formatting options of `csv.writer`
+
+        Yields:
+            str: One CSV line, including its line terminator
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, **fmtparams)
+        for row in self.iter_rows():
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    def to_csv(self, file=None, **fmtparams):
+        """
+        Write the table as CSV.
+
+        Args:
+            file: Optional text file object to write to
+            **fmtparams: Formatting options of `csv.writer`
+
+        Returns:
+            str: The CSV text if no file was given, else None
+        """
+        if file is None:
+            return ''.join(self.iter_csv(**fmtparams))
+        file.writelines(self.iter_csv(**fmtparams))
+        return None
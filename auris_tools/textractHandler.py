@@ -1,9 +1,116 @@
+import heapq
+import itertools
+import json
 import logging
+import random
 import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
-import boto3
+from botocore.exceptions import ClientError
 
-from auris_tools.configuration import AWSConfiguration
+from auris_tools.configuration import AWSConfiguration, client_registry
+from auris_tools.textractDocument import TextractDocument
+from auris_tools.utils import LRUCache, RateLimiter, backoff_delay, chunked
+
+# Error codes returned when a Textract quota is exceeded
+THROTTLING_ERROR_CODES = frozenset(
+    {
+        'ProvisionedThroughputExceededException',
+        'ThrottlingException',
+        'LimitExceededException',
+    }
+)
+
+# Prefix of the job IDs returned for results served by a result cache
+CACHED_JOB_PREFIX = 'cached-'
+
+
+def is_throttling_error(error):
+    """
+    Check if an exception was raised because a Textract quota was exceeded.
+
+    Args:
+        error: The exception raised by a boto3 call
+
+    Returns:
+        bool: True for throttling errors, else False
+    """
+    return (
+        isinstance(error, ClientError)
+        and error.response.get('Error', {}).get('Code')
+        in THROTTLING_ERROR_CODES
+    )
+
+
+def poll_delay(attempt, base=1.0, cap=30.0):
+    """
+    Compute the delay before polling a running job again.
+
+    The delay doubles with each attempt up to `cap`, with half of it
+    randomized so that many jobs started together do not poll in lockstep.
+
+    Args:
+        attempt: Zero-based number of polls already made
+        base: Delay in seconds before the second poll
+        cap: Maximum delay in seconds
+
+    Returns:
+        float: Number of seconds to wait
+    """
+    delay = min(cap, base * 2**attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def poll_delays(job_id, timeout=None, base=1.0, cap=30.0):
+    """
+    Yield the delays to sleep before each poll of a running job.
+
+    Delays follow `poll_delay` and are shortened to end at the deadline.
+    Both the blocking and the asyncio `wait_for_job` sleep on this schedule.
+
+    Args:
+        job_id: ID of the job, used in the timeout message
+        timeout: Maximum number of seconds to wait in total, or None to wait
+            forever
+        base: Delay in seconds before the first poll
+        cap: Maximum delay in seconds between two polls
+
+    Yields:
+        float: Number of seconds to wait before the next poll
+
+    Raises:
+        TimeoutError: When the next delay is requested after the deadline
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    for attempt in itertools.count():
+        delay = poll_delay(attempt, base=base, cap=cap)
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(
+                    f'Textract job {job_id} did not finish '
+                    f'within {timeout} seconds'
+                )
+            delay = min(delay, remaining)
+        yield delay
+
+
+def _document_result(bucket, key, job_id, status, pages=None, error=None):
+    """Build the result reported for one processed document"""
+    if error is not None:
+        logging.error(
+            f'Textract processing failed for {bucket}/{key}: {str(error)}'
+        )
+    return {
+        'bucket': bucket,
+        'key': key,
+        'job_id': job_id,
+        'status': status,
+        'pages': pages,
+        'error': str(error) if error is not None else None,
+    }
 
 
 class TextractHandler:
@@ -14,30 +121,66 @@ class TextractHandler:
     text extraction from documents stored in S3.
     """
 
-    def __init__(self, config=None):
+    # Retries of a throttled request before the error is raised
+    MAX_THROTTLE_RETRIES = 8
+    # Largest document DetectDocumentText accepts, in bytes
+    SYNC_MAX_BYTES = 10 * 1024 * 1024
+    # Content types DetectDocumentText can always process synchronously
+    SYNC_IMAGE_TYPES = frozenset({'image/jpeg', 'image/png', 'image/tiff'})
+    # Jobs tracked for the result cache, least recently used dropped first
+    TRACKED_JOBS_MAX = 10000
+
+    def __init__(self, config=None, result_cache=None):
         """
         Initialize the Textract handler with AWS configuration.
 
         Args:
             config: An AWSConfiguration object, or None to use environment variables
+            result_cache: Optional TextractResultCache. When set, documents
+                whose current version was already processed are served from
+                the cache instead of running Textract again.
         """
         if config is None:
             config = AWSConfiguration()
 
-        # Create a boto3 session with the configuration
-        session = boto3.session.Session(**config.get_boto3_session_args())
-
-        # Create a Textract client with additional configuration if needed
-        self.client = session.client('textract', **config.get_client_args())
+        self.config = config
+        self.result_cache = result_cache
+        # S3 object version (bucket, key, ETag) of cache hits, by synthetic
+        # job ID; the pages themselves stay in the result cache
+        self._cached_jobs = LRUCache(self.TRACKED_JOBS_MAX)
+        # S3 object version of started jobs whose results will be cached
+        self._uncached_jobs = LRUCache(self.TRACKED_JOBS_MAX)
+        # Reuse the shared Textract client for this configuration
+        self.client = client_registry.get_client('textract', config)
         logging.info(f'Initialized Textract client in region {config.region}')
 
-    def start_job(self, s3_bucket_name, object_name):
+    def start_job(
+        self,
+        s3_bucket_name,
+        object_name,
+        notification_channel=None,
+        job_tag=None,
+    ):
         """
         Start an asynchronous text detection job for a document in S3.
 
+        When a notification channel is given, Textract publishes the job
+        completion to that SNS topic, so the job does not need to be polled
+        (see `TextractNotificationConsumer`).
+
         Args:
             s3_bucket_name: Name of the S3 bucket containing the document
             object_name: Object key of the document in the S3 bucket
+            notification_channel: Optional dict with the `SNSTopicArn` to
+                notify and the `RoleArn` Textract uses to publish to it
+            job_tag: Optional tag included in the completion notification
+
+        If a result cache is set and holds the results of the current
+        object version, no job is started: a synthetic job ID is returned
+        that reports success and serves the cached pages for as long as the
+        result cache keeps them, or until `release_job` is called. The cache
+        is not used when a notification channel is given, as no notification
+        would be published.
 
         Returns:
             str: The JobId of the started Textract job
@@ -45,16 +188,49 @@ class TextractHandler:
         Raises:
             Exception: If there is an error starting the job
         """
+        etag = None
+        if self.result_cache is not None and not notification_channel:
+            etag = self._head_object(s3_bucket_name, object_name).get('ETag')
+        return self._start_job(
+            s3_bucket_name, object_name, etag, notification_channel, job_tag
+        )
+
+    def _start_job(
+        self,
+        s3_bucket_name,
+        object_name,
+        etag=None,
+        notification_channel=None,
+        job_tag=None,
+    ):
+        """Start a text detection job, or reuse cached results for the ETag"""
+        if etag is not None:
+            version = (s3_bucket_name, object_name, etag)
+            if self.result_cache.get(*version) is not None:
+                job_id = f'{CACHED_JOB_PREFIX}{uuid.uuid4().hex}'
+                self._cached_jobs.set(job_id, version)
+                return job_id
+
+        params = {
+            'DocumentLocation': {
+                'S3Object': {'Bucket': s3_bucket_name, 'Name': object_name}
+            }
+        }
+        if notification_channel:
+            params['NotificationChannel'] = notification_channel
+        if job_tag:
+            params['JobTag'] = job_tag
+
         try:
-            response = self.client.start_document_text_detection(
-                DocumentLocation={
-                    'S3Object': {'Bucket': s3_bucket_name, 'Name': object_name}
-                }
-            )
+            response = self.client.start_document_text_detection(**params)
             job_id = response['JobId']
             logging.info(
                 f'Started Textract job {job_id} for {s3_bucket_name}/{object_name}'
             )
+            if etag is not None:
+                self._uncached_jobs.set(
+                    job_id, (s3_bucket_name, object_name, etag)
+                )
             return job_id
         except Exception as e:
             logging.error(
@@ -62,6 +238,192 @@ class TextractHandler:
             )
             raise
 
+    def start_analysis_job(
+        self,
+        s3_bucket_name,
+        object_name,
+        feature_types=('TABLES', 'FORMS'),
+        notification_channel=None,
+        job_tag=None,
+    ):
+        """
+        Start an asynchronous document analysis job for a document in S3.
+
+        Analysis extracts tables and form key-value pairs in addition to
+        text. Wait for the job with `wait_for_job(job_id, analysis=True)`
+        and read it with `get_analysis_document`.
+
+        Args:
+            s3_bucket_name: Name of the S3 bucket containing the document
+            object_name: Object key of the document in the S3 bucket
+            feature_types: Analysis features ('TABLES', 'FORMS', ...)
+            notification_channel: Optional dict with the `SNSTopicArn` to
+                notify and the `RoleArn` Textract uses to publish to it
+            job_tag: Optional tag included in the completion notification
+
+        Returns:
+            str: The JobId of the started Textract job
+
+        Raises:
+            Exception: If there is an error starting the job
+        """
+        params = {
+            'DocumentLocation': {
+                'S3Object': {'Bucket': s3_bucket_name, 'Name': object_name}
+            },
+            'FeatureTypes': list(feature_types),
+        }
+        if notification_channel:
+            params['NotificationChannel'] = notification_channel
+        if job_tag:
+            params['JobTag'] = job_tag
+
+        try:
+            response = self.client.start_document_analysis(**params)
+            job_id = response['JobId']
+            logging.info(
+                f'Started Textract analysis job {job_id} for '
+                f'{s3_bucket_name}/{object_name}'
+            )
+            return job_id
+        except Exception as e:
+            logging.error(
+                f'Error starting Textract analysis job for '
+                f'{s3_bucket_name}/{object_name}: {str(e)}'
+            )
+            raise
+
+    def detect_text(
+        self,
+        s3_bucket_name=None,
+        object_name=None,
+        document_bytes=None,
+        timeout=None,
+    ):
+        """
+        Detect the text of a document, synchronously when possible.
+
+        Images and PDFs small enough for `DetectDocumentText` are processed
+        with one synchronous call; the S3 object size and content type are
+        read with a HEAD request. Larger documents, and PDFs with more than
+        one page, go through an asynchronous job instead. Either way the
+        result is a list of response pages, so `get_full_text` and
+        `TextractDocument` work unchanged.
+
+        Args:
+            s3_bucket_name: Name of the S3 bucket containing the document
+            object_name: Object key of the document in the S3 bucket
+            document_bytes: Document content, instead of an S3 object.
+                Always processed synchronously.
+            timeout: Maximum number of seconds to wait for an asynchronous
+                job, or None to wait until it finishes
+
+        Returns:
+            list: List of response pages from Textract
+
+        Raises:
+            ValueError: If neither an S3 object nor bytes are given
+            Exception: If the text cannot be detected
+        """
+        if document_bytes is not None:
+            return [self._detect_text_sync({'Bytes': document_bytes})]
+        if not (s3_bucket_name and object_name):
+            raise ValueError('Provide an S3 bucket and object, or bytes')
+
+        head = self._head_object(s3_bucket_name, object_name)
+        if self.result_cache is not None:
+            pages = self.result_cache.get(
+                s3_bucket_name, object_name, head.get('ETag')
+            )
+            if pages is not None:
+                return pages
+
+        if self._can_detect_sync(object_name, head):
+            document = {
+                'S3Object': {'Bucket': s3_bucket_name, 'Name': object_name}
+            }
+            try:
+                pages = [self._detect_text_sync(document)]
+                if self.result_cache is not None:
+                    self.result_cache.set(
+                        s3_bucket_name, object_name, head.get('ETag'), pages
+                    )
+                return pages
+            except ClientError as e:
+                # Multi-page PDFs are only supported by asynchronous jobs
+                code = e.response.get('Error', {}).get('Code')
+                if code != 'UnsupportedDocumentException':
+                    raise
+                logging.info(
+                    f'Falling back to an asynchronous job for '
+                    f'{s3_bucket_name}/{object_name}'
+                )
+
+        # Reuse the ETag read above rather than sending a second HEAD
+        etag = head.get('ETag') if self.result_cache is not None else None
+        job_id = self._start_job(s3_bucket_name, object_name, etag)
+        status = self.wait_for_job(job_id, timeout=timeout)
+        if status == 'FAILED':
+            raise Exception(f'Textract job {job_id} failed')
+        return self.get_job_results(job_id)
+
+    def _head_object(self, s3_bucket_name, object_name):
+        """Read the metadata of an S3 object with a HEAD request"""
+        s3_client = client_registry.get_client('s3', self.config)
+        try:
+            return s3_client.head_object(
+                Bucket=s3_bucket_name, Key=object_name
+            )
+        except Exception as e:
+            logging.error(
+                f'Error reading metadata of {s3_bucket_name}/{object_name}: '
+                f'{str(e)}'
+            )
+            raise
+
+    def _can_detect_sync(self, object_name, head):
+        """Check if an S3 object fits DetectDocumentText"""
+        if head.get('ContentLength', 0) > self.SYNC_MAX_BYTES:
+            return False
+        content_type = head.get('ContentType', '').split(';')[0]
+        if content_type in self.SYNC_IMAGE_TYPES:
+            return True
+        # Only single-page PDFs are supported; others are rejected by
+        # Textract and fall back to an asynchronous job
+        return (
+            content_type == 'application/pdf'
+            or object_name.lower().endswith(
+                ('.pdf', '.jpg', '.jpeg', '.png', '.tif', '.tiff')
+            )
+        )
+
+    def _detect_text_sync(self, document):
+        """Run DetectDocumentText, retrying while throttled"""
+        try:
+            response = self._call_with_retry(
+                self.client.detect_document_text, Document=document
+            )
+            logging.info('Detected document text synchronously')
+            return response
+        except Exception as e:
+            logging.error(f'Error detecting document text: {str(e)}')
+            raise
+
+    def process_documents(self, documents, **kwargs):
+        """
+        Run text detection on many S3 documents, yielding results as they finish.
+
+        This is a shortcut for `TextractJobOrchestrator(self, **kwargs)`.
+
+        Args:
+            documents: Iterable of (bucket name, object name) pairs
+            **kwargs: Options of `TextractJobOrchestrator`
+
+        Returns:
+            Iterator of result dicts (see `TextractJobOrchestrator.as_completed`)
+        """
+        return TextractJobOrchestrator(self, **kwargs).as_completed(documents)
+
     def get_job_status(self, job_id):
         """
         Get the status of a Textract job.
@@ -72,10 +434,13 @@ class TextractHandler:
         Returns:
             str: The job status (e.g., 'IN_PROGRESS', 'SUCCEEDED', 'FAILED')
         """
+        if self._cached_job_version(job_id) is not None:
+            return 'SUCCEEDED'
         try:
             response = self.client.get_document_text_detection(JobId=job_id)
             status = response['JobStatus']
             logging.info(f'Textract job {job_id} status: {status}')
+            self._forget_failed_job(job_id, status)
             return status
         except Exception as e:
             logging.error(
@@ -83,6 +448,64 @@ class TextractHandler:
             )
             raise
 
+    def _poll_job_status(self, job_id, analysis=False):
+        """
+        Get the status of a Textract job with a minimal response payload.
+
+        Args:
+            job_id: ID of the Textract job
+            analysis: True for a document analysis job
+
+        Returns:
+            str: The job status
+        """
+        if self._cached_job_version(job_id) is not None:
+            return 'SUCCEEDED'
+        operation = (
+            self.client.get_document_analysis
+            if analysis
+            else self.client.get_document_text_detection
+        )
+        response = operation(JobId=job_id, MaxResults=1)
+        self._forget_failed_job(job_id, response['JobStatus'])
+        return response['JobStatus']
+
+    def release_job(self, job_id):
+        """
+        Stop tracking a job for the result cache.
+
+        Cached results of a synthetic job ID can no longer be read through
+        it afterwards. Jobs are otherwise tracked until
+        `TRACKED_JOBS_MAX` more recent ones push them out.
+
+        Args:
+            job_id: ID of the Textract job
+        """
+        self._cached_jobs.delete(job_id)
+        self._uncached_jobs.delete(job_id)
+
+    def _cached_job_version(self, job_id):
+        """
+        Return the (bucket, key, ETag) served by a synthetic job ID.
+
+        Returns:
+            tuple: The object version, or None for a real Textract job
+
+        Raises:
+            ValueError: If a synthetic job ID was released or is unknown
+        """
+        if not job_id.startswith(CACHED_JOB_PREFIX):
+            return None
+        version = self._cached_jobs.get(job_id)
+        if version is None:
+            raise ValueError(f'Unknown or released cached job {job_id}')
+        return version
+
+    def _forget_failed_job(self, job_id, status):
+        """Stop tracking a failed job, whose results will never be cached"""
+        if status == 'FAILED':
+            self._uncached_jobs.delete(job_id)
+
     def is_job_complete(self, job_id):
         """
         Check if a Textract job has completed.
@@ -96,11 +519,63 @@ class TextractHandler:
         time.sleep(1)  # Avoid rate limiting
         return self.get_job_status(job_id)
 
+    def wait_for_job(
+        self,
+        job_id,
+        timeout=None,
+        poll_interval=1.0,
+        max_interval=30.0,
+        analysis=False,
+    ):
+        """
+        Wait until a Textract job finishes.
+
+        The job is polled with a one-item result page, first after
+        `poll_interval` seconds and then with exponentially growing, jittered
+        delays capped at `max_interval`. Throttled polls are simply retried
+        on the same schedule.
+
+        Args:
+            job_id: ID of the Textract job
+            timeout: Maximum number of seconds to wait, or None to wait
+                until the job finishes
+            poll_interval: Delay in seconds before the first poll
+            max_interval: Maximum delay in seconds between two polls
+            analysis: True for a job started with `start_analysis_job`
+
+        Returns:
+            str: The final job status ('SUCCEEDED', 'PARTIAL_SUCCESS' or
+            'FAILED')
+
+        Raises:
+            TimeoutError: If the job is still running after `timeout` seconds
+            Exception: If the job status cannot be retrieved
+        """
+        for delay in poll_delays(job_id, timeout, poll_interval, max_interval):
+            time.sleep(delay)
+
+            try:
+                status = self._poll_job_status(job_id, analysis=analysis)
+            except Exception as e:
+                if is_throttling_error(e):
+                    continue
+                logging.error(
+                    f'Error getting status for Textract job {job_id}: {str(e)}'
+                )
+                raise
+
+            if status != 'IN_PROGRESS':
+                logging.info(f'Textract job {job_id} status: {status}')
+                return status
+
     def get_job_results(self, job_id):
         """
         Get the results of a completed Textract job.
 
-        This method handles pagination of results automatically.
+        This method handles pagination of results automatically. Pages are
+        requested back to back, and a request is only delayed and retried
+        when Textract throttles it. For large documents prefer
+        `iter_job_results`, which does not keep every page in memory.
 
         Args:
             job_id: ID of the Textract job
@@ -108,41 +583,190 @@ class TextractHandler:
         Returns:
             list: List of response pages from Textract
         """
-        pages = []
+        return list(self.iter_job_results(job_id))
+
+    def iter_job_results(self, job_id):
+        """
+        Yield the result pages of a completed Textract job as they arrive.
+
+        The next page is only requested once the previous one has been
+        consumed, so memory use does not grow with the document size.
+
+        Args:
+            job_id: ID of the Textract job
+
+        Yields:
+            dict: One response page from Textract
+        """
+        version = self._cached_job_version(job_id)
+        if version is not None:
+            pages = self.result_cache.get(*version)
+            if pages is None:
+                raise Exception(
+                    f'Cached results of job {job_id} are no longer available'
+                )
+            yield from pages
+            return
+
+        # Pages of a job whose results go to the result cache are kept
+        # until the last one arrives
+        cache_entry = self._uncached_jobs.get(job_id)
+        pages = [] if cache_entry else None
+
+        for response in self._iter_result_pages(
+            self.client.get_document_text_detection, job_id
+        ):
+            if pages is not None:
+                pages.append(response)
+            yield response
+
+        # Partial results are not cached so that a retry can complete them
+        if pages and all(p.get('JobStatus') == 'SUCCEEDED' for p in pages):
+            self.result_cache.set(*cache_entry, pages)
+            self._uncached_jobs.delete(job_id)
+
+    def _iter_result_pages(self, operation, job_id):
+        """
+        Yield the result pages of a job from a paginated Get operation.
+
+        Args:
+            operation: Bound client method returning the job results
+            job_id: ID of the Textract job
+
+        Yields:
+            dict: One response page from Textract
+        """
         next_token = None
 
         try:
             # Get first page
-            response = self.client.get_document_text_detection(JobId=job_id)
-            pages.append(response)
+            response = self._call_with_retry(operation, JobId=job_id)
             logging.info(f'Received page 1 of results for job {job_id}')
 
             # Get next token if available
             if 'NextToken' in response:
                 next_token = response['NextToken']
+            yield response
 
             # Get additional pages if available
             page_num = 2
             while next_token:
-                time.sleep(1)  # Avoid rate limiting
-                response = self.client.get_document_text_detection(
-                    JobId=job_id, NextToken=next_token
+                response = self._call_with_retry(
+                    operation, JobId=job_id, NextToken=next_token
                 )
-                pages.append(response)
                 logging.info(
                     f'Received page {page_num} of results for job {job_id}'
                 )
                 page_num += 1
 
                 next_token = response.get('NextToken')
-
-            return pages
+                yield response
         except Exception as e:
             logging.error(
                 f'Error getting results for Textract job {job_id}: {str(e)}'
             )
             raise
 
+    def iter_blocks(self, job_id, block_types=('LINE', 'WORD')):
+        """
+        Yield the blocks of a completed Textract job page by page.
+
+        Args:
+            job_id: ID of the Textract job
+            block_types: Block types to yield, or None for every block
+
+        Yields:
+            dict: One Textract block
+        """
+        for result_page in self.iter_job_results(job_id):
+            for block in result_page.get('Blocks', []):
+                block_type = block.get('BlockType')
+                if block_types is None or block_type in block_types:
+                    yield block
+
+    def iter_text(self, job_id):
+        """
+        Yield the text of a completed Textract job line by line.
+
+        Joining the lines with a space gives the same text as
+        `get_full_text`, without holding the result pages in memory.
+
+        Args:
+            job_id: ID of the Textract job
+
+        Yields:
+            str: The text of one LINE block
+        """
+        for block in self.iter_blocks(job_id, block_types=('LINE',)):
+            yield block.get('Text', '')
+
+    def _call_with_retry(self, operation, **kwargs):
+        """
+        Call a Textract operation, retrying with backoff while throttled.
+
+        Args:
+            operation: Bound client method to call
+            **kwargs: Parameters of the operation
+
+        Returns:
+            dict: The operation response
+        """
+        for attempt in itertools.count():
+            try:
+                return operation(**kwargs)
+            except Exception as e:
+                if (
+                    not is_throttling_error(e)
+                    or attempt >= self.MAX_THROTTLE_RETRIES
+                ):
+                    raise
+                delay = backoff_delay(attempt, base=0.5, cap=20.0)
+                logging.warning(
+                    f'Textract request throttled, retrying in {delay:.2f}s'
+                )
+                time.sleep(delay)
+
+    def get_document(self, job_id):
+        """
+        Build an indexed, page-aware document from a completed job.
+
+        Result pages are streamed into the index, so only the blocks are
+        kept in memory.
+
+        Args:
+            job_id: ID of the Textract job
+
+        Returns:
+            TextractDocument: The indexed document
+        """
+        return TextractDocument(self.iter_job_results(job_id))
+
+    def iter_analysis_results(self, job_id):
+        """
+        Yield the result pages of a completed analysis job as they arrive.
+
+        Args:
+            job_id: ID of the Textract analysis job
+
+        Yields:
+            dict: One response page from Textract
+        """
+        return self._iter_result_pages(
+            self.client.get_document_analysis, job_id
+        )
+
+    def get_analysis_document(self, job_id):
+        """
+        Build an indexed document, with tables and forms, from an analysis job.
+
+        Args:
+            job_id: ID of the Textract analysis job
+
+        Returns:
+            TextractDocument: The indexed document
+        """
+        return TextractDocument(self.iter_analysis_results(job_id))
+
     def get_full_text(self, response):
         """
         Extract the full text from Textract response pages.
@@ -167,3 +791,428 @@ class TextractHandler:
                 f'Error extracting full text from Textract response: {str(e)}'
             )
             return ''
+
+
+class TextractJobOrchestrator:
+    """
+    Submit and track many asynchronous Textract jobs at once.
+
+    Documents are submitted while fewer than `max_in_flight` jobs are
+    running and no faster than `submit_tps` per second. Every running job is
+    polled on its own backoff schedule, with polls limited to `poll_tps` per
+    second, and the results of finished jobs are fetched on a thread pool.
+    Throttled submissions and polls are retried with exponential backoff.
+    An orchestrator processes one batch at a time.
+
+    Args:
+        handler: The TextractHandler used to call Textract
+        max_in_flight: Maximum number of jobs running at once
+        submit_tps: Maximum job submissions per second
+        poll_tps: Maximum status polls per second
+        fetch_results: If True, download the result pages of succeeded jobs
+        fetch_workers: Number of threads fetching result pages
+        max_submit_retries: Retries of a throttled submission before the
+            document is reported as failed
+
+    Example:
+        >>> orchestrator = TextractJobOrchestrator(handler, max_in_flight=20)
+        >>> for result in orchestrator.as_completed(documents):
+        ...     text = handler.get_full_text(result['pages'])
+    """
+
+    # Maximum idle wait between two scheduling rounds, in seconds
+    MAX_IDLE_WAIT = 1.0
+
+    def __init__(
+        self,
+        handler,
+        max_in_flight=10,
+        submit_tps=1.0,
+        poll_tps=5.0,
+        fetch_results=True,
+        fetch_workers=4,
+        max_submit_retries=8,
+    ):
+        self.handler = handler
+        self.max_in_flight = max_in_flight
+        self.submit_limiter = RateLimiter(submit_tps)
+        self.poll_limiter = RateLimiter(poll_tps)
+        self.fetch_results = fetch_results
+        self.fetch_workers = fetch_workers
+        self.max_submit_retries = max_submit_retries
+
+    def as_completed(self, documents):
+        """
+        Process documents and yield one result per document as jobs finish.
+
+        Args:
+            documents: Iterable of (bucket name, object name) pairs
+
+        Yields:
+            dict: `bucket`, `key`, `job_id` (None if never started), `status`
+            ('SUCCEEDED', 'PARTIAL_SUCCESS' or 'FAILED'), `pages` (list of
+            result pages, or None) and `error` (None on success)
+        """
+        self._source = iter(documents)
+        self._source_exhausted = False
+        # Heap of (ready_at, sequence, bucket, key, attempt)
+        self._retries = []
+        self._sequence = itertools.count()
+        self._running = {}  # job_id -> job dict
+        self._fetching = {}  # future -> job dict
+        # Earliest times the rate limiters will grant the next request
+        self._submit_ready_at = 0.0
+        self._poll_ready_at = 0.0
+
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+            while True:
+                now = time.monotonic()
+                self._next_event = now + self.MAX_IDLE_WAIT
+
+                yield from self._submit_documents(now)
+                yield from self._poll_jobs(now, executor)
+                yield from self._collect_fetched()
+
+                if not (
+                    self._retries
+                    or self._running
+                    or self._fetching
+                    or not self._source_exhausted
+                ):
+                    return
+                self._wait_next_event()
+
+    def _next_document(self, now):
+        """Return the next (bucket, key, attempt) to submit, or None"""
+        if self._retries and self._retries[0][0] <= now:
+            _, _, bucket, key, attempt = heapq.heappop(self._retries)
+            return bucket, key, attempt
+        while not self._source_exhausted:
+            try:
+                bucket, key = next(self._source)
+                return bucket, key, 0
+            except StopIteration:
+                self._source_exhausted = True
+        return None
+
+    def _schedule_retry(self, ready_at, bucket, key, attempt):
+        heapq.heappush(
+            self._retries,
+            (ready_at, next(self._sequence), bucket, key, attempt),
+        )
+
+    def _submit_documents(self, now):
+        """Start jobs while there is room and submission quota"""
+        if now < self._submit_ready_at:
+            return
+        while len(self._running) < self.max_in_flight:
+            document = self._next_document(now)
+            if document is None:
+                return
+            bucket, key, attempt = document
+
+            wait_time = self.submit_limiter.try_acquire()
+            if wait_time:
+                self._submit_ready_at = now + wait_time
+                self._schedule_retry(
+                    self._submit_ready_at, bucket, key, attempt
+                )
+                return
+
+            try:
+                job_id = self.handler.start_job(bucket, key)
+            except Exception as e:
+                if (
+                    is_throttling_error(e)
+                    and attempt < self.max_submit_retries
+                ):
+                    ready_at = now + backoff_delay(attempt, base=1.0, cap=30.0)
+                    self._schedule_retry(ready_at, bucket, key, attempt + 1)
+                else:
+                    yield _document_result(
+                        bucket, key, None, 'FAILED', error=e
+                    )
+                continue
+
+            self._running[job_id] = {
+                'bucket': bucket,
+                'key': key,
+                'job_id': job_id,
+                'polls': 0,
+                'next_poll': now + poll_delay(0),
+            }
+
+    def _poll_jobs(self, now, executor):
+        """Poll the running jobs whose turn has come"""
+        if now < self._poll_ready_at:
+            return
+        due = sorted(
+            (job for job in self._running.values() if job['next_poll'] <= now),
+            key=lambda job: job['next_poll'],
+        )
+        for job in due:
+            wait_time = self.poll_limiter.try_acquire()
+            if wait_time:
+                self._poll_ready_at = now + wait_time
+                return
+
+            try:
+                status = self.handler._poll_job_status(job['job_id'])
+            except Exception as e:
+                if is_throttling_error(e):
+                    job['next_poll'] = now + poll_delay(job['polls'])
+                else:
+                    del self._running[job['job_id']]
+                    yield self._job_result(job, 'FAILED', error=e)
+                continue
+
+            job['polls'] += 1
+            if status == 'IN_PROGRESS':
+                job['next_poll'] = now + poll_delay(job['polls'])
+                continue
+
+            del self._running[job['job_id']]
+            if status == 'FAILED' or not self.fetch_results:
+                yield self._job_result(job, status)
+            else:
+                job['status'] = status
+                future = executor.submit(
+                    self.handler.get_job_results, job['job_id']
+                )
+                self._fetching[future] = job
+
+    def _collect_fetched(self):
+        """Report the jobs whose result pages were downloaded"""
+        for future in [f for f in self._fetching if f.done()]:
+            job = self._fetching.pop(future)
+            try:
+                pages = future.result()
+            except Exception as e:
+                yield self._job_result(job, 'FAILED', error=e)
+                continue
+            yield self._job_result(job, job['status'], pages=pages)
+
+    def _wait_next_event(self):
+        """Sleep until the next poll, retry or fetched result"""
+        next_event = self._next_event
+        if self._running:
+            next_poll = min(job['next_poll'] for job in self._running.values())
+            # Due jobs still wait for the poll quota
+            next_event = min(next_event, max(next_poll, self._poll_ready_at))
+        if self._retries:
+            next_event = min(
+                next_event, max(self._retries[0][0], self._submit_ready_at)
+            )
+        if (
+            not self._source_exhausted
+            and len(self._running) < self.max_in_flight
+        ):
+            next_event = min(next_event, self._submit_ready_at)
+
+        timeout = max(0.0, next_event - time.monotonic())
+        if self._fetching:
+            wait(self._fetching, timeout=timeout, return_when=FIRST_COMPLETED)
+        elif timeout:
+            time.sleep(timeout)
+
+    def _job_result(self, job, status, pages=None, error=None):
+        return _document_result(
+            job['bucket'], job['key'], job['job_id'], status, pages, error
+        )
+
+
+class TextractNotificationConsumer:
+    """
+    Collect Textract job completions from an SQS queue instead of polling.
+
+    The queue must be subscribed to the SNS topic given as the
+    `notification_channel` of `TextractHandler.start_job`. Messages are
+    received in batches of up to ten with long polling, results of succeeded
+    jobs are fetched on a thread pool, and messages are deleted once their
+    results have been yielded, so a consumer that stops early leaves the
+    remaining completions in the queue.
+
+    Args:
+        handler: The TextractHandler used to fetch job results
+        queue_url: URL of the SQS queue receiving the notifications
+        config: An AWSConfiguration object, or None to use environment
+            variables
+        wait_time: Long polling wait per receive, in seconds (max 20)
+        fetch_results: If True, download the result pages of succeeded jobs
+        fetch_workers: Number of threads fetching result pages
+
+    Example:
+        >>> channel = {'SNSTopicArn': topic_arn, 'RoleArn': role_arn}
+        >>> job_ids = [
+        ...     handler.start_job(bucket, key, notification_channel=channel)
+        ...     for key in keys
+        ... ]
+        >>> consumer = TextractNotificationConsumer(handler, queue_url)
+        >>> for result in consumer.iter_results(job_ids=job_ids):
+        ...     text = handler.get_full_text(result['pages'])
+    """
+
+    # Maximum number of messages SQS returns per receive
+    MAX_BATCH_SIZE = 10
+
+    def __init__(
+        self,
+        handler,
+        queue_url,
+        config=None,
+        wait_time=20,
+        fetch_results=True,
+        fetch_workers=4,
+    ):
+        if config is None:
+            config = AWSConfiguration()
+
+        self.handler = handler
+        self.queue_url = queue_url
+        self.wait_time = wait_time
+        self.fetch_results = fetch_results
+        self.fetch_workers = fetch_workers
+        self.sqs_client = client_registry.get_client('sqs', config)
+
+    def receive(self):
+        """
+        Receive one batch of job completion notifications.
+
+        Returns:
+            list: Notification dicts with `job_id`, `status`, `bucket`,
+            `key`, `job_tag` and the SQS `receipt_handle`
+        """
+        response = self.sqs_client.receive_message(
+            QueueUrl=self.queue_url,
+            MaxNumberOfMessages=self.MAX_BATCH_SIZE,
+            WaitTimeSeconds=self.wait_time,
+        )
+
+        notifications = []
+        malformed = []
+        for message in response.get('Messages', []):
+            notification = self.parse_message(message)
+            if notification is None:
+                malformed.append(message['ReceiptHandle'])
+            else:
+                notifications.append(notification)
+
+        if malformed:
+            # Malformed messages would otherwise be redelivered forever
+            self.delete(malformed)
+        return notifications
+
+    @staticmethod
+    def parse_message(message):
+        """
+        Parse an SQS message carrying a Textract completion notification.
+
+        Both SNS envelopes and raw message delivery are supported.
+
+        Args:
+            message: A message returned by SQS `receive_message`
+
+        Returns:
+            dict: The notification, or None if the message is not a Textract
+            completion notification
+        """
+        try:
+            body = json.loads(message['Body'])
+            if 'Message' in body and 'JobId' not in body:
+                body = json.loads(body['Message'])
+            location = body.get('DocumentLocation', {})
+            return {
+                'job_id': body['JobId'],
+                'status': body['Status'],
+                'bucket': location.get('S3Bucket'),
+                'key': location.get('S3ObjectName'),
+                'job_tag': body.get('JobTag'),
+                'receipt_handle': message['ReceiptHandle'],
+            }
+        except (KeyError, TypeError, ValueError) as e:
+            logging.error(f'Invalid Textract notification message: {str(e)}')
+            return None
+
+    def delete(self, receipt_handles):
+        """
+        Delete handled messages from the queue.
+
+        Args:
+            receipt_handles: Receipt handles of the messages to delete
+        """
+        for batch in chunked(receipt_handles, self.MAX_BATCH_SIZE):
+            response = self.sqs_client.delete_message_batch(
+                QueueUrl=self.queue_url,
+                Entries=[
+                    {'Id': str(i), 'ReceiptHandle': handle}
+                    for i, handle in enumerate(batch)
+                ],
+            )
+            for failure in response.get('Failed', []):
+                logging.error(
+                    f'Error deleting notification message: '
+                    f'{failure.get("Message", failure.get("Code"))}'
+                )
+
+    def iter_results(self, job_ids=None, max_empty_receives=None):
+        """
+        Yield one result per completed job as notifications arrive.
+
+        Args:
+            job_ids: Optional job IDs to wait for. Notifications for other
+                jobs are left in the queue, and iteration stops once every
+                listed job has been reported.
+            max_empty_receives: Stop after this many consecutive receives
+                without notifications. None waits indefinitely.
+
+        Yields:
+            dict: `bucket`, `key`, `job_id`, `status`, `pages` (list of
+            result pages, or None) and `error` (None on success)
+        """
+        pending = set(job_ids) if job_ids is not None else None
+        empty_receives = 0
+
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+            while pending is None or pending:
+                notifications = self.receive()
+                if pending is not None:
+                    notifications = [
+                        n for n in notifications if n['job_id'] in pending
+                    ]
+
+                if not notifications:
+                    empty_receives += 1
+                    if (
+                        max_empty_receives is not None
+                        and empty_receives >= max_empty_receives
+                    ):
+                        return
+                    continue
+                empty_receives = 0
+
+                futures = [
+                    executor.submit(self._fetch, notification)
+                    for notification in notifications
+                ]
+                for notification, future in zip(notifications, futures):
+                    yield future.result()
+                    if pending is not None:
+                        pending.discard(notification['job_id'])
+                self.delete([n['receipt_handle'] for n in notifications])
+
+    def _fetch(self, notification):
+        """Build the result of a notified job, fetching its pages if needed"""
+        bucket = notification['bucket']
+        key = notification['key']
+        job_id = notification['job_id']
+        status = notification['status']
+
+        if status not in ('SUCCEEDED', 'PARTIAL_SUCCESS'):
+            return _document_result(bucket, key, job_id, 'FAILED')
+        if not self.fetch_results:
+            return _document_result(bucket, key, job_id, status)
+        try:
+            pages = self.handler.get_job_results(job_id)
+        except Exception as e:
+            return _document_result(bucket, key, job_id, 'FAILED', error=e)
+        return _document_result(bucket, key, job_id, status, pages=pages)
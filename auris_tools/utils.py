@@ -1,6 +1,12 @@
+import queue
+import random
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from datetime import datetime
+from itertools import islice
 from uuid import uuid4
 
 
@@ -118,3 +124,267 @@ def collect_processing_time():
             pass
 
     return _timing_context()
+
+
+def chunked(iterable, size):
+    """
+    Split an iterable into lists of at most `size` elements.
+
+    The input is consumed lazily, so arbitrarily long iterators and
+    generators can be chunked with bounded memory.
+
+    Args:
+        iterable: Any iterable.
+        size (int): Maximum number of elements per chunk.
+
+    Yields:
+        list: Consecutive chunks of the input.
+
+    Example:
+        >>> list(chunked(range(5), 2))
+        [[0, 1], [2, 3], [4]]
+    """
+    if size < 1:
+        raise ValueError('Chunk size must be at least 1')
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def backoff_delay(attempt, base=0.05, cap=5.0):
+    """
+    Compute an exponential backoff delay with full jitter.
+
+    Args:
+        attempt (int): Zero-based retry attempt number.
+        base (float): Delay in seconds for the first attempt. Defaults to 0.05.
+        cap (float): Upper bound for the delay in seconds. Defaults to 5.0.
+
+    Returns:
+        float: Number of seconds to wait, uniformly drawn from
+        [0, min(cap, base * 2 ** attempt)].
+
+    Example:
+        >>> 0 <= backoff_delay(3) <= 0.4
+        True
+    """
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU cache with per-entry time to live.
+
+    Args:
+        maxsize (int): Maximum number of entries kept.
+        ttl (float, optional): Seconds an entry stays valid, or None to keep
+            entries until they are evicted. Defaults to None.
+
+    Example:
+        >>> cache = LRUCache(maxsize=2, ttl=60)
+        >>> cache.set('a', 1)
+        >>> cache.get('a')
+        1
+        >>> cache.stats()['hits']
+        1
+    """
+
+    _MISSING = object()
+
+    def __init__(self, maxsize, ttl=None):
+        if maxsize < 1:
+            raise ValueError('Cache size must be at least 1')
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """
+        Return the cached value for a key, or `default` if absent or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key, self._MISSING)
+            if entry is self._MISSING:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entry if full"""
+        expires_at = (
+            time.monotonic() + self.ttl if self.ttl is not None else None
+        )
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        """Remove a key if present"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove every entry, keeping the counters"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: `hits`, `misses`, `evictions`, `expirations` and current
+            `size`.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'size': len(self._entries),
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def merge_iterators(iterables, max_workers=None, buffer_size=1000):
+    """
+    Consume several iterables in parallel threads as a single stream.
+
+    Each iterable is drained by a worker thread into a bounded queue, so
+    memory stays bounded by `buffer_size` elements no matter how fast the
+    sources produce them. The order of elements across sources is not
+    defined. Closing the returned generator stops the workers.
+
+    Args:
+        iterables: List of iterables (typically lazy generators).
+        max_workers (int, optional): Number of threads. Defaults to one per
+            iterable.
+        buffer_size (int, optional): Maximum elements buffered between the
+            workers and the consumer. Defaults to 1000.
+
+    Yields:
+        Elements of all the iterables.
+
+    Raises:
+        Exception: The first error raised while consuming a source.
+
+    Example:
+        >>> sorted(merge_iterators([range(2), range(2, 4)]))
+        [0, 1, 2, 3]
+    """
+    if not iterables:
+        return
+    buffer = queue.Queue(maxsize=buffer_size)
+    stop = threading.Event()
+
+    def put(entry):
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def drain(iterable):
+        try:
+            for element in iterable:
+                if not put(('element', element)):
+                    return
+            put(('done', None))
+        except Exception as e:
+            put(('error', e))
+
+    executor = ThreadPoolExecutor(max_workers=max_workers or len(iterables))
+    try:
+        for iterable in iterables:
+            executor.submit(drain, iterable)
+
+        remaining = len(iterables)
+        while remaining:
+            kind, value = buffer.get()
+            if kind == 'element':
+                yield value
+            elif kind == 'error':
+                raise value
+            else:
+                remaining -= 1
+    finally:
+        stop.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket limiting how often an operation may run.
+
+    Args:
+        rate (float): Sustained number of operations per second.
+        burst (int, optional): Maximum number of operations allowed back to
+            back after an idle period. Defaults to 1.
+
+    Example:
+        >>> limiter = RateLimiter(rate=2)
+        >>> limiter.acquire()  # Blocks until a token is available
+    """
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0:
+            raise ValueError('Rate must be positive')
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def try_acquire(self):
+        """
+        Take a token if one is available.
+
+        Returns:
+            float: 0.0 if a token was taken, otherwise the number of seconds
+            until the next token is available.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """Block until a token is available and take it"""
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            time.sleep(wait)
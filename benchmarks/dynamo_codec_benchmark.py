@@ -0,0 +1,52 @@
+"""
+Compare DynamoCodec against boto3's TypeSerializer/TypeDeserializer.
+
+Run with:
+    python -m benchmarks.dynamo_codec_benchmark
+
+from the repository root, so that auris_tools is importable.
+"""
+import timeit
+from decimal import Decimal
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+from auris_tools.dynamoCodec import dynamo_codec
+
+ITEM = {
+    'id': '6be18162-d20d-4493-91c6-42d20d491a7a',
+    'patient_name': 'Maria Silva',
+    'age': 42,
+    'score': Decimal('87.5'),
+    'is_active': True,
+    'notes': None,
+    'tags': ['audiometry', 'follow-up', 'priority'],
+    'frequencies': {250, 500, 1000, 2000, 4000},
+    'metadata': {
+        'created_by': 'user123',
+        'created_at': '2025-01-01T10:00:00',
+        'thresholds': [{'hz': 500, 'db': 20}, {'hz': 1000, 'db': 25}],
+    },
+}
+ROUNDS = 20000
+
+
+def boto3_round_trip():
+    serializer = TypeSerializer()
+    serialized = {k: serializer.serialize(v) for k, v in ITEM.items()}
+    deserializer = TypeDeserializer()
+    return {k: deserializer.deserialize(v) for k, v in serialized.items()}
+
+
+def codec_round_trip():
+    serialized = dynamo_codec.serialize_item(ITEM)
+    return dynamo_codec.deserialize_item(serialized)
+
+
+if __name__ == '__main__':
+    assert boto3_round_trip() == codec_round_trip()
+    boto3_time = min(timeit.repeat(boto3_round_trip, number=ROUNDS, repeat=3))
+    codec_time = min(timeit.repeat(codec_round_trip, number=ROUNDS, repeat=3))
+    print(f'boto3:       {boto3_time / ROUNDS * 1e6:.1f} us/item')
+    print(f'DynamoCodec: {codec_time / ROUNDS * 1e6:.1f} us/item')
+    print(f'Speedup:     {boto3_time / codec_time:.1f}x')
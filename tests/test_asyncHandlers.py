@@ -0,0 +1,165 @@
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from auris_tools.asyncHandlers import (
+    AsyncDatabaseHandler,
+    AsyncStorageHandler,
+    AsyncTextractHandler,
+)
+from auris_tools.configuration import AWSConfiguration
+from auris_tools.databaseHandlers import DatabaseHandler
+
+
+@pytest.fixture
+def config():
+    return AWSConfiguration(
+        access_key='TEST_ACCESS_KEY',
+        secret_key='TEST_SECRET_KEY',
+        region='us-east-1',
+    )
+
+
+@pytest.fixture
+def s3_client():
+    client = MagicMock()
+    with patch(
+        'auris_tools.storageHandler.client_registry.get_client',
+        return_value=client,
+    ):
+        yield client
+
+
+@pytest.fixture
+def dynamodb_client():
+    client = MagicMock()
+    with patch(
+        'auris_tools.databaseHandlers.client_registry.get_client',
+        return_value=client,
+    ):
+        DatabaseHandler.clear_table_check_cache()
+        DatabaseHandler.clear_item_caches()
+        yield client
+        DatabaseHandler.clear_table_check_cache()
+        DatabaseHandler.clear_item_caches()
+
+
+@pytest.fixture
+def textract_client():
+    client = MagicMock()
+    with patch(
+        'auris_tools.textractHandler.client_registry.get_client',
+        return_value=client,
+    ):
+        yield client
+
+
+def test_storage_calls_fan_out_with_gather(config, s3_client):
+    """Test blocking calls run concurrently off the event loop."""
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def head_object(Bucket, Key):
+        with lock:
+            active.append(Key)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(Key)
+        return {'ContentLength': 1}
+
+    s3_client.head_object.side_effect = head_object
+    storage = AsyncStorageHandler(config=config)
+
+    async def main():
+        return await asyncio.gather(
+            *(storage.check_file_exists('bucket', f'key{i}') for i in range(4))
+        )
+
+    assert asyncio.run(main()) == [True] * 4
+    assert max(peak) > 1
+
+
+def test_storage_iterator_methods(config, s3_client):
+    """Test generator methods are exposed as async iterators."""
+    paginator = s3_client.get_paginator.return_value
+    paginator.paginate.return_value = [
+        {'Contents': [{'Key': 'a.txt'}, {'Key': 'b.txt'}]}
+    ]
+    storage = AsyncStorageHandler(config=config)
+
+    async def main():
+        return [key async for key in storage.iter_files('bucket')]
+
+    assert asyncio.run(main()) == ['a.txt', 'b.txt']
+    assert {'iter_files', 'upload_file'} <= set(dir(storage))
+
+
+def test_database_query_keeps_cursor(config, dynamodb_client):
+    """Test query returns an async iterator exposing the cursor."""
+    dynamodb_client.query.side_effect = [
+        {
+            'Items': [{'id': {'S': 'a'}}],
+            'LastEvaluatedKey': {'id': {'S': 'a'}},
+        },
+        {'Items': [{'id': {'S': 'b'}}]},
+    ]
+
+    async def main():
+        db = await AsyncDatabaseHandler.create(
+            'table', config=config, validate=False
+        )
+        items = db.query('id = :id', page_size=1)
+        first = await items.__anext__()
+        second = await items.__anext__()
+        return [first, second], items.cursor
+
+    items, cursor = asyncio.run(main())
+    assert items == [{'id': 'a'}, {'id': 'b'}]
+    assert cursor == {'id': {'S': 'a'}}
+
+
+def test_database_coroutine_methods(config, dynamodb_client):
+    """Test plain methods become coroutines."""
+    dynamodb_client.get_item.return_value = {'Item': {'id': {'S': 'a'}}}
+    db = AsyncDatabaseHandler('table', config=config, validate=False)
+
+    item = asyncio.run(db.get_item({'id': {'S': 'a'}}))
+
+    assert item == {'id': {'S': 'a'}}
+
+
+def test_textract_wait_for_job(config, textract_client):
+    """Test waiting for jobs polls without blocking the event loop."""
+    statuses = {'job-1': ['IN_PROGRESS', 'SUCCEEDED'], 'job-2': ['FAILED']}
+
+    def detect(JobId, MaxResults=None):
+        return {'JobStatus': statuses[JobId].pop(0)}
+
+    textract_client.get_document_text_detection.side_effect = detect
+    textract = AsyncTextractHandler(config=config)
+
+    async def main():
+        return await asyncio.gather(
+            textract.wait_for_job('job-1', poll_interval=0.01),
+            textract.wait_for_job('job-2', poll_interval=0.01),
+        )
+
+    assert asyncio.run(main()) == ['SUCCEEDED', 'FAILED']
+
+
+def test_textract_wait_for_job_timeout(config, textract_client):
+    """Test waiting for a job stops after the timeout."""
+    textract_client.get_document_text_detection.return_value = {
+        'JobStatus': 'IN_PROGRESS'
+    }
+    textract = AsyncTextractHandler(config=config)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(
+            textract.wait_for_job('job-1', timeout=0.05, poll_interval=0.01)
+        )
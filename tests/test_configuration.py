@@ -3,7 +3,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from auris_tools.configuration import AWSConfiguration
+from auris_tools.configuration import AWSClientRegistry, AWSConfiguration
 
 
 class TestAWSConfiguration:
@@ -173,3 +173,75 @@ class TestAWSConfiguration:
         """Test no validation warning when profile is provided."""
         config = AWSConfiguration(profile=self.test_profile)
         mock_warning.assert_not_called()
+
+
+class TestAWSClientRegistry:
+    """Tests for the AWSClientRegistry class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Setup a fresh registry with a patched boto3 session."""
+        self.registry = AWSClientRegistry()
+        self.config = AWSConfiguration(
+            access_key='TEST_ACCESS_KEY',
+            secret_key='TEST_SECRET_KEY',
+            region='us-east-1',
+        )
+        self.patcher = patch('boto3.session.Session')
+        self.mock_session = self.patcher.start()
+        self.mock_session.return_value.client.side_effect = (
+            lambda *args, **kwargs: MagicMock()
+        )
+        yield
+        self.patcher.stop()
+
+    def test_get_cache_key_equal_for_same_settings(self):
+        """Test that equivalent configurations share the same cache key."""
+        other = AWSConfiguration(
+            access_key='TEST_ACCESS_KEY',
+            secret_key='TEST_SECRET_KEY',
+            region='us-east-1',
+        )
+        assert self.config.get_cache_key() == other.get_cache_key()
+        hash(self.config.get_cache_key())
+
+    def test_get_client_reuses_client(self):
+        """Test that the same service and configuration share one client."""
+        other = AWSConfiguration(
+            access_key='TEST_ACCESS_KEY',
+            secret_key='TEST_SECRET_KEY',
+            region='us-east-1',
+        )
+        first = self.registry.get_client('s3', self.config)
+        second = self.registry.get_client('s3', other)
+
+        assert first is second
+        self.mock_session.assert_called_once()
+
+    def test_get_client_distinct_per_service_and_region(self):
+        """Test that services and regions get their own clients."""
+        other_region = AWSConfiguration(
+            access_key='TEST_ACCESS_KEY',
+            secret_key='TEST_SECRET_KEY',
+            region='eu-west-1',
+        )
+        s3_client = self.registry.get_client('s3', self.config)
+        dynamo_client = self.registry.get_client('dynamodb', self.config)
+        other_client = self.registry.get_client('s3', other_region)
+
+        assert s3_client is not dynamo_client
+        assert s3_client is not other_client
+        assert self.mock_session.call_count == 2
+
+    def test_refresh_and_clear(self):
+        """Test that refresh and clear force new clients to be created."""
+        first = self.registry.get_client('s3', self.config)
+
+        self.registry.refresh(self.config)
+        second = self.registry.get_client('s3', self.config)
+        assert second is not first
+
+        self.registry.clear()
+        third = self.registry.get_client('s3', self.config)
+        assert third is not second
+        assert self.mock_session.call_count == 3
@@ -1,4 +1,10 @@
+import json
+import os
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
 import pytest
+from botocore.exceptions import ClientError
 
 from auris_tools.configuration import AWSConfiguration
 from auris_tools.databaseHandlers import DatabaseHandler
@@ -116,3 +122,441 @@ class TestDatabaseHandler:
         # Now delete the item
         result = self.db_handler.delete_item(key)
         assert result is True
+
+
+class TestDatabaseHandlerWithMockedClient:
+    """Tests for DatabaseHandler against a mocked DynamoDB client."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Setup a handler whose shared client is a MagicMock."""
+        self.config = AWSConfiguration(
+            access_key='TEST_ACCESS_KEY',
+            secret_key='TEST_SECRET_KEY',
+            region='us-east-1',
+        )
+        self.table_name = 'mocked_table'
+        self.mock_client = MagicMock()
+        self.patcher = patch(
+            'auris_tools.databaseHandlers.client_registry.get_client',
+            return_value=self.mock_client,
+        )
+        self.patcher.start()
+        DatabaseHandler.clear_table_check_cache()
+        DatabaseHandler.clear_item_caches()
+
+        yield
+        self.patcher.stop()
+        DatabaseHandler.clear_table_check_cache()
+        DatabaseHandler.clear_item_caches()
+
+    def _handler(self):
+        return DatabaseHandler(
+            self.table_name, config=self.config, validate=False
+        )
+
+    def test_table_check_is_memoized(self):
+        """Test that DescribeTable runs once for repeated instantiations."""
+        DatabaseHandler(self.table_name, config=self.config)
+        DatabaseHandler(self.table_name, config=self.config)
+
+        self.mock_client.describe_table.assert_called_once_with(
+            TableName=self.table_name
+        )
+        self.mock_client.list_tables.assert_not_called()
+
+    def test_table_check_expires_after_ttl(self):
+        """Test that the memoized check is repeated after the TTL."""
+        DatabaseHandler(self.table_name, config=self.config)
+        with patch.object(DatabaseHandler, 'TABLE_CHECK_TTL', 0):
+            DatabaseHandler(self.table_name, config=self.config)
+
+        assert self.mock_client.describe_table.call_count == 2
+
+    def test_table_check_missing_table_raises(self):
+        """Test that a missing table still raises and is not memoized."""
+        self.mock_client.describe_table.side_effect = ClientError(
+            {'Error': {'Code': 'ResourceNotFoundException'}},
+            'DescribeTable',
+        )
+        for _ in range(2):
+            with pytest.raises(Exception, match='Table does not exist'):
+                DatabaseHandler(self.table_name, config=self.config)
+
+        assert self.mock_client.describe_table.call_count == 2
+
+    def test_validate_false_makes_no_calls(self):
+        """Test that validate=False skips the existence check."""
+        self._handler()
+
+        self.mock_client.describe_table.assert_not_called()
+
+    def test_insert_items_chunks_and_generates_ids(self):
+        """Test that insert_items streams items in 25-item batches."""
+        self.mock_client.batch_write_item.return_value = {
+            'UnprocessedItems': {}
+        }
+        handler = self._handler()
+
+        items = ({'name': f'item {i}'} for i in range(60))
+        stats = handler.insert_items(items)
+
+        assert stats['processed'] == 60
+        assert stats['batches'] == 3
+        assert stats['unprocessed'] == []
+        calls = self.mock_client.batch_write_item.call_args_list
+        sizes = [len(c.kwargs['RequestItems'][self.table_name]) for c in calls]
+        assert sizes == [25, 25, 10]
+        first = calls[0].kwargs['RequestItems'][self.table_name][0]
+        assert 'S' in first['PutRequest']['Item']['id']
+
+    @patch('auris_tools.databaseHandlers.time.sleep')
+    def test_insert_items_retries_unprocessed(self, mock_sleep):
+        """Test that unprocessed items are retried with backoff."""
+        handler = self._handler()
+        items = [{'id': str(i)} for i in range(3)]
+        leftover = [{'PutRequest': {'Item': {'id': {'S': '2'}}}}]
+        self.mock_client.batch_write_item.side_effect = [
+            {'UnprocessedItems': {self.table_name: leftover}},
+            {'UnprocessedItems': {}},
+        ]
+
+        stats = handler.insert_items(items)
+
+        assert stats['processed'] == 3
+        assert stats['retries'] == 1
+        mock_sleep.assert_called_once()
+        retry_call = self.mock_client.batch_write_item.call_args_list[1]
+        assert retry_call.kwargs['RequestItems'] == {self.table_name: leftover}
+
+    @patch('auris_tools.databaseHandlers.time.sleep')
+    def test_delete_items_reports_unprocessed(self, mock_sleep):
+        """Test that items still unprocessed after all retries are reported."""
+        handler = self._handler()
+        leftover = [{'DeleteRequest': {'Key': {'id': {'S': 'a'}}}}]
+        self.mock_client.batch_write_item.return_value = {
+            'UnprocessedItems': {self.table_name: leftover}
+        }
+
+        with patch.object(DatabaseHandler, 'BATCH_MAX_RETRIES', 2):
+            stats = handler.delete_items(['a', {'id': 'b'}])
+
+        assert stats['processed'] == 1
+        assert stats['unprocessed'] == leftover
+        assert self.mock_client.batch_write_item.call_count == 3
+        first = self.mock_client.batch_write_item.call_args_list[0]
+        assert first.kwargs['RequestItems'][self.table_name][1] == {
+            'DeleteRequest': {'Key': {'id': {'S': 'b'}}}
+        }
+
+    def test_insert_items_invalid_item_raises(self):
+        """Test that non-dictionary items raise a TypeError."""
+        with pytest.raises(TypeError):
+            self._handler().insert_items(['invalid_item'])
+
+    def test_get_items_dedupes_and_preserves_order(self):
+        """Test that get_items dedupes keys and keeps the input order."""
+        handler = self._handler()
+        self.mock_client.batch_get_item.return_value = {
+            'Responses': {
+                self.table_name: [
+                    {'id': {'S': 'b'}, 'value': {'N': '2'}},
+                    {'id': {'S': 'a'}, 'value': {'N': '1'}},
+                ]
+            },
+            'UnprocessedKeys': {},
+        }
+
+        items = handler.get_items(
+            ['a', {'id': 'b'}, 'missing', {'id': {'S': 'a'}}],
+            deserialize=True,
+        )
+
+        assert items == [
+            {'id': 'a', 'value': 1},
+            {'id': 'b', 'value': 2},
+            None,
+            {'id': 'a', 'value': 1},
+        ]
+        self.mock_client.batch_get_item.assert_called_once()
+        request = self.mock_client.batch_get_item.call_args.kwargs[
+            'RequestItems'
+        ]
+        assert len(request[self.table_name]['Keys']) == 3
+
+    def test_get_items_matches_canonical_numbers(self):
+        """Test number keys match the canonical form DynamoDB returns."""
+        handler = self._handler()
+        self.mock_client.batch_get_item.return_value = {
+            'Responses': {
+                self.table_name: [
+                    {'id': {'N': '1'}, 'value': {'S': 'one'}},
+                    {'id': {'N': '200'}, 'value': {'S': 'two hundred'}},
+                ]
+            },
+        }
+
+        items = handler.get_items(
+            [{'id': Decimal('1.0')}, {'id': {'N': '2E+2'}}, {'id': 3}]
+        )
+
+        assert items == [
+            {'id': {'N': '1'}, 'value': {'S': 'one'}},
+            {'id': {'N': '200'}, 'value': {'S': 'two hundred'}},
+            None,
+        ]
+
+    @patch('auris_tools.databaseHandlers.time.sleep')
+    def test_get_items_chunks_and_retries(self, mock_sleep):
+        """Test chunking into 100-key calls and unprocessed key retries."""
+        handler = self._handler()
+        keys = [str(i) for i in range(150)]
+
+        def batch_get_item(RequestItems):
+            requested = RequestItems[self.table_name]['Keys']
+            if len(requested) == 100:
+                # Report the last key as unprocessed on the first attempt
+                return {
+                    'Responses': {self.table_name: requested[:-1]},
+                    'UnprocessedKeys': {
+                        self.table_name: {'Keys': requested[-1:]}
+                    },
+                }
+            return {'Responses': {self.table_name: requested}}
+
+        self.mock_client.batch_get_item.side_effect = batch_get_item
+
+        items = handler.get_items(keys)
+
+        assert [item['id']['S'] for item in items] == keys
+        assert self.mock_client.batch_get_item.call_count == 3
+        mock_sleep.assert_called_once()
+
+    def test_query_is_lazy_and_deserializes(self):
+        """Test that query follows LastEvaluatedKey one page at a time."""
+        handler = self._handler()
+        self.mock_client.query.side_effect = [
+            {
+                'Items': [{'id': {'S': 'a'}}, {'id': {'S': 'b'}}],
+                'LastEvaluatedKey': {'id': {'S': 'b'}},
+            },
+            {'Items': [{'id': {'S': 'c'}}]},
+        ]
+
+        items = handler.query(
+            'id = :id',
+            expression_attribute_values={':id': 'a'},
+            projection_expression='id',
+        )
+        self.mock_client.query.assert_not_called()
+
+        assert next(items) == {'id': 'a'}
+        assert self.mock_client.query.call_count == 1
+        assert list(items) == [{'id': 'b'}, {'id': 'c'}]
+        assert items.exhausted is True
+
+        first, second = self.mock_client.query.call_args_list
+        assert first.kwargs == {
+            'TableName': self.table_name,
+            'KeyConditionExpression': 'id = :id',
+            'ExpressionAttributeValues': {':id': {'S': 'a'}},
+            'ProjectionExpression': 'id',
+        }
+        assert second.kwargs['ExclusiveStartKey'] == {'id': {'S': 'b'}}
+
+    def test_scan_cursor_resumes(self):
+        """Test that the cursor of an interrupted scan resumes it."""
+        handler = self._handler()
+        self.mock_client.scan.side_effect = [
+            {
+                'Items': [{'id': {'S': 'a'}}],
+                'LastEvaluatedKey': {'id': {'S': 'a'}},
+            },
+            {'Items': [{'id': {'S': 'b'}}]},
+        ]
+
+        items = handler.scan(page_size=1, deserialize=False)
+        assert next(items) == {'id': {'S': 'a'}}
+        assert items.cursor is None
+        assert next(items) == {'id': {'S': 'b'}}
+        cursor = items.cursor
+        assert cursor == {'id': {'S': 'a'}}
+
+        self.mock_client.scan.side_effect = [{'Items': [{'id': {'S': 'b'}}]}]
+        resumed = handler.scan(page_size=1, start_key={'id': 'a'})
+
+        assert list(resumed) == [{'id': 'b'}]
+        assert self.mock_client.scan.call_args.kwargs == {
+            'TableName': self.table_name,
+            'Limit': 1,
+            'ExclusiveStartKey': cursor,
+        }
+
+    def _segmented_scan(self, **kwargs):
+        """Fake Scan returning two pages of two items per segment."""
+        segment = kwargs['Segment']
+        page = 1 if 'ExclusiveStartKey' in kwargs else 0
+        items = [
+            {'id': {'S': f'{segment}-{page}-{i}'}, 'n': {'N': '1.5'}}
+            for i in range(2)
+        ]
+        if page == 0:
+            return {'Items': items, 'LastEvaluatedKey': items[-1]}
+        return {'Items': items}
+
+    def test_parallel_scan_merges_segments(self):
+        """Test that parallel_scan merges every segment and reports progress."""
+        handler = self._handler()
+        self.mock_client.scan.side_effect = self._segmented_scan
+        progress = []
+
+        items = list(
+            handler.parallel_scan(
+                total_segments=3,
+                workers=2,
+                buffer_size=2,
+                progress_callback=lambda *args: progress.append(args),
+            )
+        )
+
+        assert len(items) == 12
+        assert {item['id'][0] for item in items} == {'0', '1', '2'}
+        assert sorted(p for p in progress if p[3]) == [
+            (0, 4, 2, True),
+            (1, 4, 2, True),
+            (2, 4, 2, True),
+        ]
+        for call in self.mock_client.scan.call_args_list:
+            assert call.kwargs['TotalSegments'] == 3
+
+    def test_parallel_scan_propagates_errors(self):
+        """Test that a failing segment stops the merged stream."""
+        handler = self._handler()
+        self.mock_client.scan.side_effect = Exception('Scan error')
+
+        with pytest.raises(Exception, match='Scan error'):
+            list(handler.parallel_scan(total_segments=2))
+
+    def test_export_segments_writes_shards(self, tmpdir):
+        """Test that export_segments writes one JSONL shard per segment."""
+        handler = self._handler()
+        self.mock_client.scan.side_effect = self._segmented_scan
+
+        results = handler.export_segments(str(tmpdir), total_segments=2)
+
+        assert sorted(results) == [0, 1]
+        for segment, result in results.items():
+            assert result['items'] == 4
+            assert os.path.basename(result['path']) == (
+                f'{self.table_name}-segment-{segment:04d}.jsonl'
+            )
+            with open(result['path']) as shard:
+                rows = [json.loads(line) for line in shard]
+            assert rows[0] == {'id': f'{segment}-0-0', 'n': 1.5}
+
+    def test_get_item_cache_hits_and_invalidation(self):
+        """Test that get_item is served from the shared cache until a write."""
+        self.mock_client.get_item.return_value = {
+            'Item': {'id': {'S': 'a'}, 'value': {'N': '1'}}
+        }
+        handler = DatabaseHandler(
+            self.table_name, config=self.config, validate=False, cache_size=10
+        )
+        assert handler.cache_stats()['size'] == 0
+
+        first = handler.get_item({'id': 'a'})
+        first['value'] = {'N': '999'}  # Mutating a result must not leak
+        other_handler = DatabaseHandler(
+            self.table_name, config=self.config, validate=False, cache_size=10
+        )
+        second = other_handler.get_item({'id': {'S': 'a'}})
+
+        assert second == {'id': {'S': 'a'}, 'value': {'N': '1'}}
+        assert self.mock_client.get_item.call_count == 1
+        stats = handler.cache_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+
+        other_handler.insert_item({'id': 'a', 'value': 2})
+        handler.get_item({'id': 'a'})
+        assert self.mock_client.get_item.call_count == 2
+
+        handler.delete_item('a')
+        handler.get_item({'id': 'a'})
+        assert self.mock_client.get_item.call_count == 3
+
+    def test_writes_without_cache_invalidate_shared_cache(self):
+        """Test that handlers without a cache still invalidate it on write."""
+        self.mock_client.get_item.return_value = {
+            'Item': {'id': {'S': 'x'}, 'v': {'N': '1'}}
+        }
+        reader = DatabaseHandler(
+            self.table_name, config=self.config, validate=False, cache_size=10
+        )
+        writer = DatabaseHandler(
+            self.table_name, config=self.config, validate=False
+        )
+        assert writer.cache_stats() is None
+
+        reader.get_item({'id': 'x'})
+        writer.insert_item({'id': 'x', 'v': 2})
+        reader.get_item({'id': 'x'})
+        assert self.mock_client.get_item.call_count == 2
+
+        writer.delete_item('x')
+        reader.get_item({'id': 'x'})
+        assert self.mock_client.get_item.call_count == 3
+
+        writer.insert_items([{'id': 'x', 'v': 3}])
+        reader.get_item({'id': 'x'})
+        assert self.mock_client.get_item.call_count == 4
+
+    def test_number_keys_invalidate_whatever_their_form(self):
+        """Test that number keys written in another form drop the entry."""
+        self.mock_client.get_item.return_value = {
+            'Item': {'id': {'N': '1'}, 'v': {'N': '1'}}
+        }
+        handler = DatabaseHandler(
+            self.table_name, config=self.config, validate=False, cache_size=10
+        )
+
+        handler.get_item({'id': {'N': '1.0'}})
+        handler.insert_item({'id': 1, 'v': 2})
+        handler.get_item({'id': {'N': '1.0'}})
+
+        assert self.mock_client.get_item.call_count == 2
+
+    def test_batch_writes_invalidate_after_sending(self):
+        """Test that reads racing a batch write cannot keep stale items."""
+        self.mock_client.get_item.return_value = {
+            'Item': {'id': {'S': 'a'}, 'value': {'N': '1'}}
+        }
+        handler = DatabaseHandler(
+            self.table_name, config=self.config, validate=False, cache_size=10
+        )
+
+        def batch_write_item(RequestItems):
+            # A concurrent reader caches the old item mid-request
+            handler.get_item({'id': 'a'})
+            return {}
+
+        self.mock_client.batch_write_item.side_effect = batch_write_item
+
+        handler.insert_items([{'id': 'a', 'value': 2}])
+        handler.get_item({'id': 'a'})
+        assert self.mock_client.get_item.call_count == 2
+
+        handler.delete_items(['a'])
+        handler.get_item({'id': 'a'})
+        assert self.mock_client.get_item.call_count == 3
+
+    def test_get_item_without_cache(self):
+        """Test that get_item always calls DynamoDB when caching is off."""
+        self.mock_client.get_item.return_value = {'Item': {'id': {'S': 'a'}}}
+        handler = self._handler()
+
+        handler.get_item({'id': 'a'})
+        handler.get_item({'id': 'a'})
+
+        assert self.mock_client.get_item.call_count == 2
+        assert handler.cache_stats() is None
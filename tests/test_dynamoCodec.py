@@ -0,0 +1,75 @@
+from decimal import Decimal
+
+import pytest
+from boto3.dynamodb.types import Binary, TypeDeserializer, TypeSerializer
+
+from auris_tools.dynamoCodec import DynamoCodec, dynamo_codec
+
+SAMPLE_ITEM = {
+    'id': '6be18162-d20d-4493-91c6-42d20d491a7a',
+    'name': 'Test Item',
+    'value': 123,
+    'big_value': 10**37 + 1,
+    'price': Decimal('19.90'),
+    'is_active': True,
+    'missing': None,
+    'payload': b'\x00\x01',
+    'tags': ['tag1', 'tag2', 3],
+    'labels': {'a', 'b'},
+    'scores': {1, 2, Decimal('3.5')},
+    'chunks': {b'x', b'y'},
+    'point': (1, 2),
+    'metadata': {'created_by': 'user123', 'nested': {'level': [1, {'x': 2}]}},
+}
+
+
+def test_serialize_matches_boto3():
+    serializer = TypeSerializer()
+    expected = {k: serializer.serialize(v) for k, v in SAMPLE_ITEM.items()}
+
+    result = dynamo_codec.serialize_item(SAMPLE_ITEM)
+
+    for key in ('labels', 'scores', 'chunks'):
+        tag = next(iter(expected[key]))
+        assert sorted(result[key][tag]) == sorted(expected[key][tag])
+        del result[key], expected[key]
+    assert result == expected
+
+
+def test_deserialize_matches_boto3():
+    serializer = TypeSerializer()
+    serialized = {k: serializer.serialize(v) for k, v in SAMPLE_ITEM.items()}
+    deserializer = TypeDeserializer()
+    expected = {k: deserializer.deserialize(v) for k, v in serialized.items()}
+
+    assert dynamo_codec.deserialize_item(serialized) == expected
+    assert isinstance(dynamo_codec.deserialize({'B': b'x'}), Binary)
+
+
+def test_float_handling():
+    with pytest.raises(TypeError, match='Float types are not supported'):
+        dynamo_codec.serialize(1.5)
+
+    codec = DynamoCodec(float_as_decimal=True)
+    assert codec.serialize(0.1) == {'N': '0.1'}
+    assert codec.serialize({1.5}) == {'NS': ['1.5']}
+    with pytest.raises(TypeError):
+        codec.serialize(float('nan'))
+
+
+def test_native_numbers():
+    codec = DynamoCodec(native_numbers=True)
+    result = codec.deserialize_item({'a': {'N': '12'}, 'b': {'N': '1.25'}})
+
+    assert result == {'a': 12, 'b': 1.25}
+    assert isinstance(result['a'], int)
+    assert isinstance(result['b'], float)
+
+
+def test_unsupported_types():
+    with pytest.raises(TypeError):
+        dynamo_codec.serialize(object())
+    with pytest.raises(TypeError):
+        dynamo_codec.deserialize({'X': 'value'})
+    with pytest.raises(TypeError):
+        dynamo_codec.deserialize({})
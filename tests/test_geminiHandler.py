@@ -1,4 +1,7 @@
+import asyncio
 import os
+import threading
+import time
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
@@ -178,3 +181,115 @@ class TestGoogleGeminiHandler:
         # Should use default model
         assert handler.model_name == 'gemini-2.5-flash'
         assert handler.model is not None
+
+
+class TestGoogleGeminiHandlerConcurrency:
+    """Tests for async and batch generation against a mocked model."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Setup a handler whose model is a mock."""
+        model = Mock()
+        model.name = 'models/gemini-test'
+        with patch('auris_tools.geminiHandler.genai') as mock_genai:
+            mock_genai.list_models.return_value = [model]
+            self.handler = GoogleGeminiHandler(
+                api_key='test-key', model='gemini-test'
+            )
+
+        self.in_flight = 0
+        self.peak = 0
+
+        async def generate_content_async(contents):
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            if contents == 'fail':
+                raise Exception('API Error')
+            return f'response to {contents}'
+
+        lock = threading.Lock()
+
+        def generate_content(contents):
+            with lock:
+                self.in_flight += 1
+                self.peak = max(self.peak, self.in_flight)
+            time.sleep(0.01)
+            with lock:
+                self.in_flight -= 1
+            if contents == 'fail':
+                raise Exception('API Error')
+            return f'response to {contents}'
+
+        self.handler.model = MagicMock()
+        self.handler.model.generate_content_async.side_effect = (
+            generate_content_async
+        )
+        self.handler.model.generate_content.side_effect = generate_content
+
+    def test_generate_output_async(self):
+        """Test async generation returns the model response."""
+        result = asyncio.run(self.handler.generate_output_async('hello'))
+
+        assert result == 'response to hello'
+
+    def test_generate_output_async_error(self):
+        """Test async generation returns an empty string on errors."""
+        assert asyncio.run(self.handler.generate_output_async('fail')) == ''
+
+    def test_generate_many(self):
+        """Test batch generation limits concurrency and keeps order."""
+        prompts = [f'prompt {i}' for i in range(10)] + ['fail']
+
+        report = self.handler.generate_many(prompts, concurrency=3)
+
+        assert [r['response'] for r in report['results'][:10]] == [
+            f'response to prompt {i}' for i in range(10)
+        ]
+        assert report['results'][10]['response'] is None
+        assert report['results'][10]['error'] == 'API Error'
+        assert report['succeeded'] == 10
+        assert report['failed'] == 1
+        assert self.peak == 3
+        assert report['throughput'] > 0
+        assert 0 < report['latency']['p50'] <= report['latency']['max']
+        self.handler.model.generate_content_async.assert_not_called()
+
+    def test_generate_many_repeated_batches(self):
+        """Test several batches can run with the same handler."""
+        for _ in range(2):
+            report = self.handler.generate_many(['a', 'b'], concurrency=2)
+            assert report['succeeded'] == 2
+
+    def test_generate_many_async(self):
+        """Test async batch generation limits concurrency and keeps order."""
+        prompts = [f'prompt {i}' for i in range(6)] + ['fail']
+
+        report = asyncio.run(
+            self.handler.generate_many_async(prompts, concurrency=2)
+        )
+
+        assert [r['response'] for r in report['results'][:6]] == [
+            f'response to prompt {i}' for i in range(6)
+        ]
+        assert report['results'][6]['error'] == 'API Error'
+        assert self.peak == 2
+
+    def test_generate_many_with_input_data(self):
+        """Test batch items can carry multimodal input."""
+        report = self.handler.generate_many(
+            [
+                {
+                    'prompt': 'Describe',
+                    'input_data': 'data',
+                    'input_mime_type': 'text/plain',
+                },
+                {'prompt': 'Invalid', 'input_data': 'data'},
+            ]
+        )
+
+        self.handler.model.generate_content.assert_called_once_with(
+            ['Describe', {'mime_type': 'text/plain', 'content': 'data'}]
+        )
+        assert 'input_mime_type' in report['results'][1]['error']
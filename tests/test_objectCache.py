@@ -0,0 +1,153 @@
+import io
+import os
+from unittest.mock import patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from auris_tools.configuration import AWSConfiguration
+from auris_tools.objectCache import S3ObjectCache, TextractResultCache
+from auris_tools.storageHandler import StorageHandler
+
+TEST_BUCKET_NAME = 'test-bucket'
+
+
+class FakeS3Client:
+    """Minimal S3 client honoring IfNoneMatch on get_object."""
+
+    def __init__(self, objects):
+        self.objects = objects  # key -> (etag, content)
+        self.calls = []
+
+    def get_object(self, Bucket, Key, IfNoneMatch=None):
+        self.calls.append({'Key': Key, 'IfNoneMatch': IfNoneMatch})
+        etag, content = self.objects[Key]
+        if IfNoneMatch == etag:
+            raise ClientError(
+                {
+                    'Error': {'Code': '304', 'Message': 'Not Modified'},
+                    'ResponseMetadata': {'HTTPStatusCode': 304},
+                },
+                'GetObject',
+            )
+        return {
+            'Body': io.BytesIO(content),
+            'ETag': etag,
+            'ContentLength': len(content),
+        }
+
+
+@pytest.fixture
+def cache(tmpdir):
+    return S3ObjectCache(directory=str(tmpdir.join('cache')), max_size=100)
+
+
+def test_get_bytes_revalidates_with_etag(cache):
+    client = FakeS3Client({'a.docx': ('"v1"', b'first')})
+
+    assert cache.get_bytes(client, TEST_BUCKET_NAME, 'a.docx') == b'first'
+    assert cache.get_bytes(client, TEST_BUCKET_NAME, 'a.docx') == b'first'
+    assert [c['IfNoneMatch'] for c in client.calls] == [None, '"v1"']
+
+    client.objects['a.docx'] = ('"v2"', b'second')
+    assert cache.get_bytes(client, TEST_BUCKET_NAME, 'a.docx') == b'second'
+
+
+def test_identical_content_is_stored_once(cache):
+    client = FakeS3Client({'a': ('"1"', b'same'), 'b': ('"2"', b'same')})
+
+    path_a = cache.get_path(client, TEST_BUCKET_NAME, 'a')
+    path_b = cache.get_path(client, TEST_BUCKET_NAME, 'b')
+
+    assert path_a == path_b
+    assert len(os.listdir(os.path.join(cache.directory, 'objects'))) == 1
+
+
+def test_lru_eviction_over_size_cap(cache):
+    client = FakeS3Client(
+        {
+            'old': ('"1"', b'o' * 60),
+            'new': ('"2"', b'n' * 60),
+        }
+    )
+
+    old_path = cache.get_path(client, TEST_BUCKET_NAME, 'old')
+    os.utime(old_path, (0, 0))  # Make it the least recently used body
+    new_path = cache.get_path(client, TEST_BUCKET_NAME, 'new')
+
+    assert not os.path.exists(old_path)
+    assert os.path.exists(new_path)
+    # An evicted object is fetched again without a conditional request
+    assert cache.get_bytes(client, TEST_BUCKET_NAME, 'old') == b'o' * 60
+    assert client.calls[-1]['IfNoneMatch'] is None
+
+
+def test_object_larger_than_cache_is_streamed(tmpdir):
+    cache = S3ObjectCache(directory=str(tmpdir.join('cache')), max_size=10)
+    client = FakeS3Client({'big': ('"1"', b'b' * 100)})
+    objects_dir = os.path.join(cache.directory, 'objects')
+
+    assert cache.get_bytes(client, TEST_BUCKET_NAME, 'big') == b'b' * 100
+    assert len(client.calls) == 1
+    assert os.listdir(objects_dir) == []
+
+    target = str(tmpdir.join('big.bin'))
+    cache.download(client, TEST_BUCKET_NAME, 'big', target)
+    with open(target, 'rb') as file:
+        assert file.read() == b'b' * 100
+    assert len(client.calls) == 2
+
+    # get_path keeps the body it just wrote
+    path = cache.get_path(client, TEST_BUCKET_NAME, 'big')
+    with open(path, 'rb') as file:
+        assert file.read() == b'b' * 100
+
+
+def test_storage_handler_uses_cache(cache, tmpdir):
+    client = FakeS3Client({'doc.txt': ('"1"', b'content')})
+    with patch(
+        'auris_tools.storageHandler.client_registry.get_client',
+        return_value=client,
+    ):
+        handler = StorageHandler(config=AWSConfiguration(), cache=cache)
+
+    target = str(tmpdir.join('doc.txt'))
+    assert handler.download_file(TEST_BUCKET_NAME, 'doc.txt', target)
+    with open(target, 'rb') as file:
+        assert file.read() == b'content'
+
+    data = handler.get_file_object(TEST_BUCKET_NAME, 'doc.txt', as_bytes=True)
+    assert data == b'content'
+    assert client.calls[-1]['IfNoneMatch'] == '"1"'
+
+
+def test_textract_result_cache_round_trip(tmpdir):
+    cache = TextractResultCache(directory=str(tmpdir))
+    pages = [
+        {
+            'Blocks': [{'BlockType': 'LINE', 'Text': 'Hello'}],
+            'ResponseMetadata': {'RequestId': 'abc'},
+        }
+    ]
+
+    assert cache.get(TEST_BUCKET_NAME, 'doc.pdf', '"v1"') is None
+    cache.set(TEST_BUCKET_NAME, 'doc.pdf', '"v1"', pages)
+
+    assert cache.get(TEST_BUCKET_NAME, 'doc.pdf', '"v1"') == [
+        {'Blocks': [{'BlockType': 'LINE', 'Text': 'Hello'}]}
+    ]
+    # A new object version misses
+    assert cache.get(TEST_BUCKET_NAME, 'doc.pdf', '"v2"') is None
+    assert os.listdir(str(tmpdir))[0].endswith('.json.gz')
+
+
+def test_textract_result_cache_ttl(tmpdir):
+    cache = TextractResultCache(directory=str(tmpdir), ttl=60)
+    cache.set(TEST_BUCKET_NAME, 'doc.pdf', '"v1"', [{'Blocks': []}])
+    assert cache.get(TEST_BUCKET_NAME, 'doc.pdf', '"v1"') is not None
+
+    path = os.path.join(str(tmpdir), os.listdir(str(tmpdir))[0])
+    os.utime(path, (0, 0))
+
+    assert cache.get(TEST_BUCKET_NAME, 'doc.pdf', '"v1"') is None
+    assert os.listdir(str(tmpdir)) == []
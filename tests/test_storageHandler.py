@@ -1,6 +1,12 @@
+import io
 import os
+import time
+from unittest.mock import MagicMock, patch
 
 import pytest
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+from botocore.response import StreamingBody
 
 from auris_tools.configuration import AWSConfiguration
 from auris_tools.storageHandler import StorageHandler
@@ -211,3 +217,464 @@ def test_get_file_object_success():
     assert obj_byte is not None
     assert isinstance(obj_byte, bytes)
     assert len(obj_byte) > 0
+
+
+@pytest.fixture
+def mocked_handler():
+    """StorageHandler whose shared S3 client is a MagicMock."""
+    with patch(
+        'auris_tools.storageHandler.client_registry.get_client',
+        return_value=MagicMock(),
+    ):
+        yield StorageHandler(config=AWSConfiguration())
+
+
+def test_upload_many_reports_per_file_results(mocked_handler):
+    """Test concurrent uploads with a TransferConfig and a failing file."""
+    config = TransferConfig(multipart_threshold=1024)
+
+    def upload_file(file_path, bucket, key, Config=None):
+        assert Config is config
+        if key == 'bad.txt':
+            raise Exception('Upload error')
+
+    mocked_handler.client.upload_file.side_effect = upload_file
+
+    results = mocked_handler.upload_many(
+        [('a.txt', 'a.txt'), ('bad.txt', 'bad.txt'), ('c.txt', 'c.txt')],
+        TEST_BUCKET_NAME,
+        max_workers=2,
+        transfer_config=config,
+    )
+
+    assert [r['object_name'] for r in results] == ['a.txt', 'bad.txt', 'c.txt']
+    assert [r['success'] for r in results] == [True, False, True]
+    assert results[1]['error'] == 'Upload error'
+    assert mocked_handler.client.upload_file.call_count == 3
+
+
+def test_download_many_creates_directories(mocked_handler, tmpdir):
+    """Test concurrent downloads into nested local directories."""
+    target = os.path.join(tmpdir, 'nested', 'file.txt')
+
+    results = mocked_handler.download_many(
+        TEST_BUCKET_NAME, [('file.txt', target)]
+    )
+
+    assert results[0]['success'] is True
+    assert os.path.isdir(os.path.dirname(target))
+    mocked_handler.client.download_file.assert_called_once_with(
+        TEST_BUCKET_NAME, 'file.txt', target
+    )
+
+
+def test_sync_directory_uploads_changed_files(mocked_handler, tmpdir):
+    """Test that sync_directory only uploads missing or resized files."""
+    os.makedirs(os.path.join(tmpdir, 'sub'))
+    for name, content in [('same.txt', 'abc'), ('sub/new.txt', 'xyz')]:
+        with open(os.path.join(tmpdir, name), 'w') as file:
+            file.write(content)
+    mocked_handler.client.get_paginator.return_value.paginate.return_value = [
+        {'Contents': [{'Key': 'backup/same.txt', 'Size': 3}]}
+    ]
+
+    results = mocked_handler.sync_directory(
+        str(tmpdir), TEST_BUCKET_NAME, prefix='backup/'
+    )
+
+    assert [r['object_name'] for r in results] == ['backup/sub/new.txt']
+    mocked_handler.client.upload_file.assert_called_once_with(
+        os.path.join(tmpdir, 'sub', 'new.txt'),
+        TEST_BUCKET_NAME,
+        'backup/sub/new.txt',
+    )
+
+
+def test_iter_files_follows_pages(mocked_handler):
+    """Test lazy listing across pages with metadata and StartAfter."""
+    paginator = mocked_handler.client.get_paginator.return_value
+    paginator.paginate.return_value = iter(
+        [
+            {'Contents': [{'Key': 'a', 'Size': 1, 'ETag': '"1"'}]},
+            {'Contents': [{'Key': 'b', 'Size': 2, 'ETag': '"2"'}]},
+        ]
+    )
+
+    files = list(
+        mocked_handler.iter_files(
+            TEST_BUCKET_NAME,
+            prefix='docs/',
+            start_after='docs/0',
+            with_metadata=True,
+            page_size=500,
+        )
+    )
+
+    assert [f['key'] for f in files] == ['a', 'b']
+    assert files[1]['size'] == 2
+    mocked_handler.client.get_paginator.assert_called_with('list_objects_v2')
+    paginator.paginate.assert_called_once_with(
+        Bucket=TEST_BUCKET_NAME,
+        Prefix='docs/',
+        StartAfter='docs/0',
+        PaginationConfig={'PageSize': 500},
+    )
+
+
+def test_list_files_is_not_truncated(mocked_handler):
+    """Test that list_files returns keys from every page."""
+    paginator = mocked_handler.client.get_paginator.return_value
+    paginator.paginate.return_value = [
+        {'Contents': [{'Key': f'{page}-{i}'} for i in range(1000)]}
+        for page in range(2)
+    ]
+
+    assert len(mocked_handler.list_files(TEST_BUCKET_NAME)) == 2000
+
+
+def test_iter_directories_and_many_prefixes(mocked_handler):
+    """Test delimiter-based folders and parallel prefix listing."""
+    paginator = mocked_handler.client.get_paginator.return_value
+    paginator.paginate.side_effect = lambda **kwargs: [
+        {
+            'CommonPrefixes': [{'Prefix': kwargs['Prefix'] + 'sub/'}],
+            'Contents': [{'Key': kwargs['Prefix'] + 'file'}],
+        }
+    ]
+
+    folders = list(mocked_handler.iter_directories(TEST_BUCKET_NAME, 'x/'))
+    keys = list(mocked_handler.iter_files_many(TEST_BUCKET_NAME, ['a/', 'b/']))
+
+    assert folders == ['x/sub/']
+    assert sorted(keys) == ['a/file', 'b/file']
+
+
+def test_delete_file_without_existence_probe(mocked_handler):
+    """Test that check_exists=False skips the HEAD request."""
+    mocked_handler.client.delete_object.return_value = {
+        'ResponseMetadata': {'HTTPStatusCode': 204}
+    }
+
+    assert mocked_handler.delete_file(
+        TEST_BUCKET_NAME, 'file.txt', check_exists=False
+    )
+    mocked_handler.client.head_object.assert_not_called()
+
+
+def test_delete_files_batches_and_reports_errors(mocked_handler):
+    """Test 1000-key batches and per-key error reporting."""
+
+    def delete_objects(Bucket, Delete):
+        keys = [obj['Key'] for obj in Delete['Objects']]
+        assert Delete['Quiet'] is True
+        if 'key-5' in keys:
+            return {
+                'Errors': [
+                    {'Key': 'key-5', 'Code': 'AccessDenied', 'Message': 'No'}
+                ]
+            }
+        return {}
+
+    mocked_handler.client.delete_objects.side_effect = delete_objects
+    keys = [f'key-{i}' for i in range(2500)]
+
+    result = mocked_handler.delete_files(TEST_BUCKET_NAME, keys)
+
+    sizes = [
+        len(c.kwargs['Delete']['Objects'])
+        for c in mocked_handler.client.delete_objects.call_args_list
+    ]
+    assert sorted(sizes) == [500, 1000, 1000]
+    assert len(result['deleted']) == 2499
+    assert result['errors'] == [
+        {'key': 'key-5', 'code': 'AccessDenied', 'message': 'No'}
+    ]
+
+
+def test_delete_files_reads_keys_lazily(mocked_handler):
+    """Test that keys are read as batches are sent, not all up front."""
+    consumed = []
+    consumed_at_call = []
+
+    def keys():
+        for i in range(10000):
+            consumed.append(i)
+            yield f'key-{i}'
+
+    def delete_objects(Bucket, Delete):
+        consumed_at_call.append(len(consumed))
+        time.sleep(0.005)
+        return {}
+
+    mocked_handler.client.delete_objects.side_effect = delete_objects
+
+    result = mocked_handler.delete_files(
+        TEST_BUCKET_NAME, keys(), max_workers=2
+    )
+
+    assert len(result['deleted']) == 10000
+    # At most two batches in flight plus the one waiting for a slot
+    for calls, count in enumerate(sorted(consumed_at_call)):
+        assert count <= (calls + 3) * 1000
+
+
+def test_delete_files_by_prefix(mocked_handler):
+    """Test deleting every object under a prefix."""
+    paginator = mocked_handler.client.get_paginator.return_value
+    paginator.paginate.return_value = [{'Contents': [{'Key': 'tmp/a'}]}]
+    mocked_handler.client.delete_objects.side_effect = Exception('Boom')
+
+    result = mocked_handler.delete_files(TEST_BUCKET_NAME, prefix='tmp/')
+
+    assert result['deleted'] == []
+    assert result['errors'][0]['key'] == 'tmp/a'
+    with pytest.raises(ValueError):
+        mocked_handler.delete_files(TEST_BUCKET_NAME)
+
+
+def _fake_ranged_get(content):
+    """Build a get_object side effect honoring the Range header."""
+
+    def get_object(Bucket, Key, Range=None, IfMatch=None):
+        data = content
+        if Range:
+            start, end = Range[len('bytes=') :].split('-')
+            data = content[int(start) : int(end) + 1 if end else None]
+        return {'Body': StreamingBody(io.BytesIO(data), len(data))}
+
+    return get_object
+
+
+def test_iter_file_chunks_and_ranges(mocked_handler):
+    """Test chunked streaming and ranged reads."""
+    content = bytes(range(256)) * 4
+    mocked_handler.client.get_object.side_effect = _fake_ranged_get(content)
+
+    chunks = list(
+        mocked_handler.iter_file_chunks(TEST_BUCKET_NAME, 'f', chunk_size=300)
+    )
+    assert [len(c) for c in chunks] == [300, 300, 300, 124]
+    assert b''.join(chunks) == content
+
+    partial = list(
+        mocked_handler.iter_file_chunks(
+            TEST_BUCKET_NAME, 'f', chunk_size=300, start=1000
+        )
+    )
+    assert partial == [content[1000:]]
+    assert mocked_handler.get_file_range(TEST_BUCKET_NAME, 'f', 10, 19) == (
+        content[10:20]
+    )
+
+
+def test_download_file_ranged_to_file_and_buffer(mocked_handler, tmpdir):
+    """Test parallel ranged downloads into a file and a buffer."""
+    content = os.urandom(10_000)
+    mocked_handler.client.head_object.return_value = {
+        'ContentLength': len(content),
+        'ETag': '"etag"',
+    }
+    mocked_handler.client.get_object.side_effect = _fake_ranged_get(content)
+    file_path = os.path.join(tmpdir, 'large.bin')
+
+    assert mocked_handler.download_file_ranged(
+        TEST_BUCKET_NAME, 'large.bin', file_path=file_path, part_size=3000
+    )
+    with open(file_path, 'rb') as file:
+        assert file.read() == content
+    assert mocked_handler.client.get_object.call_count == 4
+    for call in mocked_handler.client.get_object.call_args_list:
+        assert call.kwargs['IfMatch'] == '"etag"'
+
+    buffer = bytearray(len(content))
+    assert mocked_handler.download_file_ranged(
+        TEST_BUCKET_NAME, 'large.bin', buffer=buffer, part_size=4096
+    )
+    assert bytes(buffer) == content
+    assert not mocked_handler.download_file_ranged(
+        TEST_BUCKET_NAME, 'large.bin', buffer=bytearray(10)
+    )
+
+
+def test_download_file_ranged_failure_leaves_no_partial_file(
+    mocked_handler, tmpdir
+):
+    """Test that a failed part keeps the destination untouched."""
+    content = os.urandom(10_000)
+    mocked_handler.client.head_object.return_value = {
+        'ContentLength': len(content),
+        'ETag': '"etag"',
+    }
+    ranged_get = _fake_ranged_get(content)
+
+    def get_object(**params):
+        if params['Range'].startswith('bytes=6000-'):
+            raise ClientError(
+                {'Error': {'Code': '412', 'Message': 'Precondition Failed'}},
+                'GetObject',
+            )
+        return ranged_get(**params)
+
+    mocked_handler.client.get_object.side_effect = get_object
+    file_path = os.path.join(tmpdir, 'large.bin')
+    with open(file_path, 'wb') as file:
+        file.write(b'previous')
+
+    assert not mocked_handler.download_file_ranged(
+        TEST_BUCKET_NAME, 'large.bin', file_path=file_path, part_size=3000
+    )
+    with open(file_path, 'rb') as file:
+        assert file.read() == b'previous'
+    assert os.listdir(tmpdir) == ['large.bin']
+
+
+def test_upload_stream_multipart(mocked_handler):
+    """Test multipart upload of a generator in order-preserving parts."""
+    client = mocked_handler.client
+    client.create_multipart_upload.return_value = {'UploadId': 'upload-1'}
+    client.upload_part.side_effect = lambda **kwargs: {
+        'ETag': f'etag-{kwargs["PartNumber"]}'
+    }
+    part_size = StorageHandler.MIN_PART_SIZE
+    chunks = (b'x' * 1_000_000 for _ in range(12))  # 12 MB in 1 MB chunks
+
+    result = mocked_handler.upload_stream(
+        chunks,
+        TEST_BUCKET_NAME,
+        'stream.bin',
+        part_size=1,  # Raised to the S3 minimum
+        extra_args={'ContentType': 'application/octet-stream'},
+    )
+
+    assert result['success'] is True
+    assert result['bytes'] == 12_000_000
+    assert result['parts'] == 3
+    assert result['bytes_per_second'] > 0
+    sizes = sorted(
+        (c.kwargs['PartNumber'], len(c.kwargs['Body']))
+        for c in client.upload_part.call_args_list
+    )
+    assert sizes == [
+        (1, part_size),
+        (2, part_size),
+        (3, 12_000_000 - 2 * part_size),
+    ]
+    client.create_multipart_upload.assert_called_once_with(
+        Bucket=TEST_BUCKET_NAME,
+        Key='stream.bin',
+        ContentType='application/octet-stream',
+    )
+    client.complete_multipart_upload.assert_called_once_with(
+        Bucket=TEST_BUCKET_NAME,
+        Key='stream.bin',
+        UploadId='upload-1',
+        MultipartUpload={
+            'Parts': [
+                {'PartNumber': n, 'ETag': f'etag-{n}'} for n in (1, 2, 3)
+            ]
+        },
+    )
+
+
+def test_upload_stream_small_file_object(mocked_handler):
+    """Test that data fitting one part is sent with PutObject."""
+    result = mocked_handler.upload_stream(
+        io.BytesIO(b'hello'), TEST_BUCKET_NAME, 'small.txt'
+    )
+
+    assert result['success'] is True
+    assert result['bytes'] == 5
+    mocked_handler.client.put_object.assert_called_once_with(
+        Bucket=TEST_BUCKET_NAME, Key='small.txt', Body=b'hello'
+    )
+    mocked_handler.client.create_multipart_upload.assert_not_called()
+
+
+def test_upload_stream_aborts_on_failure(mocked_handler):
+    """Test that a failed part aborts the multipart upload."""
+    client = mocked_handler.client
+    client.create_multipart_upload.return_value = {'UploadId': 'upload-1'}
+    client.upload_part.side_effect = Exception('Part error')
+    data = io.BytesIO(b'x' * (2 * StorageHandler.MIN_PART_SIZE + 1))
+
+    result = mocked_handler.upload_stream(data, TEST_BUCKET_NAME, 'fail.bin')
+
+    assert result['success'] is False
+    assert result['error'] == 'Part error'
+    client.complete_multipart_upload.assert_not_called()
+    client.abort_multipart_upload.assert_called_once_with(
+        Bucket=TEST_BUCKET_NAME, Key='fail.bin', UploadId='upload-1'
+    )
+
+
+def test_stat_many_mixes_listing_and_head(mocked_handler):
+    """Test that crowded folders are listed and the rest probed with HEAD."""
+    client = mocked_handler.client
+
+    def head_object(Bucket, Key):
+        if Key == 'other/missing.txt':
+            raise ClientError(
+                {'Error': {'Code': '404', 'Message': 'Not Found'}},
+                'HeadObject',
+            )
+        return {'ContentLength': 7, 'ETag': '"h"', 'LastModified': None}
+
+    client.head_object.side_effect = head_object
+    client.get_paginator.return_value.paginate.return_value = [
+        {
+            'Contents': [
+                {'Key': f'audio/{i}.wav', 'Size': i, 'ETag': f'"{i}"'}
+                for i in range(3)
+            ]
+        }
+    ]
+    keys = ['audio/0.wav', 'audio/1.wav', 'audio/9.wav', 'other/a.txt']
+    keys += ['other/missing.txt', 'audio/0.wav']
+
+    stats = mocked_handler.stat_many(TEST_BUCKET_NAME, keys, list_threshold=3)
+
+    assert sorted(stats) == sorted(set(keys))
+    assert stats['audio/1.wav']['size'] == 1
+    assert stats['audio/1.wav']['etag'] == '"1"'
+    assert stats['audio/9.wav']['exists'] is False
+    assert stats['other/a.txt']['size'] == 7
+    assert stats['other/missing.txt'] == {
+        'exists': False,
+        'size': None,
+        'etag': None,
+        'last_modified': None,
+        'error': None,
+    }
+    client.get_paginator.return_value.paginate.assert_called_once_with(
+        Bucket=TEST_BUCKET_NAME,
+        Prefix='audio/',
+        Delimiter='/',
+        StartAfter='audio/0.wau',
+    )
+    assert client.head_object.call_count == 2
+
+
+def test_stat_many_bounds_folder_listing(mocked_handler):
+    """Test that the listing stops after the largest requested key."""
+    client = mocked_handler.client
+    pages_read = []
+
+    def paginate(**params):
+        for number in range(3):
+            pages_read.append(number)
+            yield {
+                'Contents': [
+                    {'Key': f'audio/{number}{i}.wav', 'Size': i}
+                    for i in range(10)
+                ]
+            }
+
+    client.get_paginator.return_value.paginate.side_effect = paginate
+    keys = ['audio/03.wav', 'audio/05.wav', 'audio/07.wav']
+
+    stats = mocked_handler.stat_many(TEST_BUCKET_NAME, keys, list_threshold=3)
+
+    assert all(stats[key]['exists'] for key in keys)
+    assert pages_read == [0]
+    params = client.get_paginator.return_value.paginate.call_args.kwargs
+    assert params['StartAfter'] == 'audio/03.wau'
@@ -0,0 +1,230 @@
+import io
+
+from auris_tools.textractDocument import TextractDocument
+
+
+def _box(top, left, height=0.02, width=0.3):
+    return {
+        'BoundingBox': {
+            'Top': top,
+            'Left': left,
+            'Height': height,
+            'Width': width,
+        }
+    }
+
+
+def _line(block_id, text, top, left, page=1, words=()):
+    block = {
+        'Id': block_id,
+        'BlockType': 'LINE',
+        'Text': text,
+        'Page': page,
+        'Geometry': _box(top, left),
+    }
+    if words:
+        block['Relationships'] = [{'Type': 'CHILD', 'Ids': list(words)}]
+    return block
+
+
+def _page(block_id, page, child_ids):
+    return {
+        'Id': block_id,
+        'BlockType': 'PAGE',
+        'Page': page,
+        'Relationships': [{'Type': 'CHILD', 'Ids': child_ids}],
+    }
+
+
+RESPONSE = [
+    {
+        'Blocks': [
+            _page('p1', 1, ['l2', 'l1', 'l3']),
+            _line('l1', 'Title', 0.05, 0.1, words=['w1']),
+            {
+                'Id': 'w1',
+                'BlockType': 'WORD',
+                'Text': 'Title',
+                'Page': 1,
+                'Geometry': _box(0.05, 0.1),
+            },
+            _line('l2', 'Right column', 0.2, 0.6),
+            _line('l3', 'Left column', 0.205, 0.1),
+        ],
+        'NextToken': 'token1',
+    },
+    {
+        'Blocks': [
+            _page('p2', 2, ['l4']),
+            _line('l4', 'Second page', 0.1, 0.1, page=2),
+        ]
+    },
+]
+
+
+def test_pages_and_text():
+    document = TextractDocument(RESPONSE)
+
+    assert document.page_count == 2
+    assert [page.number for page in document.pages] == [1, 2]
+    assert document.get_page(1).text == 'Title\nLeft column\nRight column'
+    assert document.get_page(2).text == 'Second page'
+    assert document.text.endswith('\n\nSecond page')
+    assert document.get_page(3) is None
+
+
+def test_block_lookups():
+    document = TextractDocument(RESPONSE)
+
+    assert document.get_block('l2')['Text'] == 'Right column'
+    assert document.parent('w1')['Id'] == 'l1'
+    assert document.parent('p1') is None
+    assert [b['Id'] for b in document.children('p1')] == ['l2', 'l1', 'l3']
+    assert document.children('l1', block_type='WORD')[0]['Text'] == 'Title'
+
+
+def test_words_with_geometry():
+    page = TextractDocument(RESPONSE).get_page(1)
+
+    words = page.words()
+    assert [w['Text'] for w in words] == ['Title']
+    assert words[0]['Geometry']['BoundingBox']['Left'] == 0.1
+    assert page.words(page.lines[0]) == []
+
+
+def test_blocks_without_page_block():
+    document = TextractDocument.from_blocks(
+        [
+            _line('l1', 'Second', 0.5, 0.1),
+            _line('l2', 'First', 0.1, 0.1),
+        ]
+    )
+
+    page = document.get_page(1)
+    assert [line['Text'] for line in page.lines] == ['Second', 'First']
+    assert page.text == 'First\nSecond'
+
+
+def _word(block_id, text):
+    return {'Id': block_id, 'BlockType': 'WORD', 'Text': text, 'Page': 1}
+
+
+def _cell(block_id, row, column, word_ids, **spans):
+    return {
+        'Id': block_id,
+        'BlockType': 'CELL',
+        'Page': 1,
+        'RowIndex': row,
+        'ColumnIndex': column,
+        'Relationships': [{'Type': 'CHILD', 'Ids': word_ids}],
+        **spans,
+    }
+
+
+ANALYSIS_BLOCKS = [
+    _page('p1', 1, ['t1', 'k1', 'v1', 'k2', 'v2']),
+    {
+        'Id': 't1',
+        'BlockType': 'TABLE',
+        'Page': 1,
+        'Relationships': [{'Type': 'CHILD', 'Ids': ['c1', 'c2', 'c3', 'c4']}],
+    },
+    _cell('c1', 1, 1, ['w1']),
+    _cell('c2', 1, 2, ['w2', 'w3']),
+    _cell('c3', 2, 1, ['w4']),
+    _cell('c4', 2, 2, ['w5']),
+    _word('w1', 'Name'),
+    _word('w2', 'Date,'),
+    _word('w3', 'time'),
+    _word('w4', 'Ana'),
+    _word('w5', '2024'),
+    {
+        'Id': 'k1',
+        'BlockType': 'KEY_VALUE_SET',
+        'EntityTypes': ['KEY'],
+        'Page': 1,
+        'Confidence': 95.0,
+        'Relationships': [
+            {'Type': 'VALUE', 'Ids': ['v1']},
+            {'Type': 'CHILD', 'Ids': ['w6']},
+        ],
+    },
+    {
+        'Id': 'v1',
+        'BlockType': 'KEY_VALUE_SET',
+        'EntityTypes': ['VALUE'],
+        'Page': 1,
+        'Relationships': [{'Type': 'CHILD', 'Ids': ['w7']}],
+    },
+    _word('w6', 'Patient:'),
+    _word('w7', 'Ana'),
+    {
+        'Id': 'k2',
+        'BlockType': 'KEY_VALUE_SET',
+        'EntityTypes': ['KEY'],
+        'Page': 1,
+        'Relationships': [
+            {'Type': 'VALUE', 'Ids': ['v2']},
+            {'Type': 'CHILD', 'Ids': ['w8']},
+        ],
+    },
+    {
+        'Id': 'v2',
+        'BlockType': 'KEY_VALUE_SET',
+        'EntityTypes': ['VALUE'],
+        'Page': 1,
+        'Relationships': [{'Type': 'CHILD', 'Ids': ['s1']}],
+    },
+    _word('w8', 'Insured'),
+    {
+        'Id': 's1',
+        'BlockType': 'SELECTION_ELEMENT',
+        'SelectionStatus': 'SELECTED',
+        'Page': 1,
+    },
+]
+
+
+def test_table_rows_and_csv():
+    document = TextractDocument.from_blocks(ANALYSIS_BLOCKS)
+
+    tables = document.tables()
+    assert len(tables) == 1
+    assert tables[0].rows == [['Name', 'Date, time'], ['Ana', '2024']]
+    assert list(tables[0].iter_csv()) == [
+        'Name,"Date, time"\r\n',
+        'Ana,2024\r\n',
+    ]
+
+    file = io.StringIO()
+    tables[0].to_csv(file)
+    assert file.getvalue() == tables[0].to_csv()
+    assert document.tables(page=2) == []
+
+
+def test_table_with_spanning_cell():
+    document = TextractDocument.from_blocks(
+        [
+            {
+                'Id': 't1',
+                'BlockType': 'TABLE',
+                'Relationships': [{'Type': 'CHILD', 'Ids': ['c1', 'c2']}],
+            },
+            _cell('c1', 1, 1, ['w1'], ColumnSpan=2),
+            _cell('c2', 2, 2, ['w2']),
+            _word('w1', 'Header'),
+            _word('w2', 'Value'),
+        ]
+    )
+
+    assert document.tables()[0].rows == [['Header', ''], ['', 'Value']]
+
+
+def test_form_fields():
+    fields = TextractDocument.from_blocks(ANALYSIS_BLOCKS).form_fields()
+
+    assert [(f['key'], f['value']) for f in fields] == [
+        ('Patient:', 'Ana'),
+        ('Insured', 'X'),
+    ]
+    assert fields[0]['confidence'] == 95.0
@@ -1,12 +1,21 @@
+import json
 from unittest.mock import MagicMock, patch
 
 import boto3
 import botocore.session
 import pytest
+from botocore.exceptions import ClientError
 from botocore.stub import Stubber
 
-from auris_tools.configuration import AWSConfiguration
-from auris_tools.textractHandler import TextractHandler
+from auris_tools.configuration import AWSConfiguration, client_registry
+from auris_tools.objectCache import TextractResultCache
+from auris_tools.textractHandler import (
+    TextractHandler,
+    TextractJobOrchestrator,
+    TextractNotificationConsumer,
+    is_throttling_error,
+    poll_delays,
+)
 
 
 class TestTextractHandler:
@@ -25,6 +34,9 @@ class TestTextractHandler:
         self.test_document = 'test-document.pdf'
         self.test_job_id = '1234567890abcdef0'
 
+        # Drop shared clients so the patched session below is used
+        client_registry.clear()
+
         # Create a mock Textract client
         self.mock_client = MagicMock()
         self.patcher = patch('boto3.session.Session')
@@ -36,6 +48,7 @@ class TestTextractHandler:
 
         yield
         self.patcher.stop()
+        client_registry.clear()
 
     def test_init_with_parameters(self):
         """Test initialization with parameters."""
@@ -93,6 +106,267 @@ class TestTextractHandler:
                 self.test_bucket, self.test_document
             )
 
+    def test_start_job_with_notification_channel(self):
+        """Test starting a job that publishes its completion to SNS."""
+        self.mock_client.start_document_text_detection.return_value = {
+            'JobId': self.test_job_id
+        }
+        channel = {
+            'SNSTopicArn': 'arn:aws:sns:us-east-1:123:textract',
+            'RoleArn': 'arn:aws:iam::123:role/textract',
+        }
+
+        self.textract_handler.start_job(
+            self.test_bucket,
+            self.test_document,
+            notification_channel=channel,
+            job_tag='batch-1',
+        )
+
+        kwargs = self.mock_client.start_document_text_detection.call_args[1]
+        assert kwargs['NotificationChannel'] == channel
+        assert kwargs['JobTag'] == 'batch-1'
+
+    def test_detect_text_bytes(self):
+        """Test detecting text from bytes with a synchronous call."""
+        self.mock_client.detect_document_text.return_value = {
+            'Blocks': [{'BlockType': 'LINE', 'Text': 'Sync'}]
+        }
+
+        response = self.textract_handler.detect_text(document_bytes=b'png')
+
+        assert self.textract_handler.get_full_text(response) == 'Sync'
+        self.mock_client.detect_document_text.assert_called_once_with(
+            Document={'Bytes': b'png'}
+        )
+        self.mock_client.head_object.assert_not_called()
+
+    def test_detect_text_small_image_is_sync(self):
+        """Test small S3 images are processed synchronously."""
+        self.mock_client.head_object.return_value = {
+            'ContentLength': 1024,
+            'ContentType': 'image/png',
+        }
+        self.mock_client.detect_document_text.return_value = {'Blocks': []}
+
+        response = self.textract_handler.detect_text(
+            self.test_bucket, 'scan.png'
+        )
+
+        assert response == [{'Blocks': []}]
+        self.mock_client.start_document_text_detection.assert_not_called()
+
+    def test_detect_text_large_document_is_async(self):
+        """Test large documents go through an asynchronous job."""
+        self.mock_client.head_object.return_value = {
+            'ContentLength': 50 * 1024 * 1024,
+            'ContentType': 'application/pdf',
+        }
+        self.mock_client.start_document_text_detection.return_value = {
+            'JobId': self.test_job_id
+        }
+        self.mock_client.get_document_text_detection.return_value = {
+            'JobStatus': 'SUCCEEDED',
+            'Blocks': [{'BlockType': 'LINE', 'Text': 'Async'}],
+        }
+
+        with patch('time.sleep'):
+            response = self.textract_handler.detect_text(
+                self.test_bucket, self.test_document
+            )
+
+        assert self.textract_handler.get_full_text(response) == 'Async'
+        self.mock_client.detect_document_text.assert_not_called()
+
+    def test_detect_text_multipage_pdf_falls_back(self):
+        """Test multi-page PDFs rejected by the sync API use a job."""
+        self.mock_client.head_object.return_value = {
+            'ContentLength': 1024,
+            'ContentType': 'application/pdf',
+        }
+        self.mock_client.detect_document_text.side_effect = ClientError(
+            {'Error': {'Code': 'UnsupportedDocumentException'}},
+            'DetectDocumentText',
+        )
+        self.mock_client.start_document_text_detection.return_value = {
+            'JobId': self.test_job_id
+        }
+        self.mock_client.get_document_text_detection.return_value = {
+            'JobStatus': 'SUCCEEDED',
+            'Blocks': [],
+        }
+
+        with patch('time.sleep'):
+            response = self.textract_handler.detect_text(
+                self.test_bucket, self.test_document
+            )
+
+        assert response == [{'JobStatus': 'SUCCEEDED', 'Blocks': []}]
+        self.mock_client.start_document_text_detection.assert_called_once()
+
+    def test_detect_text_requires_document(self):
+        """Test detect_text rejects calls without a document."""
+        with pytest.raises(ValueError):
+            self.textract_handler.detect_text()
+
+    def test_result_cache_short_circuits_jobs(self, tmpdir):
+        """Test cached results skip Textract for an unchanged object."""
+        handler = TextractHandler(
+            config=self.config,
+            result_cache=TextractResultCache(directory=str(tmpdir)),
+        )
+        self.mock_client.head_object.return_value = {'ETag': '"v1"'}
+        self.mock_client.start_document_text_detection.return_value = {
+            'JobId': self.test_job_id
+        }
+        self.mock_client.get_document_text_detection.return_value = {
+            'JobStatus': 'SUCCEEDED',
+            'Blocks': [{'BlockType': 'LINE', 'Text': 'Cached'}],
+        }
+
+        job_id = handler.start_job(self.test_bucket, self.test_document)
+        assert job_id == self.test_job_id
+        handler.get_job_results(job_id)
+
+        # Second run is served from the cache
+        self.mock_client.reset_mock()
+        job_id = handler.start_job(self.test_bucket, self.test_document)
+
+        assert job_id != self.test_job_id
+        assert handler.wait_for_job(job_id, poll_interval=0) == 'SUCCEEDED'
+        pages = handler.get_job_results(job_id)
+        assert handler.get_full_text(pages) == 'Cached'
+        # Cached job IDs can be read again, like real ones
+        assert handler.get_job_status(job_id) == 'SUCCEEDED'
+        assert handler.get_job_results(job_id) == pages
+
+        handler.release_job(job_id)
+        with pytest.raises(ValueError):
+            handler.get_job_status(job_id)
+        self.mock_client.start_document_text_detection.assert_not_called()
+        self.mock_client.get_document_text_detection.assert_not_called()
+
+        # A new object version runs Textract again
+        self.mock_client.head_object.return_value = {'ETag': '"v2"'}
+        job_id = handler.start_job(self.test_bucket, self.test_document)
+        assert job_id == self.test_job_id
+
+    def test_result_cache_forgets_failed_jobs(self, tmpdir):
+        """Test failed jobs are no longer tracked for the cache."""
+        handler = TextractHandler(
+            config=self.config,
+            result_cache=TextractResultCache(directory=str(tmpdir)),
+        )
+        self.mock_client.head_object.return_value = {'ETag': '"v1"'}
+        self.mock_client.start_document_text_detection.return_value = {
+            'JobId': self.test_job_id
+        }
+        self.mock_client.get_document_text_detection.return_value = {
+            'JobStatus': 'FAILED'
+        }
+
+        job_id = handler.start_job(self.test_bucket, self.test_document)
+        assert len(handler._uncached_jobs) == 1
+        with patch('time.sleep'):
+            assert handler.wait_for_job(job_id) == 'FAILED'
+
+        assert len(handler._uncached_jobs) == 0
+
+    def test_detect_text_async_fallback_heads_once(self, tmpdir):
+        """Test the asynchronous path reuses the ETag of the first HEAD."""
+        handler = TextractHandler(
+            config=self.config,
+            result_cache=TextractResultCache(directory=str(tmpdir)),
+        )
+        self.mock_client.head_object.return_value = {
+            'ETag': '"v1"',
+            'ContentLength': 50 * 1024 * 1024,
+            'ContentType': 'application/pdf',
+        }
+        self.mock_client.start_document_text_detection.return_value = {
+            'JobId': self.test_job_id
+        }
+        self.mock_client.get_document_text_detection.return_value = {
+            'JobStatus': 'SUCCEEDED',
+            'Blocks': [],
+        }
+
+        with patch('time.sleep'):
+            handler.detect_text(self.test_bucket, self.test_document)
+            handler.detect_text(self.test_bucket, self.test_document)
+
+        # One HEAD per call, and the second call is served from the cache
+        assert self.mock_client.head_object.call_count == 2
+        self.mock_client.start_document_text_detection.assert_called_once()
+
+    def test_result_cache_with_detect_text(self, tmpdir):
+        """Test synchronous results are cached too."""
+        handler = TextractHandler(
+            config=self.config,
+            result_cache=TextractResultCache(directory=str(tmpdir)),
+        )
+        self.mock_client.head_object.return_value = {
+            'ETag': '"v1"',
+            'ContentLength': 1024,
+            'ContentType': 'image/png',
+        }
+        self.mock_client.detect_document_text.return_value = {
+            'Blocks': [{'BlockType': 'LINE', 'Text': 'Sync'}]
+        }
+
+        first = handler.detect_text(self.test_bucket, 'scan.png')
+        second = handler.detect_text(self.test_bucket, 'scan.png')
+
+        assert first == second
+        self.mock_client.detect_document_text.assert_called_once()
+
+    def test_analysis_job(self):
+        """Test starting, waiting for and reading an analysis job."""
+        self.mock_client.start_document_analysis.return_value = {
+            'JobId': self.test_job_id
+        }
+        self.mock_client.get_document_analysis.side_effect = [
+            {'JobStatus': 'SUCCEEDED'},
+            {
+                'JobStatus': 'SUCCEEDED',
+                'Blocks': [
+                    {
+                        'Id': 't1',
+                        'BlockType': 'TABLE',
+                        'Relationships': [{'Type': 'CHILD', 'Ids': ['c1']}],
+                    },
+                    {
+                        'Id': 'c1',
+                        'BlockType': 'CELL',
+                        'RowIndex': 1,
+                        'ColumnIndex': 1,
+                        'Relationships': [{'Type': 'CHILD', 'Ids': ['w1']}],
+                    },
+                    {'Id': 'w1', 'BlockType': 'WORD', 'Text': 'Cell'},
+                ],
+            },
+        ]
+
+        job_id = self.textract_handler.start_analysis_job(
+            self.test_bucket, self.test_document, feature_types=['TABLES']
+        )
+        with patch('time.sleep'):
+            status = self.textract_handler.wait_for_job(job_id, analysis=True)
+        document = self.textract_handler.get_analysis_document(job_id)
+
+        assert status == 'SUCCEEDED'
+        assert document.tables()[0].rows == [['Cell']]
+        self.mock_client.start_document_analysis.assert_called_once_with(
+            DocumentLocation={
+                'S3Object': {
+                    'Bucket': self.test_bucket,
+                    'Name': self.test_document,
+                }
+            },
+            FeatureTypes=['TABLES'],
+        )
+        self.mock_client.get_document_text_detection.assert_not_called()
+
     def test_get_job_status(self):
         """Test getting job status."""
         # Setup the mock to return a status
@@ -195,8 +469,146 @@ class TestTextractHandler:
                 JobId=self.test_job_id, NextToken='token2'
             )
 
-            # Check sleep was called between pagination requests
-            assert mock_sleep.call_count == 2
+            # Check pages were requested without fixed delays
+            mock_sleep.assert_not_called()
+
+    def test_iter_job_results_is_lazy(self):
+        """Test result pages are requested only as they are consumed."""
+        self.mock_client.get_document_text_detection.side_effect = [
+            {'Blocks': [], 'NextToken': 'token1'},
+            {'Blocks': []},
+        ]
+
+        pages = self.textract_handler.iter_job_results(self.test_job_id)
+        next(pages)
+        assert self.mock_client.get_document_text_detection.call_count == 1
+
+        assert len(list(pages)) == 1
+        assert self.mock_client.get_document_text_detection.call_count == 2
+
+    def test_iter_text(self):
+        """Test streaming the text of a job line by line."""
+        pages = [
+            {
+                'Blocks': [
+                    {'BlockType': 'PAGE'},
+                    {'BlockType': 'LINE', 'Text': 'Line 1'},
+                    {'BlockType': 'WORD', 'Text': 'Line'},
+                ],
+                'NextToken': 'token1',
+            },
+            {'Blocks': [{'BlockType': 'LINE', 'Text': 'Line 2'}]},
+        ]
+        self.mock_client.get_document_text_detection.side_effect = pages
+
+        lines = list(self.textract_handler.iter_text(self.test_job_id))
+
+        assert lines == ['Line 1', 'Line 2']
+        assert ' '.join(lines) == self.textract_handler.get_full_text(pages)
+
+    def test_iter_blocks(self):
+        """Test streaming blocks filtered by type."""
+        self.mock_client.get_document_text_detection.return_value = {
+            'Blocks': [
+                {'BlockType': 'PAGE'},
+                {'BlockType': 'LINE', 'Text': 'Line'},
+                {'BlockType': 'WORD', 'Text': 'Line'},
+            ]
+        }
+
+        blocks = list(self.textract_handler.iter_blocks(self.test_job_id))
+
+        assert [b['BlockType'] for b in blocks] == ['LINE', 'WORD']
+
+    def test_get_document(self):
+        """Test building an indexed document from job results."""
+        self.mock_client.get_document_text_detection.return_value = {
+            'Blocks': [
+                {
+                    'Id': 'p1',
+                    'BlockType': 'PAGE',
+                    'Page': 1,
+                    'Relationships': [{'Type': 'CHILD', 'Ids': ['l1']}],
+                },
+                {'Id': 'l1', 'BlockType': 'LINE', 'Text': 'Hi', 'Page': 1},
+            ]
+        }
+
+        document = self.textract_handler.get_document(self.test_job_id)
+
+        assert document.page_count == 1
+        assert document.get_page(1).text == 'Hi'
+
+    def test_get_job_results_throttled(self):
+        """Test throttled result pages are retried."""
+        throttled = ClientError(
+            {'Error': {'Code': 'ThrottlingException'}},
+            'GetDocumentTextDetection',
+        )
+        self.mock_client.get_document_text_detection.side_effect = [
+            {'JobStatus': 'SUCCEEDED', 'Blocks': [], 'NextToken': 'token1'},
+            throttled,
+            {'JobStatus': 'SUCCEEDED', 'Blocks': []},
+        ]
+
+        with patch('time.sleep') as mock_sleep:
+            results = self.textract_handler.get_job_results(self.test_job_id)
+
+        assert len(results) == 2
+        assert mock_sleep.call_count == 1
+
+    def test_get_job_results_error_not_retried(self):
+        """Test errors other than throttling are raised immediately."""
+        self.mock_client.get_document_text_detection.side_effect = Exception(
+            'Test error'
+        )
+
+        with patch('time.sleep') as mock_sleep:
+            with pytest.raises(Exception, match='Test error'):
+                self.textract_handler.get_job_results(self.test_job_id)
+
+        mock_sleep.assert_not_called()
+
+    def test_wait_for_job(self):
+        """Test waiting for a job polls until it finishes."""
+        self.mock_client.get_document_text_detection.side_effect = [
+            {'JobStatus': 'IN_PROGRESS'},
+            {'JobStatus': 'IN_PROGRESS'},
+            {'JobStatus': 'SUCCEEDED'},
+        ]
+
+        with patch('time.sleep') as mock_sleep:
+            status = self.textract_handler.wait_for_job(self.test_job_id)
+
+        assert status == 'SUCCEEDED'
+        assert mock_sleep.call_count == 3
+        delays = [c.args[0] for c in mock_sleep.call_args_list]
+        assert 0.5 <= delays[0] <= 1.0
+        assert 2.0 <= delays[2] <= 4.0
+        self.mock_client.get_document_text_detection.assert_called_with(
+            JobId=self.test_job_id, MaxResults=1
+        )
+
+    def test_wait_for_job_timeout(self):
+        """Test waiting for a job stops after the timeout."""
+        self.mock_client.get_document_text_detection.return_value = {
+            'JobStatus': 'IN_PROGRESS'
+        }
+
+        with pytest.raises(TimeoutError):
+            self.textract_handler.wait_for_job(
+                self.test_job_id, timeout=0.05, poll_interval=0.01
+            )
+
+    def test_poll_delays_end_at_deadline(self):
+        """Test the poll schedule is capped and shortened to the deadline."""
+        with patch('time.monotonic', side_effect=[0.0, 1.0, 3.0, 9.0, 10.0]):
+            delays = poll_delays('job', timeout=10, base=4.0, cap=6.0)
+            assert 2.0 <= next(delays) <= 4.0
+            assert 3.0 <= next(delays) <= 6.0
+            assert next(delays) == pytest.approx(1.0)
+            with pytest.raises(TimeoutError, match='job'):
+                next(delays)
 
     def test_get_full_text(self):
         """Test extracting full text from Textract response."""
@@ -244,3 +656,299 @@ class TestTextractHandler:
 
         # Assert the result is an empty string
         assert text == ''
+
+
+def _throttling_error():
+    return ClientError(
+        {'Error': {'Code': 'ProvisionedThroughputExceededException'}},
+        'StartDocumentTextDetection',
+    )
+
+
+class TestTextractJobOrchestrator:
+    """Tests for the TextractJobOrchestrator class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Setup a handler with a mocked client and no backoff delays."""
+        self.mock_client = MagicMock()
+        with patch(
+            'auris_tools.textractHandler.client_registry.get_client',
+            return_value=self.mock_client,
+        ):
+            self.handler = TextractHandler(
+                config=AWSConfiguration(region='us-east-1')
+            )
+
+        self.statuses = {}
+        self.started = []
+
+        def start(DocumentLocation):
+            name = DocumentLocation['S3Object']['Name']
+            self.started.append(name)
+            return {'JobId': f'job-{name}'}
+
+        def detect(JobId, MaxResults=None, NextToken=None):
+            if MaxResults is not None:
+                statuses = self.statuses.get(JobId, ['SUCCEEDED'])
+                status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+                return {'JobStatus': status}
+            return {
+                'JobStatus': 'SUCCEEDED',
+                'Blocks': [{'BlockType': 'LINE', 'Text': JobId}],
+            }
+
+        self.mock_client.start_document_text_detection.side_effect = start
+        self.mock_client.get_document_text_detection.side_effect = detect
+
+        with patch(
+            'auris_tools.textractHandler.poll_delay', return_value=0
+        ), patch('auris_tools.textractHandler.backoff_delay', return_value=0):
+            yield
+
+    def _run(self, documents, **kwargs):
+        kwargs.setdefault('submit_tps', 1000)
+        kwargs.setdefault('poll_tps', 1000)
+        orchestrator = TextractJobOrchestrator(self.handler, **kwargs)
+        return list(orchestrator.as_completed(documents))
+
+    def test_results_for_every_document(self):
+        """Test every document yields its fetched result pages."""
+        documents = [('bucket', f'doc{i}.pdf') for i in range(5)]
+        self.statuses['job-doc1.pdf'] = ['IN_PROGRESS', 'SUCCEEDED']
+
+        results = self._run(documents)
+
+        assert sorted(r['key'] for r in results) == [
+            key for _, key in documents
+        ]
+        for result in results:
+            assert result['status'] == 'SUCCEEDED'
+            assert result['error'] is None
+            assert self.handler.get_full_text(result['pages']) == (
+                result['job_id']
+            )
+
+    def test_failed_job(self):
+        """Test a failed job is reported without fetching results."""
+        self.statuses['job-bad.pdf'] = ['FAILED']
+
+        results = self._run([('bucket', 'bad.pdf')])
+
+        assert results[0]['status'] == 'FAILED'
+        assert results[0]['pages'] is None
+
+    def test_fetch_results_disabled(self):
+        """Test only the final status is reported without fetch_results."""
+        results = self._run([('bucket', 'doc.pdf')], fetch_results=False)
+
+        assert results[0]['status'] == 'SUCCEEDED'
+        assert results[0]['pages'] is None
+
+    def test_max_in_flight(self):
+        """Test no more than max_in_flight jobs run at once."""
+        running = set()
+        peak = []
+        start = self.mock_client.start_document_text_detection.side_effect
+        detect = self.mock_client.get_document_text_detection.side_effect
+
+        def tracked_start(DocumentLocation):
+            response = start(DocumentLocation)
+            running.add(response['JobId'])
+            peak.append(len(running))
+            return response
+
+        def tracked_detect(JobId, **kwargs):
+            response = detect(JobId, **kwargs)
+            if kwargs.get('MaxResults'):
+                running.discard(JobId)
+            return response
+
+        self.mock_client.start_document_text_detection.side_effect = (
+            tracked_start
+        )
+        self.mock_client.get_document_text_detection.side_effect = (
+            tracked_detect
+        )
+
+        results = self._run(
+            [('bucket', f'doc{i}.pdf') for i in range(6)], max_in_flight=2
+        )
+
+        assert len(results) == 6
+        assert max(peak) <= 2
+
+    def test_rate_limits_do_not_busy_wait(self):
+        """Test the scheduler sleeps while a rate limiter refuses."""
+        orchestrator = TextractJobOrchestrator(
+            self.handler, submit_tps=20, poll_tps=20
+        )
+        calls = []
+        for limiter in (
+            orchestrator.submit_limiter,
+            orchestrator.poll_limiter,
+        ):
+            try_acquire = limiter.try_acquire
+
+            def counted(try_acquire=try_acquire):
+                calls.append(1)
+                return try_acquire()
+
+            limiter.try_acquire = counted
+
+        documents = [('bucket', f'doc{i}.pdf') for i in range(4)]
+        results = list(orchestrator.as_completed(documents))
+
+        assert len(results) == 4
+        # 4 submissions and 4 polls, plus a few refusals per grant
+        assert len(calls) < 40
+
+    def test_throttled_submission_is_retried(self):
+        """Test throttled job submissions are retried."""
+        start = self.mock_client.start_document_text_detection.side_effect
+        errors = [_throttling_error(), _throttling_error()]
+
+        def flaky_start(DocumentLocation):
+            if errors:
+                raise errors.pop()
+            return start(DocumentLocation)
+
+        self.mock_client.start_document_text_detection.side_effect = (
+            flaky_start
+        )
+
+        results = self._run([('bucket', 'doc.pdf')])
+
+        assert results[0]['status'] == 'SUCCEEDED'
+        assert self.started == ['doc.pdf']
+
+    def test_submission_error(self):
+        """Test non-throttling submission errors fail the document."""
+        self.mock_client.start_document_text_detection.side_effect = Exception(
+            'Access denied'
+        )
+
+        results = self._run([('bucket', 'doc.pdf')])
+
+        assert results[0]['status'] == 'FAILED'
+        assert results[0]['job_id'] is None
+        assert results[0]['error'] == 'Access denied'
+
+    def test_is_throttling_error(self):
+        """Test throttling errors are recognized by error code."""
+        assert is_throttling_error(_throttling_error())
+        assert not is_throttling_error(Exception('Other'))
+
+
+class LocalQueue:
+    """In-memory stand-in for the SQS client used by the consumer."""
+
+    def __init__(self):
+        self.messages = []
+        self.deleted = []
+        self.receives = 0
+
+    def send(self, job_id, status='SUCCEEDED', key='doc.pdf', sns=True):
+        body = json.dumps(
+            {
+                'JobId': job_id,
+                'Status': status,
+                'API': 'StartDocumentTextDetection',
+                'DocumentLocation': {
+                    'S3ObjectName': key,
+                    'S3Bucket': 'bucket',
+                },
+            }
+        )
+        if sns:
+            body = json.dumps({'Type': 'Notification', 'Message': body})
+        handle = f'handle-{len(self.messages) + len(self.deleted)}'
+        self.messages.append({'Body': body, 'ReceiptHandle': handle})
+
+    def receive_message(self, QueueUrl, MaxNumberOfMessages, WaitTimeSeconds):
+        self.receives += 1
+        visible = [
+            m for m in self.messages if m['ReceiptHandle'] not in self.deleted
+        ]
+        batch = visible[:MaxNumberOfMessages]
+        return {'Messages': batch} if batch else {}
+
+    def delete_message_batch(self, QueueUrl, Entries):
+        assert len(Entries) <= 10
+        self.deleted.extend(entry['ReceiptHandle'] for entry in Entries)
+        return {'Successful': Entries}
+
+
+class TestTextractNotificationConsumer:
+    """Tests for the TextractNotificationConsumer class."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Setup a consumer reading from a local stub queue."""
+        self.queue = LocalQueue()
+        self.handler = MagicMock()
+        self.handler.get_job_results.side_effect = lambda job_id: [
+            {'Blocks': [{'BlockType': 'LINE', 'Text': job_id}]}
+        ]
+
+        with patch(
+            'auris_tools.textractHandler.client_registry.get_client',
+            return_value=self.queue,
+        ):
+            self.consumer = TextractNotificationConsumer(
+                self.handler,
+                'https://sqs.us-east-1.amazonaws.com/123/textract',
+                config=AWSConfiguration(region='us-east-1'),
+                wait_time=0,
+            )
+
+    def test_parse_raw_message(self):
+        """Test parsing a notification delivered without an SNS envelope."""
+        self.queue.send('job-1', key='raw.pdf', sns=False)
+
+        notifications = self.consumer.receive()
+
+        assert notifications[0]['job_id'] == 'job-1'
+        assert notifications[0]['key'] == 'raw.pdf'
+        assert notifications[0]['bucket'] == 'bucket'
+
+    def test_iter_results_for_job_ids(self):
+        """Test results are fetched and messages deleted per job."""
+        for i in range(12):
+            self.queue.send(f'job-{i}', key=f'doc{i}.pdf')
+        self.queue.send('other-job')
+
+        job_ids = [f'job-{i}' for i in range(12)]
+        results = list(self.consumer.iter_results(job_ids=job_ids))
+
+        assert [r['job_id'] for r in results] == job_ids
+        assert results[0]['pages'][0]['Blocks'][0]['Text'] == 'job-0'
+        assert len(self.queue.deleted) == 12
+        assert self.queue.messages[-1]['ReceiptHandle'] not in (
+            self.queue.deleted
+        )
+
+    def test_failed_job_notification(self):
+        """Test failed jobs are reported without fetching results."""
+        self.queue.send('job-1', status='FAILED')
+
+        results = list(self.consumer.iter_results(job_ids=['job-1']))
+
+        assert results[0]['status'] == 'FAILED'
+        self.handler.get_job_results.assert_not_called()
+
+    def test_stop_after_empty_receives(self):
+        """Test iteration stops when the queue stays empty."""
+        results = list(self.consumer.iter_results(max_empty_receives=2))
+
+        assert results == []
+        assert self.queue.receives == 2
+
+    def test_malformed_message_is_deleted(self):
+        """Test messages that are not notifications are discarded."""
+        self.queue.messages.append(
+            {'Body': 'not json', 'ReceiptHandle': 'bad'}
+        )
+
+        assert self.consumer.receive() == []
+        assert self.queue.deleted == ['bad']
@@ -1,10 +1,17 @@
 import time
 from datetime import datetime
 
+import pytest
+
 from auris_tools.utils import (
+    LRUCache,
+    RateLimiter,
+    backoff_delay,
+    chunked,
     collect_processing_time,
     collect_timestamp,
     generate_uuid,
+    merge_iterators,
     parse_timestamp,
 )
 
@@ -49,3 +56,71 @@ def test_parse_timestamp():
 
     assert parse_timestamp(dt) == dt
     assert parse_timestamp(iso_str) == dt
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked(iter([]), 3)) == []
+    with pytest.raises(ValueError):
+        list(chunked([1], 0))
+
+
+def test_backoff_delay():
+    for attempt in range(10):
+        delay = backoff_delay(attempt, base=0.1, cap=1.0)
+        assert 0 <= delay <= min(1.0, 0.1 * 2**attempt)
+
+
+def test_lru_cache_eviction_and_stats():
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'b' becomes least recently used
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+    assert cache.stats() == {
+        'hits': 2,
+        'misses': 1,
+        'evictions': 1,
+        'expirations': 0,
+        'size': 2,
+    }
+
+
+def test_lru_cache_ttl():
+    cache = LRUCache(maxsize=2, ttl=0.05)
+    cache.set('a', 1)
+    assert cache.get('a') == 1
+    time.sleep(0.06)
+    assert cache.get('a', 'expired') == 'expired'
+    assert cache.stats()['expirations'] == 1
+    assert len(cache) == 0
+
+
+def test_merge_iterators():
+    sources = [iter(range(0, 50)), iter(range(50, 100)), iter([])]
+    merged = list(merge_iterators(sources, max_workers=2, buffer_size=5))
+    assert sorted(merged) == list(range(100))
+    assert list(merge_iterators([])) == []
+
+
+def test_merge_iterators_propagates_errors():
+    def failing():
+        yield 1
+        raise ValueError('Source error')
+
+    with pytest.raises(ValueError, match='Source error'):
+        list(merge_iterators([failing(), iter(range(3))]))
+
+
+def test_rate_limiter():
+    limiter = RateLimiter(rate=20, burst=2)
+    assert limiter.try_acquire() == 0.0
+    assert limiter.try_acquire() == 0.0
+    assert 0 < limiter.try_acquire() <= 0.05
+
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.03